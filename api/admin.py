@@ -1,15 +1,344 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.filters import RelatedFieldListFilter
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import User
+from django.forms.models import BaseInlineFormSet
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 from django.utils.html import format_html
+from django.utils.text import smart_split, unescape_string_literal
 from .models import (
     AcademicYear, Semester, Department, Faculty, Student, Program,
     Course, CourseOffering, Schedule, Enrollment, Grade,
     Announcement, Assessment, AssessmentScore, DocumentRequest,
-    Event, EventRegistration, Notification, Feedback, CourseEvaluation
+    Event, EventRegistration, Notification, Feedback, CourseEvaluation,
+    AdmissionTicket, WaitlistEntry, HonorsRanking, GradeChange,
 )
+from .services import enrollment as enrollment_service
+from .services import prerequisites, rooms, row_counts, search
+
+
+# Relations each model's __str__ reads. Followed recursively, so a model only
+# lists its own foreign keys and the models behind them add theirs.
+STR_RELATED = {
+    Semester: ('academic_year',),
+    Faculty: ('user',),
+    Student: ('user',),
+    CourseOffering: ('course', 'semester'),
+    Schedule: ('course_offering',),
+    Enrollment: ('student', 'course_offering'),
+    Grade: ('enrollment__student', 'enrollment__course_offering__course'),
+    Assessment: ('course_offering__course',),
+    AssessmentScore: ('enrollment__student', 'assessment'),
+    DocumentRequest: ('student',),
+    EventRegistration: ('student', 'event'),
+    Notification: ('recipient',),
+    Feedback: ('student',),
+    CourseEvaluation: ('enrollment__student', 'enrollment__course_offering__course'),
+}
+
+
+def _related_model(model, path):
+    for name in path.split('__'):
+        model = model._meta.get_field(name).related_model
+    return model
+
+
+def str_related(model, prefix=''):
+    """``select_related`` paths needed to render ``str()`` of ``model`` without extra queries."""
+    paths = []
+    for path in STR_RELATED.get(model, ()):
+        paths.append(prefix + path)
+        paths.extend(str_related(_related_model(model, path), f"{prefix}{path}__"))
+    return paths
+
+
+class StrRelatedFieldListFilter(RelatedFieldListFilter):
+    """Related-field filter that loads its choices together with what their labels read."""
+
+    def field_choices(self, field, request, model_admin):
+        model = field.related_model
+        choices = model._default_manager.complex_filter(field.get_limit_choices_to())
+        choices = choices.select_related(*str_related(model))
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            choices = choices.order_by(*ordering)
+        attname = field.remote_field.get_related_field().attname
+        return [(getattr(obj, attname), str(obj)) for obj in choices]
+
+
+class QueryBudgetMixin:
+    """
+    Keep changelists at a fixed number of queries however many rows they show.
+
+    ``list_select_related`` is derived from ``list_display``: relation columns
+    pull in the related row plus whatever its ``__str__`` reads (see
+    ``STR_RELATED``), and display methods declare the paths they follow with a
+    ``related`` attribute. ``list_filter`` entries on relations get a filter
+    that loads their choice labels the same way.
+    """
+
+    def _display_paths(self, name):
+        if name == '__str__':
+            return str_related(self.model)
+        if callable(name):
+            return list(getattr(name, 'related', ()))
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            method = getattr(self, name, None) or getattr(self.model, name, None)
+            return list(getattr(method, 'related', ()))
+        # A raw ``<fk>_id`` column is shown without following the relation.
+        if not field.is_relation or field.many_to_many or field.one_to_many or name != field.name:
+            return []
+        return [name] + str_related(field.related_model, f"{name}__")
+
+    def get_list_select_related(self, request):
+        declared = super().get_list_select_related(request)
+        if declared is True:
+            return True
+        paths = set(declared or ())
+        for name in self.get_list_display(request):
+            paths.update(self._display_paths(name))
+        # Drop paths another path already covers; select_related joins every step.
+        return sorted(path for path in paths if not any(other.startswith(path + '__') for other in paths))
+
+    def get_list_filter(self, request):
+        list_filter = []
+        for entry in super().get_list_filter(request):
+            if isinstance(entry, str):
+                try:
+                    model = _related_model(self.model, entry)
+                except (FieldDoesNotExist, AttributeError):
+                    model = None
+                if model is not None:
+                    entry = (entry, StrRelatedFieldListFilter)
+            list_filter.append(entry)
+        return list_filter
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator whose count past a threshold comes from ``row_counts`` and may be approximate."""
+
+    approximate = False
+
+    @cached_property
+    def count(self):
+        count, self.approximate = row_counts.count(self.object_list)
+        return count
+
+
+class ApproximateCountMixin:
+    """
+    For changelists over very large tables: skip the unfiltered total and let
+    the paginator estimate the filtered one. ``admin/api/pagination.html``
+    shows such counts as "about N".
+    """
+
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+CURSOR_VAR = 'cursor'
+
+
+def _encode_key(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Changelist that pages by seeking past the rows already shown instead of
+    by OFFSET, so a page deep into history costs the same as the first.
+
+    It applies while the list is in the admin's default ordering of plain,
+    non-null fields (pk is appended as the tie-breaker); sorting by a column
+    or "Show all" fall back to numbered pages. Each page is one probe of the
+    ordering keys, which the matching composite index covers, and one fetch
+    of the rows. The ``cursor`` parameter carries the keys of the row to
+    continue from and the direction to go in.
+    """
+
+    keyset = None
+    next_url = previous_url = first_url = None
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Any other change to the query string starts again from the first page.
+        if not (new_params and CURSOR_VAR in new_params):
+            remove = [*(remove or ()), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_keyset(self, request):
+        """``[(field, descending)]`` to seek on, or ``None`` when the ordering cannot be seeked."""
+        if self.params.get(ORDER_VAR):
+            return None
+        keyset = []
+        for entry in self.model_admin.get_ordering(request) or self._get_default_ordering():
+            if not isinstance(entry, str):
+                return None
+            name = entry.removeprefix('-')
+            try:
+                field = self.opts.pk if name == 'pk' else self.opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.null or field.is_relation:
+                return None
+            keyset.append((field, entry.startswith('-')))
+        if not keyset:
+            return None
+        if not keyset[-1][0].primary_key:
+            keyset.append((self.opts.pk, keyset[-1][1]))
+        return keyset
+
+    def _ordering(self, forward):
+        return [('-' if descending == forward else '') + field.name for field, descending in self.keyset]
+
+    def _seek(self, values, forward, inclusive=False):
+        """Rows after the row with key ``values`` in the given direction."""
+        q = Q()
+        for i, (field, descending) in enumerate(self.keyset):
+            lookup = 'lt' if descending == forward else 'gt'
+            equal = {f.name: value for (f, _), value in zip(self.keyset[:i], values)}
+            q |= Q(**equal, **{f'{field.name}__{lookup}': values[i]})
+        if inclusive:
+            q |= Q(**{field.name: value for (field, _), value in zip(self.keyset, values)})
+        # The redundant bound on the leading key gives the database a range to start the index scan from.
+        first, descending = self.keyset[0]
+        bound = 'lte' if descending == forward else 'gte'
+        return Q(**{f'{first.name}__{bound}': values[0]}) & q
+
+    def _cursor(self, values, direction):
+        payload = json.dumps([direction, [_encode_key(value) for value in values]])
+        return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _parse_cursor(self, token):
+        try:
+            direction, values = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if direction not in ('next', 'previous') or len(values) != len(self.keyset):
+                raise ValueError
+            return direction, [field.to_python(value) for (field, _), value in zip(self.keyset, values)]
+        except (ValueError, TypeError, ValidationError):
+            raise IncorrectLookupParameters
+
+    def get_results(self, request):
+        super().get_results(request)
+        keyset = self.get_keyset(request)
+        if keyset is None or (self.show_all and self.can_show_all) or not self.multi_page:
+            return
+        self.keyset = keyset
+        names = [field.name for field, _ in keyset]
+
+        token = request.GET.get(CURSOR_VAR)
+        direction = 'next'
+        probe = self.queryset
+        if token:
+            direction, values = self._parse_cursor(token)
+            probe = probe.filter(self._seek(values, forward=direction == 'next'))
+        forward = direction == 'next'
+        keys = list(probe.order_by(*self._ordering(forward)).values_list(*names)[:self.list_per_page + 1])
+        more = len(keys) > self.list_per_page
+        keys = keys[:self.list_per_page]
+        if not forward:
+            keys.reverse()
+        has_next, has_previous = (more, bool(token)) if forward else (True, more)
+
+        page = self.queryset.order_by(*self._ordering(True))
+        if keys and token:
+            page = page.filter(self._seek(keys[0], forward=True, inclusive=True))
+        self.result_list = page[:self.list_per_page] if keys else page.none()
+        if keys and has_next:
+            self.next_url = self.get_query_string({CURSOR_VAR: self._cursor(keys[-1], 'next')})
+        if keys and has_previous:
+            self.previous_url = self.get_query_string({CURSOR_VAR: self._cursor(keys[0], 'previous')})
+            self.first_url = self.get_query_string()
+
+
+class FullTextSearchMixin:
+    """Answer the search box from the full-text index (``services.search``) instead of ``LIKE '%term%'`` scans."""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(pk__in=search.matching_ids(self.model, search_term)), False
+
+
+class KeysetPaginationMixin:
+    """Page the default ordering with ``KeysetChangeList``; for time-ordered tables that grow without bound."""
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+SEARCH_LOOKUPS = {'^': 'istartswith', '=': 'iexact', '@': 'search'}
+
+
+def _search_q(model, paths, term):
+    q = Q()
+    nested = {}
+    for path, lookup in paths:
+        name, _, rest = path.partition('__')
+        if rest and model._meta.get_field(name).is_relation:
+            nested.setdefault(name, []).append((rest, lookup))
+        else:
+            q |= Q(**{f'{path}__{lookup}': term})
+    for name, related_paths in nested.items():
+        related = model._meta.get_field(name).related_model
+        subquery = related._default_manager.filter(_search_q(related, related_paths, term)).values('pk')
+        q |= Q(**{f'{name}__in': subquery})
+    return q
+
+
+class IndexedSearchMixin:
+    """
+    Search each related table in its own ``IN`` subquery rather than one OR
+    across joins, which the database can only answer with a scan. With ``^``
+    search fields every branch is a range scan on the prefix indexes from
+    migration 0013, so autocomplete lookups stay fast on large tables.
+    Results also load what their ``__str__`` reads, for the autocomplete labels.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        related = str_related(self.model)
+        if related:
+            queryset = queryset.select_related(*related)
+        search_fields = self.get_search_fields(request)
+        if not (search_fields and search_term):
+            return queryset, False
+        paths = []
+        for field in search_fields:
+            lookup = SEARCH_LOOKUPS.get(field[0])
+            paths.append((field[1:], lookup) if lookup else (field, 'icontains'))
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            queryset = queryset.filter(_search_q(self.model, paths, bit))
+        return queryset, False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(IndexedSearchMixin, BaseUserAdmin):
+    search_fields = ('^username', '^first_name', '^last_name', '^email')
 
 
 @admin.register(AcademicYear)
-class AcademicYearAdmin(admin.ModelAdmin):
+class AcademicYearAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('name', 'start_date', 'end_date', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('name',)
@@ -18,7 +347,7 @@ class AcademicYearAdmin(admin.ModelAdmin):
 
 
 @admin.register(Semester)
-class SemesterAdmin(admin.ModelAdmin):
+class SemesterAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('semester_type', 'academic_year', 'start_date', 'end_date', 'is_active', 'enrollment_period')
     list_filter = ('is_active', 'semester_type', 'academic_year')
     search_fields = ('semester_type', 'academic_year__name')
@@ -32,11 +361,12 @@ class SemesterAdmin(admin.ModelAdmin):
 
 
 @admin.register(Department)
-class DepartmentAdmin(admin.ModelAdmin):
+class DepartmentAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('code', 'name', 'head', 'email', 'phone', 'building')
     list_filter = ('building',)
     search_fields = ('name', 'code', 'email')
     ordering = ('name',)
+    autocomplete_fields = ('head',)
     fieldsets = (
         ('Basic Information', {
             'fields': ('name', 'code', 'description')
@@ -51,12 +381,13 @@ class DepartmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Faculty)
-class FacultyAdmin(admin.ModelAdmin):
+class FacultyAdmin(IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('employee_id', 'full_name', 'title', 'department', 'employment_status', 'is_active')
     list_filter = ('employment_status', 'is_active', 'department', 'title')
-    search_fields = ('employee_id', 'user__first_name', 'user__last_name', 'user__email')
+    search_fields = ('^employee_id', '^user__first_name', '^user__last_name', '^user__email')
     ordering = ('user__last_name',)
     list_editable = ('is_active',)
+    autocomplete_fields = ('user',)
     
     fieldsets = (
         ('User Account', {
@@ -76,16 +407,18 @@ class FacultyAdmin(admin.ModelAdmin):
     def full_name(self, obj):
         return obj.user.get_full_name()
     full_name.short_description = 'Name'
+    full_name.related = ('user',)
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student_id', 'full_name', 'department', 'year_level', 'status', 'enrolled_at')
     list_filter = ('status', 'year_level', 'department', 'enrolled_at')
-    search_fields = ('student_id', 'user__first_name', 'user__last_name', 'user__email')
+    search_fields = ('^student_id', '^user__first_name', '^user__last_name', '^user__email')
     ordering = ('student_id',)
     date_hierarchy = 'enrolled_at'
     list_editable = ('status',)
+    autocomplete_fields = ('user',)
     
     fieldsets = (
         ('User Account', {
@@ -105,21 +438,38 @@ class StudentAdmin(admin.ModelAdmin):
     def full_name(self, obj):
         return obj.user.get_full_name()
     full_name.short_description = 'Name'
+    full_name.related = ('user',)
 
 
 @admin.register(Program)
-class ProgramAdmin(admin.ModelAdmin):
+class ProgramAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('code', 'name', 'degree_type', 'department', 'total_units', 'duration_years')
     list_filter = ('degree_type', 'department')
     search_fields = ('name', 'code')
     ordering = ('code',)
 
 
+class CourseAdminForm(forms.ModelForm):
+    class Meta:
+        model = Course
+        fields = '__all__'
+
+    def clean_prerequisites(self):
+        selected = self.cleaned_data['prerequisites']
+        if self.instance.pk:
+            try:
+                prerequisites.check_cycle(self.instance.pk, [course.pk for course in selected])
+            except ValidationError as exc:
+                raise forms.ValidationError(exc.messages)
+        return selected
+
+
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
+    form = CourseAdminForm
     list_display = ('course_code', 'title', 'department', 'units', 'course_type', 'year_level', 'semester_offered')
     list_filter = ('course_type', 'department', 'year_level', 'semester_offered')
-    search_fields = ('course_code', 'title')
+    search_fields = ('^course_code', 'title')
     ordering = ('course_code',)
     filter_horizontal = ('prerequisites',)
     
@@ -136,19 +486,43 @@ class CourseAdmin(admin.ModelAdmin):
     )
 
 
+class ScheduleInlineFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        meetings = []
+        for form in self.forms:
+            data = getattr(form, 'cleaned_data', None)
+            if not data or data.get('DELETE') or not all(
+                data.get(field) for field in ('day_of_week', 'start_time', 'end_time', 'room')
+            ):
+                continue
+            if data['start_time'] >= data['end_time']:
+                form.add_error('end_time', "End time must be after the start time.")
+                continue
+            meetings.append(data)
+        if not meetings or not self.instance.semester_id:
+            return
+        clashes = rooms.find_clashes(self.instance.semester_id, meetings, exclude_offering_id=self.instance.pk)
+        if clashes:
+            raise ValidationError(["Room double-booked:"] + clashes)
+
+
 class ScheduleInline(admin.TabularInline):
     model = Schedule
+    formset = ScheduleInlineFormSet
     extra = 1
     fields = ('day_of_week', 'start_time', 'end_time', 'room', 'building')
 
 
 @admin.register(CourseOffering)
-class CourseOfferingAdmin(admin.ModelAdmin):
+class CourseOfferingAdmin(IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('course', 'section', 'semester', 'faculty', 'enrolled_count', 'max_slots', 'available_slots_display', 'is_active')
     list_filter = ('semester', 'course__department', 'is_active')
-    search_fields = ('course__course_code', 'course__title', 'section', 'faculty__user__last_name')
+    search_fields = ('^course__course_code', 'course__title', '^section', '^faculty__user__last_name')
     ordering = ('course', 'section')
     list_editable = ('is_active',)
+    readonly_fields = ('enrolled_count',)
+    autocomplete_fields = ('course', 'faculty')
     inlines = [ScheduleInline]
     
     fieldsets = (
@@ -171,7 +545,7 @@ class CourseOfferingAdmin(admin.ModelAdmin):
 
 
 @admin.register(Schedule)
-class ScheduleAdmin(admin.ModelAdmin):
+class ScheduleAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('course_offering', 'day_of_week', 'start_time', 'end_time', 'room', 'building')
     list_filter = ('day_of_week', 'course_offering__semester')
     search_fields = ('course_offering__course__course_code', 'room', 'building')
@@ -179,13 +553,14 @@ class ScheduleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(KeysetPaginationMixin, ApproximateCountMixin, IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student', 'course_offering', 'date_enrolled', 'status', 'dropped_date')
     list_filter = ('status', 'date_enrolled', 'course_offering__semester')
-    search_fields = ('student__student_id', 'student__user__first_name', 'student__user__last_name', 'course_offering__course__course_code')
+    search_fields = ('^student__student_id', '^student__user__first_name', '^student__user__last_name', '^course_offering__course__course_code')
     ordering = ('-date_enrolled',)
     date_hierarchy = 'date_enrolled'
     list_editable = ('status',)
+    autocomplete_fields = ('student', 'course_offering')
     
     fieldsets = (
         ('Enrollment Information', {
@@ -196,32 +571,57 @@ class EnrollmentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a student to another section is a drop plus a new enrollment.
+        if obj is not None:
+            return ('student', 'course_offering', 'date_enrolled')
+        return ('date_enrolled',)
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            enrollment_service.create_enrollment(obj)
+            return
+        with transaction.atomic():
+            if 'status' in form.changed_data:
+                enrollment_service.set_status(obj, obj.status)
+            super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        enrollment_service.delete_enrollments(Enrollment.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        enrollment_service.delete_enrollments(queryset)
+
 
 @admin.register(Grade)
-class GradeAdmin(admin.ModelAdmin):
+class GradeAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student_display', 'course_display', 'midterm_grade', 'final_grade', 'final_rating', 'remarks', 'date_submitted')
     list_filter = ('final_rating', 'remarks', 'enrollment__course_offering__semester')
     search_fields = ('enrollment__student__student_id', 'enrollment__student__user__first_name', 'enrollment__student__user__last_name', 'enrollment__course_offering__course__course_code')
     ordering = ('-date_submitted',)
     date_hierarchy = 'date_submitted'
+    autocomplete_fields = ('enrollment',)
     
     def student_display(self, obj):
         return obj.enrollment.student.student_id
     student_display.short_description = 'Student ID'
+    student_display.related = ('enrollment__student',)
     
     def course_display(self, obj):
         return obj.enrollment.course_offering.course.course_code
     course_display.short_description = 'Course'
+    course_display.related = ('enrollment__course_offering__course',)
 
 
 @admin.register(Announcement)
-class AnnouncementAdmin(admin.ModelAdmin):
+class AnnouncementAdmin(FullTextSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('title', 'department', 'posted_by', 'priority', 'target_audience', 'is_active', 'created_at', 'expiry_date')
     list_filter = ('priority', 'target_audience', 'is_active', 'department', 'created_at')
     search_fields = ('title', 'content')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
     list_editable = ('is_active', 'priority')
+    autocomplete_fields = ('posted_by',)
     
     fieldsets = (
         ('Announcement Details', {
@@ -237,43 +637,47 @@ class AnnouncementAdmin(admin.ModelAdmin):
 
 
 @admin.register(Assessment)
-class AssessmentAdmin(admin.ModelAdmin):
+class AssessmentAdmin(IndexedSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('title', 'course_offering', 'assessment_type', 'max_score', 'weight', 'date_given')
     list_filter = ('assessment_type', 'date_given', 'course_offering__semester')
-    search_fields = ('title', 'course_offering__course__course_code')
+    search_fields = ('title', '^course_offering__course__course_code')
     ordering = ('-date_given',)
     date_hierarchy = 'date_given'
 
 
 @admin.register(AssessmentScore)
-class AssessmentScoreAdmin(admin.ModelAdmin):
+class AssessmentScoreAdmin(KeysetPaginationMixin, ApproximateCountMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student_display', 'assessment', 'score', 'percentage', 'date_recorded')
     list_filter = ('assessment__assessment_type', 'date_recorded')
     search_fields = ('enrollment__student__student_id', 'assessment__title')
     ordering = ('-date_recorded',)
     date_hierarchy = 'date_recorded'
+    autocomplete_fields = ('enrollment', 'assessment')
     
     def student_display(self, obj):
         return obj.enrollment.student.student_id
     student_display.short_description = 'Student ID'
+    student_display.related = ('enrollment__student',)
     
     def percentage(self, obj):
         if obj.assessment.max_score > 0:
             pct = (obj.score / obj.assessment.max_score) * 100
             color = 'green' if pct >= 75 else 'orange' if pct >= 60 else 'red'
-            return format_html('<span style="color: {};">{:.2f}%</span>', color, pct)
+            return format_html('<span style="color: {};">{}%</span>', color, f'{pct:.2f}')
         return '-'
     percentage.short_description = 'Percentage'
+    percentage.related = ('assessment',)
 
 
 @admin.register(DocumentRequest)
-class DocumentRequestAdmin(admin.ModelAdmin):
+class DocumentRequestAdmin(KeysetPaginationMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student', 'document_type', 'copies', 'status', 'request_date', 'processing_fee', 'claimed_date')
     list_filter = ('document_type', 'status', 'request_date')
     search_fields = ('student__student_id', 'student__user__first_name', 'student__user__last_name')
     ordering = ('-request_date',)
     date_hierarchy = 'request_date'
     list_editable = ('status',)
+    autocomplete_fields = ('student',)
     
     fieldsets = (
         ('Request Information', {
@@ -289,13 +693,14 @@ class DocumentRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(FullTextSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('title', 'event_type', 'start_datetime', 'end_datetime', 'venue', 'organizer', 'max_participants', 'is_published')
     list_filter = ('event_type', 'is_published', 'department', 'start_datetime')
     search_fields = ('title', 'venue', 'organizer__username')
     ordering = ('-start_datetime',)
     date_hierarchy = 'start_datetime'
     list_editable = ('is_published',)
+    autocomplete_fields = ('organizer',)
     
     fieldsets = (
         ('Event Details', {
@@ -314,23 +719,25 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(EventRegistration)
-class EventRegistrationAdmin(admin.ModelAdmin):
+class EventRegistrationAdmin(QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student', 'event', 'registration_date', 'attended', 'certificate_issued')
     list_filter = ('attended', 'certificate_issued', 'registration_date', 'event__event_type')
     search_fields = ('student__student_id', 'student__user__first_name', 'student__user__last_name', 'event__title')
     ordering = ('-registration_date',)
     date_hierarchy = 'registration_date'
     list_editable = ('attended', 'certificate_issued')
+    autocomplete_fields = ('student', 'event')
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(KeysetPaginationMixin, ApproximateCountMixin, FullTextSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('recipient', 'notification_type', 'title', 'is_read', 'created_at')
     list_filter = ('notification_type', 'is_read', 'created_at')
     search_fields = ('recipient__username', 'title', 'message')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
     list_editable = ('is_read',)
+    autocomplete_fields = ('recipient',)
     
     fieldsets = (
         ('Notification Information', {
@@ -343,13 +750,14 @@ class NotificationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Feedback)
-class FeedbackAdmin(admin.ModelAdmin):
+class FeedbackAdmin(FullTextSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('student', 'feedback_type', 'subject', 'status', 'submitted_at', 'responded_by', 'responded_at')
     list_filter = ('feedback_type', 'status', 'submitted_at')
     search_fields = ('student__student_id', 'subject', 'message')
     ordering = ('-submitted_at',)
     date_hierarchy = 'submitted_at'
     list_editable = ('status',)
+    autocomplete_fields = ('student', 'responded_by')
     
     fieldsets = (
         ('Feedback Information', {
@@ -365,13 +773,14 @@ class FeedbackAdmin(admin.ModelAdmin):
 
 
 @admin.register(CourseEvaluation)
-class CourseEvaluationAdmin(admin.ModelAdmin):
+class CourseEvaluationAdmin(FullTextSearchMixin, QueryBudgetMixin, admin.ModelAdmin):
     list_display = ('enrollment', 'teaching_effectiveness', 'course_content', 'learning_resources', 'assessment_fairness', 'overall_satisfaction', 'submitted_at', 'is_anonymous')
     list_filter = ('is_anonymous', 'submitted_at', 'overall_satisfaction')
     search_fields = ('enrollment__student__student_id', 'enrollment__course_offering__course__course_code', 'comments')
     ordering = ('-submitted_at',)
     date_hierarchy = 'submitted_at'
     readonly_fields = ('submitted_at',)
+    autocomplete_fields = ('enrollment',)
     
     fieldsets = (
         ('Evaluation Information', {
@@ -383,4 +792,54 @@ class CourseEvaluationAdmin(admin.ModelAdmin):
         ('Comments', {
             'fields': ('comments', 'submitted_at')
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(AdmissionTicket)
+class AdmissionTicketAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display = ('id', 'student', 'course_offering', 'status', 'reason', 'created_at', 'processed_at')
+    list_filter = ('status', 'course_offering__semester')
+    search_fields = ('student__student_id', 'course_offering__course__course_code')
+    ordering = ('-id',)
+    raw_id_fields = ('student', 'course_offering', 'enrollment')
+    readonly_fields = ('created_at', 'processed_at')
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display = ('course_offering', 'position', 'student', 'status', 'created_at', 'resolved_at')
+    list_filter = ('status', 'course_offering__semester')
+    search_fields = ('student__student_id', 'course_offering__course__course_code')
+    ordering = ('course_offering', 'position')
+    raw_id_fields = ('student', 'course_offering')
+    readonly_fields = ('created_at', 'resolved_at')
+
+
+@admin.register(HonorsRanking)
+class HonorsRankingAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display = ('semester', 'department', 'year_level', 'rank', 'student', 'gwa', 'deans_list', 'latin_honor')
+    list_filter = ('semester', 'department', 'year_level', 'deans_list', 'latin_honor')
+    search_fields = ('student__student_id',)
+    ordering = ('semester', 'department', 'year_level', 'rank')
+    raw_id_fields = ('student',)
+    readonly_fields = ('computed_at',)
+
+
+@admin.register(GradeChange)
+class GradeChangeAdmin(QueryBudgetMixin, admin.ModelAdmin):
+    list_display = (
+        'changed_at', 'student', 'course_offering', 'enrollment_id', 'field', 'assessment_id', 'old_value',
+        'new_value', 'actor',
+    )
+    list_filter = ('field', 'changed_at')
+    search_fields = ('student__student_id',)
+    ordering = ('-changed_at', '-id')
+    date_hierarchy = 'changed_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
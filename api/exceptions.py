@@ -0,0 +1,26 @@
+class EnrollmentError(Exception):
+    """Raised when an enrollment operation cannot be completed."""
+
+
+class OfferingFull(EnrollmentError):
+    pass
+
+
+class AlreadyEnrolled(EnrollmentError):
+    pass
+
+
+class ScheduleConflict(EnrollmentError):
+    pass
+
+
+class GradeImportError(Exception):
+    """Raised when a grade sheet cannot be read at all (as opposed to per-row errors)."""
+
+
+class ScoreSheetConflict(Exception):
+    """Raised when edited score cells were changed by someone else since the sheet was loaded."""
+
+    def __init__(self, conflicts):
+        super().__init__(f"{len(conflicts)} cell(s) were changed by someone else.")
+        self.conflicts = conflicts
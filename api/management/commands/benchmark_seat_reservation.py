@@ -0,0 +1,168 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.utils import timezone
+
+from api.exceptions import EnrollmentError
+from api.models import AcademicYear, Course, CourseOffering, Enrollment, Semester, Student
+from api.services import enrollment as enrollment_service
+
+
+def _naive_reserve(student_id, offering_id):
+    # Read-check-write, the way enrolled_count was maintained by hand.
+    offering = CourseOffering.objects.get(pk=offering_id)
+    if offering.enrolled_count >= offering.max_slots:
+        raise EnrollmentError("full")
+    Enrollment.objects.create(student_id=student_id, course_offering_id=offering_id, status='ENROLLED')
+    CourseOffering.objects.filter(pk=offering_id).update(enrolled_count=offering.enrolled_count + 1)
+
+
+def _atomic_reserve(student_id, offering_id):
+    enrollment_service.reserve_seat(Student(pk=student_id), offering_id)
+
+
+STRATEGIES = {
+    'atomic': _atomic_reserve,
+    'naive': _naive_reserve,
+}
+
+
+def _run_threads(reserve, student_ids, offering_id, threads):
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def work(chunk):
+        local = Counter()
+        for student_id in chunk:
+            try:
+                reserve(student_id, offering_id)
+                local['enrolled'] += 1
+            except EnrollmentError:
+                local['rejected'] += 1
+            except IntegrityError:
+                # The enrolled_count CHECK constraint refused a write that would oversell.
+                local['violations'] += 1
+            except OperationalError:
+                local['errors'] += 1
+        connection.close()
+        with lock:
+            outcomes.update(local)
+
+    workers = [
+        threading.Thread(target=work, args=(student_ids[i::threads],))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return outcomes
+
+
+def _process_main(strategy, student_ids, offering_id, threads, results):
+    results.put(_run_threads(STRATEGIES[strategy], student_ids, offering_id, threads))
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a single course offering with concurrent seat reservations and "
+        "report throughput and oversell. The offering_enrolled_within_max_slots "
+        "constraint stops enrolled_count itself from passing max_slots, so a strategy "
+        "that races shows up as check violations, extra enrollment rows and lost "
+        "updates. Creates and removes its own fixture data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='atomic')
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=8, help="Threads per process.")
+        parser.add_argument('--students', type=int, default=400)
+        parser.add_argument('--slots', type=int, default=100)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        offering, student_ids = self._seed(tag, options['students'], options['slots'])
+        try:
+            elapsed, outcomes = self._hammer(offering.pk, student_ids, options)
+            self._report(offering, elapsed, outcomes, options)
+        finally:
+            self._cleanup(tag)
+
+    def _seed(self, tag, students, slots):
+        today = timezone.localdate()
+        year = AcademicYear.objects.create(
+            name=f"BENCH-{tag}", start_date=today, end_date=today + timedelta(days=365),
+        )
+        semester = Semester.objects.create(
+            academic_year=year, semester_type='1ST', start_date=today,
+            end_date=today + timedelta(days=120), enrollment_start=today,
+            enrollment_end=today + timedelta(days=7),
+        )
+        course = Course.objects.create(course_code=f"B{tag}", title="Benchmark Course")
+        offering = CourseOffering.objects.create(
+            course=course, semester=semester, section='A', max_slots=slots,
+        )
+        users = User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}") for i in range(students)
+        )
+        created = Student.objects.bulk_create(
+            Student(user=user, student_id=f"B{tag}{i:06d}") for i, user in enumerate(users)
+        )
+        return offering, [student.pk for student in created]
+
+    def _hammer(self, offering_id, student_ids, options):
+        processes, threads = options['processes'], options['threads']
+        outcomes = Counter()
+        connections.close_all()
+        started = time.perf_counter()
+        if processes <= 1:
+            outcomes.update(_run_threads(STRATEGIES[options['strategy']], student_ids, offering_id, threads))
+        else:
+            context = multiprocessing.get_context('fork')
+            results = context.Queue()
+            workers = [
+                context.Process(
+                    target=_process_main,
+                    args=(options['strategy'], student_ids[i::processes], offering_id, threads, results),
+                )
+                for i in range(processes)
+            ]
+            for worker in workers:
+                worker.start()
+            for _ in workers:
+                outcomes.update(results.get())
+            for worker in workers:
+                worker.join()
+        return time.perf_counter() - started, outcomes
+
+    def _report(self, offering, elapsed, outcomes, options):
+        offering.refresh_from_db()
+        seated = offering.enrollments.filter(status__in=Enrollment.SEAT_HOLDING_STATUSES).count()
+        attempts = sum(outcomes.values())
+        lines = [
+            f"strategy:         {options['strategy']}",
+            f"workers:          {options['processes']} process(es) x {options['threads']} thread(s)",
+            f"attempts:         {attempts} in {elapsed:.2f}s ({attempts / elapsed:.0f} reservations/s)",
+            f"enrolled:         {outcomes['enrolled']}",
+            f"rejected (full):  {outcomes['rejected']}",
+            f"check violations: {outcomes['violations']}",
+            f"db errors:        {outcomes['errors']}",
+            f"max_slots:        {offering.max_slots}",
+            f"enrollment rows:  {seated}",
+            f"enrolled_count:   {offering.enrolled_count}",
+            f"oversold:         {max(seated - offering.max_slots, 0)}",
+            f"lost updates:     {seated - offering.enrolled_count}",
+        ]
+        self.stdout.write("\n".join(lines))
+
+    def _cleanup(self, tag):
+        User.objects.filter(username__startswith=f"bench-{tag}-").delete()
+        Course.objects.filter(course_code=f"B{tag}").delete()
+        AcademicYear.objects.filter(name=f"BENCH-{tag}").delete()
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import CourseOffering
+from api.services import grading
+
+
+class Command(BaseCommand):
+    help = "Compute weighted midterm/final grades for course offerings from their assessment scores."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offering', type=int, action='append', dest='offerings', required=True)
+        parser.add_argument('--policy', choices=grading.MISSING_POLICIES, default='zero',
+                            help="How missing scores are treated.")
+        parser.add_argument('--dry-run', action='store_true', help="Print the results without saving them.")
+
+    def handle(self, *args, **options):
+        offerings = CourseOffering.objects.select_related('course', 'semester').in_bulk(options['offerings'])
+        missing = set(options['offerings']) - set(offerings)
+        if missing:
+            raise CommandError(f"Unknown course offering(s): {', '.join(map(str, sorted(missing)))}.")
+
+        for offering in offerings.values():
+            started = time.perf_counter()
+            results = grading.compute_offering_grades(offering, options['policy'], save=not options['dry_run'])
+            elapsed = time.perf_counter() - started
+            if options['dry_run']:
+                for row in results:
+                    self.stdout.write(
+                        f"  enrollment {row['enrollment']}: midterm {row['midterm_percentage']} "
+                        f"({row['midterm_rating']}), final {row['final_percentage']} ({row['final_rating']})"
+                    )
+            self.stdout.write(f"{offering.course.course_code} {offering.section}: {len(results)} grade(s) in {elapsed:.2f}s")
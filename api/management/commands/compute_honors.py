@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services import current_term, honors
+
+
+class Command(BaseCommand):
+    help = "Rank a semester's students by GWA per department and year level and snapshot dean's list / latin honors."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help="Semester id (defaults to the active semester).")
+        parser.add_argument('--tie-break', choices=honors.TIE_BREAKS, default='shared')
+
+    def handle(self, *args, **options):
+        semester_id = options['semester']
+        if semester_id is None:
+            semester = current_term.get().semester
+            if semester is None:
+                raise CommandError("No active semester; pass --semester.")
+            semester_id = semester.pk
+        started = time.perf_counter()
+        ranked = honors.compute(semester_id, options['tie_break'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Ranked {ranked} student(s) for semester {semester_id} in {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.exceptions import EnrollmentError
+from api.models import Department
+from api.services import enrollment as enrollment_service
+
+
+class Command(BaseCommand):
+    help = "Enroll a block-section cohort (department and/or year level) in a fixed set of course offerings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offering', type=int, action='append', required=True, dest='offerings',
+                            help="CourseOffering id; repeat for each offering in the block.")
+        parser.add_argument('--department', help="Department code, e.g. CS.")
+        parser.add_argument('--year-level', type=int)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        department = None
+        if options['department']:
+            try:
+                department = Department.objects.get(code=options['department'])
+            except Department.DoesNotExist:
+                raise CommandError(f"Unknown department code {options['department']!r}.")
+        if department is None and options['year_level'] is None:
+            raise CommandError("Give at least one of --department or --year-level.")
+
+        started = time.perf_counter()
+        try:
+            summary = enrollment_service.enroll_cohort(
+                options['offerings'], department=department, year_level=options['year_level'],
+                batch_size=options['batch_size'],
+            )
+        except EnrollmentError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for offering_id, row in summary.items():
+            self.stdout.write(f"offering {offering_id}: {row['enrolled']} enrolled, {row['skipped']} already enrolled")
+        total = sum(row['enrolled'] for row in summary.values())
+        self.stdout.write(self.style.SUCCESS(f"Created {total} enrollment(s) in {elapsed:.2f}s."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Student
+from api.services import academic_standing
+
+
+class Command(BaseCommand):
+    help = "Re-evaluate probation/suspension for students whose grades changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Recheck every student the engine manages (e.g. after changing PORTAL_STANDING_RULES).",
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            academic_standing.mark(
+                Student.objects.filter(status__in=academic_standing.MANAGED_STATUSES).values_list('pk', flat=True)
+            )
+        result = academic_standing.run(options['batch_size'])
+        for (old, new), count in sorted(result['changes'].items()):
+            self.stdout.write(f"{old} -> {new}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Evaluated {result['evaluated']} student(s)."))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.exceptions import GradeImportError
+from api.models import Faculty
+from api.services import current_term, grade_import
+
+
+class Command(BaseCommand):
+    help = "Import a CSV/XLSX grade sheet (student_id, course_code, section, final_rating[, midterm_grade, final_grade, remarks])."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--semester', type=int, help="Semester id (defaults to the active semester).")
+        parser.add_argument('--faculty', help="Employee id; only accept rows for this faculty member's sections.")
+        parser.add_argument('--partial', action='store_true', help="Save valid rows even if some rows have errors.")
+
+    def handle(self, *args, **options):
+        semester_id = options['semester']
+        if semester_id is None:
+            semester = current_term.get().semester
+            if semester is None:
+                raise CommandError("No active semester; pass --semester.")
+            semester_id = semester.pk
+        faculty = None
+        if options['faculty']:
+            faculty = Faculty.objects.filter(employee_id=options['faculty']).first()
+            if faculty is None:
+                raise CommandError(f"Unknown faculty employee id {options['faculty']!r}.")
+
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as file:
+                records = grade_import.read_sheet(file, options['path'])
+                summary = grade_import.import_grades(records, semester_id, faculty=faculty, partial=options['partial'])
+        except (OSError, GradeImportError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for error in summary['errors']:
+            self.stdout.write(f"row {error['row']}: {' '.join(error['errors'])}")
+        message = f"{summary['created']} created, {summary['updated']} updated in {elapsed:.2f}s."
+        if summary['errors']:
+            message = f"{len(summary['errors'])} row(s) with errors; {message}"
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.services import transcripts
+
+
+class Command(BaseCommand):
+    help = "Delete transcript renders that were superseded longer ago than PORTAL_TRANSCRIPT_RETENTION."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, help="Seconds a superseded render is kept (overrides the setting).")
+
+    def handle(self, *args, **options):
+        removed = transcripts.prune(options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} file(s) from {transcripts.storage_dir()}."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.services import prerequisites
+
+
+class Command(BaseCommand):
+    help = "Rebuild the transitive closure of Course.prerequisites from scratch."
+
+    def handle(self, *args, **options):
+        rows = prerequisites.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Closure rebuilt with {rows} row(s)."))
@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services import search
+
+
+class Command(BaseCommand):
+    help = "Reindex the full-text search documents of the searchable models."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', action='append', dest='models',
+            help="Model to reindex, e.g. api.Announcement; repeatable. Defaults to all searchable models.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc))
+            unknown = [model._meta.label for model in models if model not in search.INDEXED]
+            if unknown:
+                raise CommandError(f"Not searchable: {', '.join(unknown)}.")
+        counts = search.rebuild(models, batch_size=options['batch_size'])
+        for label, total in counts.items():
+            self.stdout.write(f"{label}: {total} document(s)")
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt with {type(search.backend()).__name__}."))
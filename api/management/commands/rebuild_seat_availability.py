@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Semester
+from api.services import seat_availability
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cached seat-availability read model (active semesters by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, action='append', dest='semesters', help="Semester id; repeatable.")
+
+    def handle(self, *args, **options):
+        semester_ids = options['semesters'] or list(Semester.objects.filter(is_active=True).values_list('pk', flat=True))
+        if not semester_ids:
+            raise CommandError("No active semester; pass --semester.")
+        for semester_id in semester_ids:
+            offerings = seat_availability.rebuild(semester_id)
+            self.stdout.write(f"semester {semester_id}: {len(offerings)} offering(s)")
+        self.stdout.write(self.style.SUCCESS("Seat availability rebuilt."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.services import standings
+
+
+class Command(BaseCommand):
+    help = "Verify materialized student standings (GWA) against a full recompute from Grade rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, action='append', dest='students', help="Student id; repeatable.")
+        parser.add_argument('--fix', action='store_true', help="Rewrite rows that do not match.")
+
+    def handle(self, *args, **options):
+        mismatched = standings.reconcile(options['students'], fix=options['fix'])
+        for student_id, semester_id in mismatched:
+            self.stdout.write(f"student {student_id}, {'semester ' + str(semester_id) if semester_id else 'cumulative'}")
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS("All standings match."))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatched)} standing(s)."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(mismatched)} standing(s) differ; rerun with --fix."))
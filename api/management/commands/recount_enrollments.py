@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.services import enrollment as enrollment_service
+
+
+class Command(BaseCommand):
+    help = "Rebuild CourseOffering.enrolled_count from the Enrollment rows."
+
+    def handle(self, *args, **options):
+        fixed = enrollment_service.recount_enrolled()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {fixed} course offering(s)."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.services import grade_distribution
+
+
+class Command(BaseCommand):
+    help = "Reconcile the grade distribution rollup with the Grade rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='courses', help="Course id; repeatable.")
+        parser.add_argument('--semester', type=int, action='append', dest='semesters', help="Semester id; repeatable.")
+
+    def handle(self, *args, **options):
+        changed = grade_distribution.refresh(options['courses'], options['semesters'])
+        if changed:
+            self.stdout.write(self.style.WARNING(f"Corrected {changed} bucket(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Grade distribution is up to date."))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services import current_term, rooms
+
+
+class Command(BaseCommand):
+    help = "List double-booked rooms and per-room utilization for a semester."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help="Semester id (defaults to the active semester).")
+        parser.add_argument('--conflicts-only', action='store_true')
+
+    def handle(self, *args, **options):
+        semester_id = options['semester']
+        if semester_id is None:
+            semester = current_term.get().semester
+            if semester is None:
+                raise CommandError("No active semester; pass --semester.")
+            semester_id = semester.pk
+
+        started = time.perf_counter()
+        report = rooms.room_report(semester_id)
+        elapsed = time.perf_counter() - started
+
+        for conflict in report['conflicts']:
+            first, second = conflict['schedules']
+            self.stdout.write(
+                f"{conflict['building']} {conflict['room']} {conflict['day']}: "
+                f"{first['label']} overlaps {second['label']}"
+            )
+        if not options['conflicts_only']:
+            for room in report['rooms']:
+                self.stdout.write(
+                    f"{room['building']} {room['room']}: {room['occupied_minutes']} min/week ({room['utilization']}%)"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(report['conflicts'])} double booking(s) across {len(report['rooms'])} room(s) in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.services import admission
+
+
+class Command(BaseCommand):
+    help = "Drain the enrollment admission queue with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--interval', type=float, default=0.5, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        stop = threading.Event()
+        processed = [0] * workers
+
+        def work(index):
+            try:
+                while not stop.is_set():
+                    done = admission.drain(index, workers, options['batch_size'])
+                    processed[index] += done
+                    if not done:
+                        if options['once']:
+                            return
+                        stop.wait(options['interval'])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(i,), daemon=True) for i in range(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Processed {sum(processed)} ticket(s) in {elapsed:.2f}s."))
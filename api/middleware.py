@@ -0,0 +1,28 @@
+from django.utils.functional import SimpleLazyObject
+
+from .services import current_term, grade_ledger
+
+
+class CurrentTermMiddleware:
+    """Expose the cached active term as ``request.current_term``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.current_term = SimpleLazyObject(current_term.get)
+        return self.get_response(request)
+
+
+class AuditActorMiddleware:
+    """Attribute grade ledger entries written while serving a request to its user."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = grade_ledger.bind_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            grade_ledger.unbind_request(token)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='courseoffering',
+            constraint=models.CheckConstraint(condition=models.Q(('enrolled_count__lte', models.F('max_slots'))), name='offering_enrolled_within_max_slots'),
+        ),
+    ]
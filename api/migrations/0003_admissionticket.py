@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_offering_enrolled_within_max_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('ADMITTED', 'Admitted'), ('REJECTED', 'Rejected')], default='QUEUED', max_length=10)),
+                ('reason', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('course_offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admission_tickets', to='api.courseoffering')),
+                ('enrollment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.enrollment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admission_tickets', to='api.student')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['course_offering', 'status', 'id'], name='ticket_queue_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'QUEUED')), fields=('student', 'course_offering'), name='one_queued_ticket_per_offering')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:52
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    Course = apps.get_model('api', 'Course')
+    PrerequisiteClosure = apps.get_model('api', 'PrerequisiteClosure')
+    graph = defaultdict(set)
+    for course_id, prerequisite_id in Course.prerequisites.through.objects.values_list('from_course_id', 'to_course_id'):
+        graph[course_id].add(prerequisite_id)
+    rows = []
+    for course_id in list(graph):
+        seen, stack = set(), list(graph[course_id])
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(graph.get(current, ()))
+        rows.extend(PrerequisiteClosure(course_id=course_id, prerequisite_id=p) for p in seen)
+    PrerequisiteClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_admissionticket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrerequisiteClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.course')),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['prerequisite', 'course'], name='closure_dependents_idx')],
+                'unique_together': {('course', 'prerequisite')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
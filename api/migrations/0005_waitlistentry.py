@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_prerequisiteclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('WAITING', 'Waiting'), ('PROMOTED', 'Promoted'), ('CANCELLED', 'Cancelled')], default='WAITING', max_length=10)),
+                ('remarks', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('course_offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='api.courseoffering')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='api.student')),
+            ],
+            options={
+                'verbose_name_plural': 'Waitlist entries',
+                'ordering': ['course_offering', 'position'],
+                'indexes': [models.Index(fields=['course_offering', 'status', 'position'], name='waitlist_queue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('course_offering', 'position'), name='unique_waitlist_position'), models.UniqueConstraint(condition=models.Q(('status', 'WAITING')), fields=('course_offering', 'student'), name='one_waiting_entry_per_offering')],
+            },
+        ),
+    ]
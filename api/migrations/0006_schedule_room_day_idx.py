@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['day_of_week', 'room'], name='schedule_room_day_idx'),
+        ),
+    ]
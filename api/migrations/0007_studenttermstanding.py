@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_schedule_room_day_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentTermStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units_attempted', models.PositiveIntegerField(default=0)),
+                ('units_earned', models.PositiveIntegerField(default=0)),
+                ('weighted_sum', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('gwa', models.DecimalField(blank=True, decimal_places=4, max_digits=6, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='api.student')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('student', 'semester'), name='unique_term_standing'), models.UniqueConstraint(condition=models.Q(('semester__isnull', True)), fields=('student',), name='unique_cumulative_standing')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_studenttermstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HonorsRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_level', models.IntegerField(choices=[(1, 'First Year'), (2, 'Second Year'), (3, 'Third Year'), (4, 'Fourth Year'), (5, 'Fifth Year')])),
+                ('units_attempted', models.PositiveIntegerField()),
+                ('gwa', models.DecimalField(decimal_places=4, max_digits=6)),
+                ('rank', models.PositiveIntegerField()),
+                ('tie_break', models.CharField(max_length=10)),
+                ('deans_list', models.BooleanField(default=False)),
+                ('cumulative_gwa', models.DecimalField(blank=True, decimal_places=4, max_digits=6, null=True)),
+                ('latin_honor', models.CharField(blank=True, choices=[('SUMMA', 'Summa Cum Laude'), ('MAGNA', 'Magna Cum Laude'), ('CUM', 'Cum Laude')], max_length=5)),
+                ('computed_at', models.DateTimeField()),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.department')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='honors_rankings', to='api.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='honors_rankings', to='api.student')),
+            ],
+            options={
+                'ordering': ['semester', 'department', 'year_level', 'rank'],
+                'indexes': [models.Index(fields=['semester', 'department', 'year_level', 'rank'], name='honors_list_idx')],
+                'constraints': [models.UniqueConstraint(fields=('semester', 'student'), name='unique_honors_ranking')],
+            },
+        ),
+    ]
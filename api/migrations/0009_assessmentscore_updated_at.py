@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_honorsranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentscore',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
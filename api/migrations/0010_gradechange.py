@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_assessmentscore_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('final_rating', 'Final rating'), ('midterm_grade', 'Midterm grade'), ('final_grade', 'Final grade'), ('score', 'Assessment score')], max_length=15)),
+                ('old_value', models.CharField(blank=True, max_length=10, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=10, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('assessment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.assessment')),
+                ('enrollment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_changes', to='api.enrollment')),
+            ],
+            options={
+                'ordering': ['changed_at', 'id'],
+                'indexes': [models.Index(fields=['enrollment', 'changed_at'], name='grade_change_enrollment_idx')],
+            },
+        ),
+    ]
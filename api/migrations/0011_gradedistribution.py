@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_gradechange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('final_rating', models.CharField(choices=[('1.00', '1.00'), ('1.25', '1.25'), ('1.50', '1.50'), ('1.75', '1.75'), ('2.00', '2.00'), ('2.25', '2.25'), ('2.50', '2.50'), ('2.75', '2.75'), ('3.00', '3.00'), ('5.00', '5.00 (Failed)'), ('INC', 'Incomplete'), ('DRP', 'Dropped')], max_length=5)),
+                ('count', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_distribution', to='api.course')),
+                ('faculty', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.faculty')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.semester')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'semester', 'faculty', 'final_rating', 'count'], name='grade_distribution_cover_idx')],
+                'constraints': [models.UniqueConstraint(fields=('course', 'semester', 'faculty', 'final_rating'), name='unique_grade_distribution'), models.UniqueConstraint(condition=models.Q(('faculty__isnull', True)), fields=('course', 'semester', 'final_rating'), name='unique_unassigned_grade_distribution')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_gradedistribution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandingRecheck',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='api.student')),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='status',
+            field=models.CharField(choices=[('ACTIVE', 'Active'), ('INACTIVE', 'Inactive'), ('GRADUATED', 'Graduated'), ('SUSPENDED', 'Suspended'), ('LOA', 'Leave of Absence'), ('PROBATION', 'Academic Probation')], default='ACTIVE', max_length=20),
+        ),
+    ]
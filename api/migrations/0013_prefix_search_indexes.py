@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import migrations
+
+
+# Case-insensitive prefix indexes for the admin's ``^`` searches. Django
+# compiles ``istartswith`` to ``col LIKE 'x%'`` on SQLite, which can only use
+# a NOCASE index, and to ``UPPER(col::text) LIKE UPPER('x%')`` on PostgreSQL,
+# which needs a pattern_ops index on that expression. Neither can be declared
+# in Meta.indexes portably, and auth_user is not ours to declare them on.
+# SQLite rebuilds a table on most column changes and only restores the indexes
+# Django knows about, so a later migration that alters one of these tables
+# must run create_indexes again.
+PREFIX_INDEXES = (
+    ('api_student_student_id_prefix', 'api.Student', 'student_id'),
+    ('api_faculty_employee_id_prefix', 'api.Faculty', 'employee_id'),
+    ('api_course_course_code_prefix', 'api.Course', 'course_code'),
+    ('auth_user_username_prefix', settings.AUTH_USER_MODEL, 'username'),
+    ('auth_user_first_name_prefix', settings.AUTH_USER_MODEL, 'first_name'),
+    ('auth_user_last_name_prefix', settings.AUTH_USER_MODEL, 'last_name'),
+    ('auth_user_email_prefix', settings.AUTH_USER_MODEL, 'email'),
+)
+
+
+def _indexes(apps, schema_editor):
+    quote = schema_editor.quote_name
+    for name, label, field_name in PREFIX_INDEXES:
+        model = apps.get_model(label)
+        column = quote(model._meta.get_field(field_name).column)
+        yield quote(name), quote(model._meta.db_table), column
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        template = 'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column} COLLATE NOCASE)'
+    elif vendor == 'postgresql':
+        template = 'CREATE INDEX IF NOT EXISTS {name} ON {table} ((UPPER({column}::text)) text_pattern_ops)'
+    else:
+        # MySQL's default collations are case-insensitive, so the plain indexes already serve LIKE 'x%'.
+        return
+    for name, table, column in _indexes(apps, schema_editor):
+        schema_editor.execute(template.format(name=name, table=table, column=column))
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        for name, _, _ in _indexes(apps, schema_editor):
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_standingrecheck'),
+        # After the last auth migration that rebuilds auth_user on SQLite.
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
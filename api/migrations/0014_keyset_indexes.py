@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentscore',
+            index=models.Index(fields=['-date_recorded', '-id'], name='assessment_score_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentrequest',
+            index=models.Index(fields=['-request_date', '-id'], name='document_request_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-date_enrolled', '-id'], name='enrollment_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['-created_at', '-id'], name='notification_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:25
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+# SQLite keeps the index in an FTS5 table over api_searchdocument, kept in step
+# by triggers; PostgreSQL gets a GIN index on the same weighted tsvector that
+# services.search.PostgresBackend queries. Other databases fall back to LIKE.
+# SQLite drops the triggers when it rebuilds api_searchdocument, so a later
+# migration altering that table must recreate them.
+FTS_TABLE = 'api_searchdocument_fts'
+FTS_SQL = (
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body, content='api_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER api_searchdocument_fts_insert AFTER INSERT ON api_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER api_searchdocument_fts_delete AFTER DELETE ON api_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER api_searchdocument_fts_update AFTER UPDATE ON api_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+)
+
+
+def _vector_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = SearchVector('title', weight='A', config='simple') + SearchVector('body', weight='B', config='simple')
+    return GinIndex(vector, name='search_document_vector_idx')
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                for statement in FTS_SQL:
+                    schema_editor.execute(statement)
+        except DatabaseError:
+            # SQLite built without FTS5; services.search falls back to LIKE.
+            pass
+    elif vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('api', 'SearchDocument'), _vector_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        for action in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS api_searchdocument_fts_{action}')
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('api', 'SearchDocument'), _vector_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_searchdocument'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='schedule_room_day_idx',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_remove_schedule_room_day_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grade',
+            name='final_grade',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AlterField(
+            model_name='grade',
+            name='midterm_grade',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+    ]
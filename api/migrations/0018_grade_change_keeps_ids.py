@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_enrollment_ids(apps, schema_editor):
+    GradeChange = apps.get_model('api', 'GradeChange')
+    Enrollment = apps.get_model('api', 'Enrollment')
+    enrollment = Enrollment.objects.filter(pk=models.OuterRef('enrollment_id'))
+    GradeChange.objects.update(
+        student_id=models.Subquery(enrollment.values('student_id')[:1]),
+        course_offering_id=models.Subquery(enrollment.values('course_offering_id')[:1]),
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_grade_percentages'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradechange',
+            name='course_offering',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.courseoffering'),
+        ),
+        migrations.AddField(
+            model_name='gradechange',
+            name='student',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.student'),
+        ),
+        migrations.RunPython(copy_enrollment_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='gradechange',
+            name='actor',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='gradechange',
+            name='assessment',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.assessment'),
+        ),
+        migrations.AlterField(
+            model_name='gradechange',
+            name='enrollment',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='grade_changes', to='api.enrollment'),
+        ),
+        migrations.AddIndex(
+            model_name='gradechange',
+            index=models.Index(fields=['student', 'changed_at'], name='grade_change_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gradechange',
+            index=models.Index(fields=['course_offering', 'changed_at'], name='grade_change_offering_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+# A case-insensitive prefix index for CourseOfferingAdmin's '^section'
+# search, built the same way as the ones in 0013_prefix_search_indexes.
+INDEX = 'api_courseoffering_section_prefix'
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        template = 'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column} COLLATE NOCASE)'
+    elif vendor == 'postgresql':
+        template = 'CREATE INDEX IF NOT EXISTS {name} ON {table} ((UPPER({column}::text)) text_pattern_ops)'
+    else:
+        return
+    model = apps.get_model('api', 'CourseOffering')
+    quote = schema_editor.quote_name
+    schema_editor.execute(template.format(
+        name=quote(INDEX), table=quote(model._meta.db_table), column=quote(model._meta.get_field('section').column),
+    ))
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(INDEX)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_grade_change_keeps_ids'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,8 +1,28 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+
+class TrackedFieldsMixin:
+    """Remember the database values of ``TRACKED_FIELDS`` so signal handlers can compute deltas."""
+
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: getattr(instance, field) for field in cls.TRACKED_FIELDS if field in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+
+
 # Academic Year
 class AcademicYear(models.Model):
     name = models.CharField(max_length=50, unique=True)  
@@ -103,7 +123,11 @@ class Student(models.Model):
         ('GRADUATED', 'Graduated'),
         ('SUSPENDED', 'Suspended'),
         ('LOA', 'Leave of Absence'),
+        ('PROBATION', 'Academic Probation'),
     ]
+
+    # Statuses that may enroll in course offerings
+    ENROLLABLE_STATUSES = ('ACTIVE', 'PROBATION')
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
     student_id = models.CharField(max_length=20, unique=True)
@@ -176,8 +200,26 @@ class Course(models.Model):
         return f"{self.course_code} - {self.title}"
 
 
+# Prerequisite Closure (transitive closure of Course.prerequisites)
+class PrerequisiteClosure(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    prerequisite = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ('course', 'prerequisite')
+        indexes = [
+            models.Index(fields=['prerequisite', 'course'], name='closure_dependents_idx'),
+        ]
+
+    def __str__(self):
+        return f"Course {self.course_id} requires {self.prerequisite_id}"
+
+
 # Course Offering (Section)
-class CourseOffering(models.Model):
+class CourseOffering(TrackedFieldsMixin, models.Model):
+    # The fields the grade distribution rollup is keyed on
+    TRACKED_FIELDS = ('course_id', 'semester_id', 'faculty_id')
+
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='offerings')
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='course_offerings')
     faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, related_name='course_offerings')
@@ -189,10 +231,20 @@ class CourseOffering(models.Model):
     class Meta:
         unique_together = ('course', 'semester', 'section')
         ordering = ['course', 'section']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(enrolled_count__lte=models.F('max_slots')),
+                name='offering_enrolled_within_max_slots',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.course.course_code} - {self.section} ({self.semester})"
 
+    def clean(self):
+        if self.max_slots is not None and self.max_slots < self.enrolled_count:
+            raise ValidationError({'max_slots': f"Cannot be lower than the {self.enrolled_count} students already enrolled."})
+
     @property
     def available_slots(self):
         return self.max_slots - self.enrolled_count
@@ -232,6 +284,9 @@ class Enrollment(models.Model):
         ('DROPPED', 'Dropped'),
         ('COMPLETED', 'Completed'),
     ]
+
+    # Statuses that occupy a seat in CourseOffering.enrolled_count
+    SEAT_HOLDING_STATUSES = ('PENDING', 'APPROVED', 'ENROLLED', 'COMPLETED')
     
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
     course_offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='enrollments')
@@ -242,13 +297,26 @@ class Enrollment(models.Model):
     class Meta:
         unique_together = ('student', 'course_offering')
         ordering = ['-date_enrolled']
+        indexes = [
+            models.Index(fields=['-date_enrolled', '-id'], name='enrollment_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} enrolled in {self.course_offering}"
 
+    def clean(self):
+        if not self.course_offering_id or self.status not in self.SEAT_HOLDING_STATUSES:
+            return
+        if not self._state.adding:
+            previous = Enrollment.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+            if previous in self.SEAT_HOLDING_STATUSES:
+                return
+        if self.course_offering.available_slots <= 0:
+            raise ValidationError(f"{self.course_offering} has no available slots.")
+
 
 # Grade
-class Grade(models.Model):
+class Grade(TrackedFieldsMixin, models.Model):
     GRADE_CHOICES = [
         ('1.00', '1.00'),
         ('1.25', '1.25'),
@@ -263,18 +331,115 @@ class Grade(models.Model):
         ('INC', 'Incomplete'),
         ('DRP', 'Dropped'),
     ]
+
+    PASSING_RATINGS = ('1.00', '1.25', '1.50', '1.75', '2.00', '2.25', '2.50', '2.75', '3.00')
     
     enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='grade')
-    midterm_grade = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
-    final_grade = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    midterm_grade = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # weighted percentage
+    final_grade = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # weighted percentage
     final_rating = models.CharField(max_length=5, choices=GRADE_CHOICES, blank=True)
     remarks = models.CharField(max_length=50, blank=True)  # e.g., "Passed", "Failed"
     date_submitted = models.DateTimeField(null=True, blank=True)
 
+    TRACKED_FIELDS = ('final_rating', 'midterm_grade', 'final_grade')
+
     def __str__(self):
         return f"{self.enrollment.student.student_id} - {self.enrollment.course_offering.course.course_code} - {self.final_rating}"
 
 
+# Student Term Standing (materialized GWA; semester NULL is the cumulative row)
+class StudentTermStanding(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='standings')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    units_attempted = models.PositiveIntegerField(default=0)
+    units_earned = models.PositiveIntegerField(default=0)
+    weighted_sum = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    gwa = models.DecimalField(max_digits=6, decimal_places=4, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'semester'], name='unique_term_standing'),
+            models.UniqueConstraint(
+                fields=['student'], condition=models.Q(semester__isnull=True), name='unique_cumulative_standing',
+            ),
+        ]
+
+    def __str__(self):
+        term = self.semester_id or 'cumulative'
+        return f"Standing of student {self.student_id} ({term}): {self.gwa}"
+
+
+# Standing Recheck (dirty set: students whose grades changed since their academic standing was last evaluated)
+class StandingRecheck(models.Model):
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Recheck standing of student {self.student_id}"
+
+
+# Honors Ranking (snapshot written by the ranking job; one row per ranked student and semester)
+class HonorsRanking(models.Model):
+    LATIN_HONOR_CHOICES = [
+        ('SUMMA', 'Summa Cum Laude'),
+        ('MAGNA', 'Magna Cum Laude'),
+        ('CUM', 'Cum Laude'),
+    ]
+
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='honors_rankings')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='honors_rankings')
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    year_level = models.IntegerField(choices=Student.YEAR_LEVEL_CHOICES)
+    units_attempted = models.PositiveIntegerField()
+    gwa = models.DecimalField(max_digits=6, decimal_places=4)
+    rank = models.PositiveIntegerField()
+    tie_break = models.CharField(max_length=10)
+    deans_list = models.BooleanField(default=False)
+    cumulative_gwa = models.DecimalField(max_digits=6, decimal_places=4, null=True, blank=True)
+    latin_honor = models.CharField(max_length=5, choices=LATIN_HONOR_CHOICES, blank=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['semester', 'department', 'year_level', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['semester', 'student'], name='unique_honors_ranking'),
+        ]
+        indexes = [
+            models.Index(fields=['semester', 'department', 'year_level', 'rank'], name='honors_list_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.student_id} ({self.semester_id}): {self.gwa}"
+
+
+
+# Grade Distribution (rollup of Grade.final_rating counts per course, semester and faculty)
+class GradeDistribution(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='grade_distribution')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='+')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    final_rating = models.CharField(max_length=5, choices=Grade.GRADE_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'semester', 'faculty', 'final_rating'], name='unique_grade_distribution',
+            ),
+            models.UniqueConstraint(
+                fields=['course', 'semester', 'final_rating'], condition=models.Q(faculty__isnull=True),
+                name='unique_unassigned_grade_distribution',
+            ),
+        ]
+        indexes = [
+            # Covers the distribution queries so they never touch the table.
+            models.Index(fields=['course', 'semester', 'faculty', 'final_rating', 'count'], name='grade_distribution_cover_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id}/{self.semester_id}/{self.faculty_id or '-'} {self.final_rating}: {self.count}"
+
 
 # Announcement
 class Announcement(models.Model):
@@ -331,20 +496,87 @@ class Assessment(models.Model):
 
 
 # Assessment Score
-class AssessmentScore(models.Model):
+class AssessmentScore(TrackedFieldsMixin, models.Model):
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name='scores')
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='assessment_scores')
     score = models.DecimalField(max_digits=5, decimal_places=2)
     remarks = models.TextField(blank=True)
     date_recorded = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    TRACKED_FIELDS = ('score',)
 
     class Meta:
         unique_together = ('assessment', 'enrollment')
+        indexes = [
+            models.Index(fields=['-date_recorded', '-id'], name='assessment_score_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.enrollment.student.student_id} - {self.assessment.title} - {self.score}"
 
 
+# Grade Change (append-only audit ledger of Grade and AssessmentScore values)
+class GradeChangeQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise ValidationError("Grade changes are append-only.")
+
+    def delete(self):
+        raise ValidationError("Grade changes are append-only.")
+
+
+class GradeChange(models.Model):
+    FIELD_CHOICES = [
+        ('final_rating', 'Final rating'),
+        ('midterm_grade', 'Midterm grade'),
+        ('final_grade', 'Final grade'),
+        ('score', 'Assessment score'),
+    ]
+
+    # The ledger outlives what it describes: references are kept as plain ids
+    # (no constraint, nothing cascades), with the student and offering copied
+    # from the enrollment so the history stays queryable after deletions.
+    enrollment = models.ForeignKey(
+        Enrollment, on_delete=models.DO_NOTHING, db_constraint=False, related_name='grade_changes',
+    )
+    student = models.ForeignKey(
+        Student, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+',
+    )
+    course_offering = models.ForeignKey(
+        CourseOffering, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+',
+    )
+    assessment = models.ForeignKey(
+        Assessment, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+',
+    )
+    field = models.CharField(max_length=15, choices=FIELD_CHOICES)
+    old_value = models.CharField(max_length=10, null=True, blank=True)
+    new_value = models.CharField(max_length=10, null=True, blank=True)
+    actor = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+',
+    )
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    objects = GradeChangeQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['enrollment', 'changed_at'], name='grade_change_enrollment_idx'),
+            models.Index(fields=['student', 'changed_at'], name='grade_change_student_idx'),
+            models.Index(fields=['course_offering', 'changed_at'], name='grade_change_offering_idx'),
+        ]
+
+    def __str__(self):
+        target = f"assessment {self.assessment_id}" if self.assessment_id else self.field
+        return f"{self.enrollment_id} {target}: {self.old_value} -> {self.new_value}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Grade changes are append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Grade changes are append-only.")
 
 
 # Student Document Request
@@ -378,6 +610,9 @@ class DocumentRequest(models.Model):
 
     class Meta:
         ordering = ['-request_date']
+        indexes = [
+            models.Index(fields=['-request_date', '-id'], name='document_request_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.get_document_type_display()}"
@@ -450,6 +685,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='notification_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
@@ -502,4 +740,89 @@ class CourseEvaluation(models.Model):
     is_anonymous = models.BooleanField(default=True)
 
     def __str__(self):
-        return f"{self.enrollment.student.student_id} - {self.enrollment.course_offering.course.course_code}"
\ No newline at end of file
+        return f"{self.enrollment.student.student_id} - {self.enrollment.course_offering.course.course_code}"
+
+# Admission Ticket (enrollment-day queue)
+class AdmissionTicket(models.Model):
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('ADMITTED', 'Admitted'),
+        ('REJECTED', 'Rejected'),
+    ]
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='admission_tickets')
+    course_offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='admission_tickets')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED')
+    reason = models.CharField(max_length=200, blank=True)
+    enrollment = models.ForeignKey(Enrollment, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Queue scans: "queued tickets for these offerings in arrival order".
+            models.Index(fields=['course_offering', 'status', 'id'], name='ticket_queue_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'course_offering'],
+                condition=models.Q(status='QUEUED'),
+                name='one_queued_ticket_per_offering',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ticket #{self.pk} - {self.get_status_display()}"
+
+
+# Waitlist
+class WaitlistEntry(models.Model):
+    STATUS_CHOICES = [
+        ('WAITING', 'Waiting'),
+        ('PROMOTED', 'Promoted'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+
+    course_offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='waitlist')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='waitlist_entries')
+    position = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='WAITING')
+    remarks = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['course_offering', 'position']
+        verbose_name_plural = "Waitlist entries"
+        indexes = [
+            models.Index(fields=['course_offering', 'status', 'position'], name='waitlist_queue_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['course_offering', 'position'], name='unique_waitlist_position'),
+            models.UniqueConstraint(
+                fields=['course_offering', 'student'],
+                condition=models.Q(status='WAITING'),
+                name='one_waiting_entry_per_offering',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Waitlist #{self.position} - {self.get_status_display()}"
+
+
+# Search Document (full-text index entry; see services/search.py)
+class SearchDocument(models.Model):
+    model_label = models.CharField(max_length=50)  # e.g. "api.announcement"
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model_label', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}:{self.object_id} {self.title}"
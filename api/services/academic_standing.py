@@ -0,0 +1,193 @@
+"""
+Academic standing (probation / suspension) engine.
+
+Rules are evaluated over each student's term-by-term grade history. Only
+students in the recheck set (marked whenever one of their grades changes)
+are evaluated on a run; status changes are written with one conditional
+update per transition and the affected students are notified.
+"""
+from collections import Counter, defaultdict
+from decimal import Decimal
+from itertools import batched
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, IntegerField, Q, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from ..models import Enrollment, Grade, Notification, Semester, StandingRecheck, Student
+from . import search
+from .standings import NUMERIC_RATINGS
+
+
+# Most severe first; the first rule whose condition held in each of the
+# student's last ``consecutive_terms`` graded terms decides the status. A term
+# meets a rule when any one of the rule's thresholds is crossed.
+DEFAULT_RULES = [
+    {
+        'status': 'SUSPENDED',
+        'consecutive_terms': 2,
+        'term_gwa_above': '3.00',
+        'failed_units_at_least': 9,
+    },
+    {
+        'status': 'PROBATION',
+        'consecutive_terms': 1,
+        'term_gwa_above': '2.75',
+        'failed_units_at_least': 6,
+        'failures_at_least': 2,
+        'cumulative_gwa_above': '3.00',
+    },
+]
+
+# Statuses the engine may change. Suspension is only ever imposed by the
+# engine; lifting it, like any other status, is left to the registrar.
+MANAGED_STATUSES = ('ACTIVE', 'PROBATION')
+DEFAULT_STATUS = 'ACTIVE'
+
+SEMESTER_NAMES = dict(Semester.SEMESTER_CHOICES)
+
+
+def rules():
+    return getattr(settings, 'PORTAL_STANDING_RULES', DEFAULT_RULES)
+
+
+def mark(student_ids):
+    """Add students to the recheck set (or refresh their mark)."""
+    now = timezone.now()
+    StandingRecheck.objects.bulk_create(
+        [StandingRecheck(student_id=pk, marked_at=now) for pk in set(student_ids)],
+        update_conflicts=True, unique_fields=['student'], update_fields=['marked_at'],
+    )
+
+
+def mark_enrollment(enrollment_id):
+    student_id = Enrollment.objects.filter(pk=enrollment_id).values_list('student_id', flat=True).first()
+    if student_id is not None:
+        mark([student_id])
+
+
+def term_history(student_ids):
+    """``{student_id: [term, ...]}`` in chronological order, from one aggregated query over Grade."""
+    units = F('enrollment__course_offering__course__units')
+    numeric = Q(final_rating__in=NUMERIC_RATINGS)
+    rows = (
+        Grade.objects.filter(enrollment__student_id__in=student_ids)
+        .values(
+            student_id=F('enrollment__student_id'),
+            semester_id=F('enrollment__course_offering__semester_id'),
+            semester_type=F('enrollment__course_offering__semester__semester_type'),
+            academic_year=F('enrollment__course_offering__semester__academic_year__name'),
+            start_date=F('enrollment__course_offering__semester__start_date'),
+        )
+        .annotate(
+            attempted=Sum(units, filter=numeric, output_field=IntegerField()),
+            failed_units=Sum(units, filter=Q(final_rating='5.00'), output_field=IntegerField()),
+            failures=Count('pk', filter=Q(final_rating='5.00')),
+            weighted=Sum(
+                units * Cast('final_rating', DecimalField(max_digits=4, decimal_places=2)),
+                filter=numeric, output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+        )
+        .order_by('student_id', 'start_date')
+    )
+    history = defaultdict(list)
+    totals = defaultdict(lambda: [0, Decimal(0)])
+    for row in rows:
+        if not row['attempted']:
+            continue
+        weighted = Decimal(str(row['weighted']))
+        total = totals[row['student_id']]
+        total[0] += row['attempted']
+        total[1] += weighted
+        history[row['student_id']].append({
+            'semester': row['semester_id'],
+            'name': f"{SEMESTER_NAMES.get(row['semester_type'], row['semester_type'])} - {row['academic_year']}",
+            'attempted': row['attempted'],
+            'failed_units': row['failed_units'] or 0,
+            'failures': row['failures'],
+            'gwa': weighted / row['attempted'],
+            'cumulative_gwa': total[1] / total[0],
+        })
+    return history
+
+
+def _deficiencies(term, rule):
+    reasons = []
+    if 'term_gwa_above' in rule and term['gwa'] > Decimal(rule['term_gwa_above']):
+        reasons.append(f"term GWA {term['gwa']:.2f} is above {rule['term_gwa_above']}")
+    if 'cumulative_gwa_above' in rule and term['cumulative_gwa'] > Decimal(rule['cumulative_gwa_above']):
+        reasons.append(f"cumulative GWA {term['cumulative_gwa']:.2f} is above {rule['cumulative_gwa_above']}")
+    if 'failed_units_at_least' in rule and term['failed_units'] >= rule['failed_units_at_least']:
+        reasons.append(f"{term['failed_units']} units failed")
+    if 'failures_at_least' in rule and term['failures'] >= rule['failures_at_least']:
+        reasons.append(f"{term['failures']} failing grades")
+    return reasons
+
+
+def evaluate(terms, rule_set=None):
+    """``(status, reasons)`` for a chronological term history."""
+    for rule in rule_set or rules():
+        window = terms[-rule.get('consecutive_terms', 1):]
+        if len(window) < rule.get('consecutive_terms', 1):
+            continue
+        found = [_deficiencies(term, rule) for term in window]
+        if all(found):
+            return rule['status'], [f"{term['name']}: {'; '.join(r)}" for term, r in zip(window, found)]
+    return DEFAULT_STATUS, []
+
+
+def _notification(student, status, reasons):
+    if status == 'PROBATION':
+        title, message = "Placed on academic probation", "You have been placed on academic probation."
+    elif status == 'SUSPENDED':
+        title, message = "Academic suspension", "You have been placed on academic suspension."
+    else:
+        title, message = "Academic probation lifted", "Your academic standing is back to good standing."
+    if reasons:
+        message += " Reason: " + " / ".join(reasons) + "."
+    return Notification(recipient_id=student.user_id, notification_type='GENERAL', title=title, message=message)
+
+
+def run(batch_size=500):
+    """
+    Re-evaluate every student in the recheck set.
+
+    Each batch is read, decided and written in one transaction with its
+    students locked, and a status is only replaced if it is still the one
+    that was evaluated, so a registrar's change made meanwhile is never
+    overwritten. Marks made while the run is in progress are kept for the
+    next run. Returns ``{'evaluated': n, 'changes': {(old, new): count}}``.
+    """
+    snapshot = timezone.now()
+    student_ids = list(StandingRecheck.objects.filter(marked_at__lte=snapshot).values_list('student_id', flat=True))
+    changes = Counter()
+    for chunk in batched(student_ids, batch_size):
+        with transaction.atomic():
+            students = list(
+                Student.objects.select_for_update()
+                .filter(pk__in=chunk, status__in=MANAGED_STATUSES)
+                .only('pk', 'status', 'user_id')
+            )
+            history = term_history([student.pk for student in students])
+            transitions = defaultdict(list)
+            for student in students:
+                status, reasons = evaluate(history.get(student.pk, []))
+                if status != student.status:
+                    transitions[(student.status, status)].append((student, reasons))
+            notifications = []
+            for (old, new), decided in transitions.items():
+                # Only students still in the evaluated status are moved (and notified).
+                current = Student.objects.filter(pk__in=[student.pk for student, _ in decided], status=old)
+                still = set(current.values_list('pk', flat=True))
+                if not still:
+                    continue
+                changes[(old, new)] += current.filter(pk__in=still).update(status=new)
+                notifications.extend(
+                    _notification(student, new, reasons) for student, reasons in decided if student.pk in still
+                )
+            Notification.objects.bulk_create(notifications, batch_size=batch_size)
+            search.index(Notification, [notification.pk for notification in notifications])
+            StandingRecheck.objects.filter(student_id__in=chunk, marked_at__lte=snapshot).delete()
+    return {'evaluated': len(student_ids), 'changes': dict(changes)}
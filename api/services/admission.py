@@ -0,0 +1,83 @@
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from ..exceptions import EnrollmentError
+from ..models import AdmissionTicket
+from . import eligibility
+from . import enrollment as enrollment_service
+
+
+def submit_ticket(student, offering_id):
+    """
+    Queue an enrollment request and return its ticket immediately.
+
+    Every eligibility rule except capacity is checked here; capacity is
+    decided when a worker drains the ticket. Re-submitting while a ticket is
+    still queued returns the existing ticket.
+    """
+    verdict = eligibility.evaluate(student, [offering_id], check_capacity=False)[0]
+    if not verdict['eligible']:
+        raise EnrollmentError(' '.join(verdict['reasons']))
+
+    try:
+        with transaction.atomic():
+            return AdmissionTicket.objects.create(student=student, course_offering_id=offering_id)
+    except IntegrityError:
+        return AdmissionTicket.objects.get(
+            student=student, course_offering_id=offering_id, status='QUEUED',
+        )
+
+
+def queue_position(ticket_id, offering_id):
+    """1-based position of a queued ticket within its offering's queue."""
+    ahead = AdmissionTicket.objects.filter(
+        course_offering_id=offering_id, status='QUEUED', id__lt=ticket_id,
+    ).count()
+    return ahead + 1
+
+
+def process_ticket(ticket):
+    """
+    Admit or reject a queued ticket.
+
+    The ticket is claimed with a conditional UPDATE, and the seat and the
+    outcome are written in the same transaction, so two workers can never
+    both process it. Returns ``None`` when the ticket was no longer queued.
+    """
+    with transaction.atomic():
+        processed_at = timezone.now()
+        if not AdmissionTicket.objects.filter(pk=ticket.pk, status='QUEUED').update(processed_at=processed_at):
+            return None
+        # The student's status, load or timetable may have changed while the ticket was queued.
+        verdict = eligibility.evaluate(ticket.student, [ticket.course_offering_id], check_capacity=False)[0]
+        try:
+            if not verdict['eligible']:
+                raise EnrollmentError(' '.join(verdict['reasons']))
+            enrollment = enrollment_service.reserve_seat(
+                ticket.student, ticket.course_offering_id, check_conflicts=False,
+            )
+        except EnrollmentError as exc:
+            ticket.status = 'REJECTED'
+            ticket.reason = str(exc)[:200]
+        else:
+            ticket.status = 'ADMITTED'
+            ticket.enrollment = enrollment
+        ticket.processed_at = processed_at
+        ticket.save(update_fields=['status', 'reason', 'enrollment', 'processed_at'])
+    return ticket
+
+
+def drain(worker=0, workers=1, batch_size=200):
+    """
+    Process the next batch of queued tickets owned by ``worker``.
+
+    Offerings are partitioned across workers by id, so each offering's queue
+    is drained by exactly one worker in arrival order while different
+    offerings proceed in parallel. Returns the number of tickets processed.
+    """
+    queued = AdmissionTicket.objects.filter(status='QUEUED').select_related('student')
+    if workers > 1:
+        queued = queued.alias(partition=Mod('course_offering_id', workers)).filter(partition=worker)
+    batch = list(queued.order_by('id')[:batch_size])
+    return sum(process_ticket(ticket) is not None for ticket in batch)
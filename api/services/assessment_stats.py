@@ -0,0 +1,150 @@
+"""
+Score statistics per assessment: mean, median, standard deviation,
+percentiles, a histogram and each student's z-score.
+
+Every assessment of an offering is computed from one query over its scores.
+Results are cached per assessment and dropped when a score or the assessment
+itself changes; ``PORTAL_ASSESSMENT_STATS_TTL`` bounds staleness for writes
+that bypass signals.
+"""
+import math
+from array import array
+from collections import Counter, defaultdict
+from itertools import repeat
+from operator import mul, sub, truediv
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import Assessment, AssessmentScore, Enrollment
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 10
+
+
+def ttl():
+    return getattr(settings, 'PORTAL_ASSESSMENT_STATS_TTL', 3600)
+
+
+def _key(assessment_id):
+    return f'assessment-stats:{assessment_id}'
+
+
+def percentile(ordered, p):
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * p / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def histogram(values, max_score, bins=HISTOGRAM_BINS):
+    counts = Counter()
+    if max_score > 0:
+        # Bin indexes for the whole column at once, clamped to the first and last bin.
+        indexes = map(int, map(mul, values, repeat(bins / max_score)))
+        counts.update(map(min, map(max, indexes, repeat(0)), repeat(bins - 1)))
+    width = max_score / bins
+    return [
+        {'from': round(i * width, 2), 'to': round((i + 1) * width, 2), 'count': counts[i]}
+        for i in range(bins)
+    ]
+
+
+def _rounded(value):
+    return None if value is None else round(value, 4)
+
+
+def describe(assessment, enrolled, enrollment_ids, scores):
+    """
+    Statistics for one assessment; ``scores`` is an ``array('d')`` parallel to ``enrollment_ids``.
+
+    Every figure is computed over the whole column with ``math.fsum``,
+    ``math.sumprod`` and ``map`` rather than a Python loop per score.
+    """
+    assessment_id, title, max_score = assessment
+    count = len(scores)
+    ordered = array('d', sorted(scores))
+    mean = stdev = None
+    z_scores = repeat(None)
+    if count:
+        mean = math.fsum(scores) / count
+        deviations = array('d', map(sub, scores, repeat(mean)))
+        stdev = math.sqrt(math.sumprod(deviations, deviations) / count)
+        if stdev:
+            z_scores = map(_rounded, map(truediv, deviations, repeat(stdev)))
+
+    return {
+        'assessment': assessment_id,
+        'title': title,
+        'max_score': max_score,
+        'count': count,
+        'missing': max(enrolled - count, 0),
+        'mean': _rounded(mean),
+        'mean_percentage': _rounded(100 * mean / max_score) if count and max_score else None,
+        'median': _rounded(percentile(ordered, 50)),
+        'stdev': _rounded(stdev),
+        'min': ordered[0] if count else None,
+        'max': ordered[-1] if count else None,
+        'percentiles': {f'p{p}': _rounded(percentile(ordered, p)) for p in PERCENTILES},
+        'histogram': histogram(scores, max_score),
+        'scores': [
+            {'enrollment': enrollment_id, 'score': score, 'z_score': z_score}
+            for enrollment_id, score, z_score in zip(enrollment_ids, scores, z_scores)
+        ],
+    }
+
+
+def compute(offering_id, assessment_ids=None):
+    """Compute (and cache) statistics for the offering's assessments; returns ``{assessment_id: stats}``."""
+    assessments = Assessment.objects.filter(course_offering_id=offering_id)
+    if assessment_ids is not None:
+        assessments = assessments.filter(pk__in=assessment_ids)
+    assessments = list(assessments.order_by('date_given', 'pk').values_list('pk', 'title', 'max_score'))
+    if not assessments:
+        return {}
+    enrolled = Enrollment.objects.filter(course_offering_id=offering_id).exclude(status='DROPPED').count()
+
+    columns = defaultdict(lambda: (array('q'), array('d')))
+    for assessment_id, enrollment_id, score in AssessmentScore.objects.filter(
+        assessment_id__in=[a[0] for a in assessments],
+    ).order_by().values_list('assessment_id', 'enrollment_id', 'score'):
+        enrollment_ids, scores = columns[assessment_id]
+        enrollment_ids.append(enrollment_id)
+        scores.append(float(score))
+
+    results = {}
+    for assessment_id, title, max_score in assessments:
+        enrollment_ids, scores = columns[assessment_id]
+        results[assessment_id] = describe((assessment_id, title, float(max_score)), enrolled, enrollment_ids, scores)
+    cache.set_many({_key(pk): stats for pk, stats in results.items()}, ttl())
+    return results
+
+
+def for_offering(offering_id):
+    """Statistics of every assessment in an offering, computing only those not cached."""
+    assessment_ids = list(
+        Assessment.objects.filter(course_offering_id=offering_id).order_by('date_given', 'pk').values_list('pk', flat=True)
+    )
+    cached = cache.get_many([_key(pk) for pk in assessment_ids])
+    missing = [pk for pk in assessment_ids if _key(pk) not in cached]
+    computed = compute(offering_id, missing) if missing else {}
+    results = [cached.get(_key(pk)) or computed.get(pk) for pk in assessment_ids]
+    return [stats for stats in results if stats is not None]
+
+
+def for_assessment(assessment):
+    stats = cache.get(_key(assessment.pk))
+    if stats is None:
+        stats = compute(assessment.course_offering_id, [assessment.pk])[assessment.pk]
+    return stats
+
+
+def invalidate(assessment_ids):
+    """Drop cached statistics once the surrounding transaction commits."""
+    keys = [_key(pk) for pk in assessment_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,69 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import AcademicYear, Semester
+
+
+@dataclass(frozen=True)
+class CurrentTerm:
+    academic_year: AcademicYear | None
+    semester: Semester | None
+
+    @property
+    def enrollment_start(self):
+        return self.semester.enrollment_start if self.semester else None
+
+    @property
+    def enrollment_end(self):
+        return self.semester.enrollment_end if self.semester else None
+
+    def is_enrollment_open(self, today=None):
+        if self.semester is None:
+            return False
+        today = today or timezone.localdate()
+        return self.semester.enrollment_start <= today <= self.semester.enrollment_end
+
+
+_lock = threading.Lock()
+_cached = None
+_expires_at = 0.0
+
+
+def ttl():
+    # Other processes only see an activation change once their copy expires.
+    return getattr(settings, 'PORTAL_CURRENT_TERM_TTL', 300)
+
+
+def resolve():
+    """Look up the active semester and academic year; one query in the common case."""
+    semester = (
+        Semester.objects.select_related('academic_year')
+        .filter(is_active=True)
+        .order_by('-academic_year__is_active', '-start_date')
+        .first()
+    )
+    if semester is not None:
+        return CurrentTerm(academic_year=semester.academic_year, semester=semester)
+    return CurrentTerm(academic_year=AcademicYear.objects.filter(is_active=True).first(), semester=None)
+
+
+def get():
+    """The active term, served from a process-level cache."""
+    global _cached, _expires_at
+    if _cached is not None and time.monotonic() < _expires_at:
+        return _cached
+    with _lock:
+        if _cached is None or time.monotonic() >= _expires_at:
+            _cached = resolve()
+            _expires_at = time.monotonic() + ttl()
+        return _cached
+
+
+def invalidate():
+    global _cached
+    with _lock:
+        _cached = None
@@ -0,0 +1,88 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import CourseOffering, Enrollment, Grade, PrerequisiteClosure, Student
+from . import timetable
+
+
+def max_units_per_semester():
+    return getattr(settings, 'PORTAL_MAX_UNITS_PER_SEMESTER', 26)
+
+
+def evaluate(student, offering_ids, today=None, check_capacity=True):
+    """
+    Decide, for each offering in a shopping cart, whether ``student`` may enroll.
+
+    Everything is fetched up front in a fixed number of queries and the rules
+    are applied in memory, so the cost does not grow with the cart. Returns a
+    list of ``{'course_offering', 'eligible', 'reasons'}`` dicts in cart
+    order. Unit load is accumulated in cart order over offerings that pass
+    every other check. Without ``check_capacity`` a full offering is not a
+    reason, for callers that take the seat themselves.
+    """
+    today = today or timezone.localdate()
+    offering_ids = list(dict.fromkeys(offering_ids))
+    offerings = CourseOffering.objects.select_related('course', 'semester').in_bulk(offering_ids)
+    semester_ids = {offering.semester_id for offering in offerings.values()}
+    course_ids = {offering.course_id for offering in offerings.values()}
+
+    current = list(
+        Enrollment.objects.filter(
+            student=student, course_offering__semester__in=semester_ids,
+            status__in=Enrollment.SEAT_HOLDING_STATUSES,
+        ).values_list(
+            'course_offering_id', 'course_offering__semester_id',
+            'course_offering__course_id', 'course_offering__course__units',
+        )
+    )
+    enrolled_offerings = {row[0] for row in current}
+    enrolled_courses = {(row[1], row[2]) for row in current}
+    units = defaultdict(int)
+    for _, semester_id, _, course_units in current:
+        units[semester_id] += course_units
+
+    required = defaultdict(dict)
+    for course_id, prerequisite_id, code in PrerequisiteClosure.objects.filter(
+        course_id__in=course_ids,
+    ).values_list('course_id', 'prerequisite_id', 'prerequisite__course_code'):
+        required[course_id][prerequisite_id] = code
+    passed = set(
+        Enrollment.objects.filter(student=student, grade__final_rating__in=Grade.PASSING_RATINGS)
+        .values_list('course_offering__course_id', flat=True)
+    )
+    conflicts = timetable.find_conflicts(student, list(offerings))
+
+    limit = max_units_per_semester()
+    verdicts = []
+    for offering_id in offering_ids:
+        offering = offerings.get(offering_id)
+        reasons = []
+        if offering is None or not offering.is_active:
+            reasons.append("Course offering is not open for enrollment.")
+        else:
+            semester = offering.semester
+            if student.status not in Student.ENROLLABLE_STATUSES:
+                reasons.append(f"Student status is {student.get_status_display()}.")
+            if not semester.enrollment_start <= today <= semester.enrollment_end:
+                reasons.append("Enrollment period is closed.")
+            if offering_id in enrolled_offerings:
+                reasons.append("Already enrolled in this section.")
+            elif (offering.semester_id, offering.course_id) in enrolled_courses:
+                reasons.append("Already enrolled in another section of this course.")
+            missing = sorted(code for pk, code in required[offering.course_id].items() if pk not in passed)
+            if missing:
+                reasons.append(f"Missing prerequisites: {', '.join(missing)}.")
+            clashes = [pk for pk in conflicts.get(offering_id, ()) if pk != offering_id]
+            if clashes:
+                reasons.append(f"Schedule conflicts with course offering(s) {', '.join(map(str, clashes))}.")
+            if check_capacity and offering.available_slots <= 0:
+                reasons.append("No available slots.")
+            if not reasons:
+                if units[offering.semester_id] + offering.course.units > limit:
+                    reasons.append(f"Exceeds the {limit}-unit load for the semester.")
+                else:
+                    units[offering.semester_id] += offering.course.units
+        verdicts.append({'course_offering': offering_id, 'eligible': not reasons, 'reasons': reasons})
+    return verdicts
@@ -0,0 +1,231 @@
+from itertools import batched
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..exceptions import AlreadyEnrolled, EnrollmentError, OfferingFull, ScheduleConflict
+from ..models import CourseOffering, Enrollment, Student
+from . import seat_availability, timetable, waitlist
+
+
+def holds_seat(status):
+    return status in Enrollment.SEAT_HOLDING_STATUSES
+
+
+def take_seat(offering_id):
+    """Atomically claim one seat, failing instead of overselling the offering."""
+    claimed = CourseOffering.objects.filter(
+        pk=offering_id, is_active=True, enrolled_count__lt=F('max_slots'),
+    ).update(enrolled_count=F('enrolled_count') + 1)
+    if claimed:
+        seat_availability.publish_delta(offering_id, -1)
+        return
+    offering = CourseOffering.objects.filter(pk=offering_id).values('is_active').first()
+    if offering is None or not offering['is_active']:
+        raise EnrollmentError("This course offering is not open for enrollment.")
+    raise OfferingFull("This course offering has no available slots.")
+
+
+def release_seat(offering_id, count=1):
+    released = CourseOffering.objects.filter(pk=offering_id, enrolled_count__gte=count).update(
+        enrolled_count=F('enrolled_count') - count,
+    )
+    if released:
+        seat_availability.publish_delta(offering_id, count)
+
+
+def reserve_seat(student, offering, status='ENROLLED', check_conflicts=True):
+    """
+    Enroll ``student`` in ``offering`` with a single conditional seat update.
+
+    The seat and the Enrollment row are written in one transaction, so a
+    failure on either side leaves ``enrolled_count`` untouched. A previously
+    dropped enrollment for the same section is reactivated.
+    """
+    offering_id = getattr(offering, 'pk', offering)
+    try:
+        with transaction.atomic():
+            if check_conflicts:
+                conflicts = timetable.find_conflicts(student, [offering_id])[offering_id]
+                if conflicts:
+                    raise ScheduleConflict(
+                        f"Schedule conflicts with course offering(s) {', '.join(map(str, conflicts))}."
+                    )
+            take_seat(offering_id)
+            dropped = Enrollment.objects.filter(
+                student=student, course_offering_id=offering_id, status='DROPPED',
+            ).first()
+            if dropped is not None:
+                dropped.status = status
+                dropped.dropped_date = None
+                dropped.save(update_fields=['status', 'dropped_date'])
+                return dropped
+            return Enrollment.objects.create(
+                student=student, course_offering_id=offering_id, status=status,
+            )
+    except IntegrityError:
+        raise AlreadyEnrolled("The student is already enrolled in this course offering.")
+
+
+def create_enrollment(enrollment):
+    """Save a new, unsaved Enrollment, taking a seat when its status holds one."""
+    try:
+        with transaction.atomic():
+            if holds_seat(enrollment.status):
+                take_seat(enrollment.course_offering_id)
+            enrollment.save()
+    except IntegrityError:
+        raise AlreadyEnrolled("The student is already enrolled in this course offering.")
+    return enrollment
+
+
+def set_status(enrollment, status):
+    """Move an enrollment to ``status``, adjusting the offering's seat count."""
+    freed = False
+    with transaction.atomic():
+        previous = (
+            Enrollment.objects.select_for_update()
+            .values_list('status', flat=True)
+            .get(pk=enrollment.pk)
+        )
+        if holds_seat(previous) and not holds_seat(status):
+            release_seat(enrollment.course_offering_id)
+            freed = True
+        elif not holds_seat(previous) and holds_seat(status):
+            take_seat(enrollment.course_offering_id)
+
+        enrollment.status = status
+        if status == 'DROPPED':
+            enrollment.dropped_date = enrollment.dropped_date or timezone.localdate()
+        elif previous == 'DROPPED':
+            enrollment.dropped_date = None
+        enrollment.save(update_fields=['status', 'dropped_date'])
+        if freed:
+            waitlist.promote(enrollment.course_offering_id)
+    return enrollment
+
+
+def drop_enrollment(enrollment):
+    return set_status(enrollment, 'DROPPED')
+
+
+def delete_enrollments(queryset):
+    """Delete enrollments and give back the seats they were holding."""
+    with transaction.atomic():
+        held = (
+            queryset.filter(status__in=Enrollment.SEAT_HOLDING_STATUSES)
+            .values('course_offering_id')
+            .annotate(seats=Count('id'))
+        )
+        held = list(held)
+        for row in held:
+            release_seat(row['course_offering_id'], row['seats'])
+        queryset.delete()
+        for row in held:
+            waitlist.promote(row['course_offering_id'], row['seats'])
+
+
+def recount_enrolled(offerings=None):
+    """Rebuild ``enrolled_count`` from the Enrollment rows. Returns the number of offerings fixed."""
+    if offerings is None:
+        offerings = CourseOffering.objects.all()
+    actual = (
+        Enrollment.objects.filter(
+            course_offering=OuterRef('pk'), status__in=Enrollment.SEAT_HOLDING_STATUSES,
+        )
+        .order_by()
+        .values('course_offering')
+        .annotate(seats=Count('id'))
+        .values('seats')
+    )
+    actual = Coalesce(Subquery(actual), Value(0))
+    with transaction.atomic():
+        drifted = offerings.annotate(actual=actual).filter(~Q(enrolled_count=F('actual')))
+        fixed = list(drifted.values_list('pk', 'actual'))
+        for offering_id, seats in fixed:
+            CourseOffering.objects.filter(pk=offering_id).update(enrolled_count=seats)
+            seat_availability.invalidate(offering_id=offering_id)
+    return len(fixed)
+
+
+def enroll_cohort(offering_ids, department=None, year_level=None, status='ENROLLED', batch_size=1000):
+    """
+    Enroll every active or probationary student matching the cohort filter in all of ``offering_ids``.
+
+    Capacity for the whole cohort is validated up front and the operation is
+    all-or-nothing. Enrollment rows are written with chunked ``bulk_create``
+    and each offering's ``enrolled_count`` moves with one UPDATE. Students
+    already holding a seat are skipped; dropped enrollments are reactivated.
+    Returns ``{offering_id: {'enrolled': n, 'skipped': n}}``.
+    """
+    offering_ids = list(dict.fromkeys(offering_ids))
+    students = Student.objects.filter(status__in=Student.ENROLLABLE_STATUSES)
+    if department is not None:
+        students = students.filter(department=department)
+    if year_level is not None:
+        students = students.filter(year_level=year_level)
+
+    with transaction.atomic():
+        offerings = CourseOffering.objects.select_related('course', 'semester__academic_year').in_bulk(offering_ids)
+        missing = [pk for pk in offering_ids if pk not in offerings]
+        if missing:
+            raise EnrollmentError(f"Unknown course offering(s): {', '.join(map(str, missing))}.")
+        closed = [str(o) for o in offerings.values() if not o.is_active]
+        if closed:
+            raise EnrollmentError(f"Not open for enrollment: {', '.join(closed)}.")
+
+        student_ids = list(students.values_list('pk', flat=True))
+        existing = {
+            (offering_id, student_id): enrollment_status
+            for offering_id, student_id, enrollment_status in Enrollment.objects.filter(
+                course_offering_id__in=offering_ids, student__in=students,
+            ).values_list('course_offering_id', 'student_id', 'status')
+        }
+
+        to_create, summary = [], {}
+        to_reactivate = {offering_id: [] for offering_id in offering_ids}
+        for offering_id in offering_ids:
+            enrolled = skipped = 0
+            for student_id in student_ids:
+                current = existing.get((offering_id, student_id))
+                if current is None:
+                    to_create.append(Enrollment(
+                        student_id=student_id, course_offering_id=offering_id, status=status,
+                    ))
+                    enrolled += 1
+                elif current == 'DROPPED':
+                    to_reactivate[offering_id].append(student_id)
+                    enrolled += 1
+                else:
+                    skipped += 1
+            summary[offering_id] = {'enrolled': enrolled, 'skipped': skipped}
+
+        full = [
+            f"{offerings[pk]} ({offerings[pk].available_slots} left, {row['enrolled']} needed)"
+            for pk, row in summary.items()
+            if row['enrolled'] > offerings[pk].available_slots
+        ]
+        if full:
+            raise OfferingFull(f"Not enough slots: {'; '.join(full)}.")
+
+        for offering_id, row in summary.items():
+            seats = row['enrolled']
+            if not seats:
+                continue
+            claimed = CourseOffering.objects.filter(
+                pk=offering_id, enrolled_count__lte=F('max_slots') - seats,
+            ).update(enrolled_count=F('enrolled_count') + seats)
+            if not claimed:
+                raise OfferingFull(f"{offerings[offering_id]} filled up during bulk enrollment.")
+            seat_availability.publish_delta(offering_id, -seats)
+
+        for chunk in batched(to_create, batch_size):
+            Enrollment.objects.bulk_create(chunk)
+        for offering_id, reactivated in to_reactivate.items():
+            for chunk in batched(reactivated, batch_size):
+                Enrollment.objects.filter(course_offering_id=offering_id, student_id__in=chunk).update(
+                    status=status, dropped_date=None,
+                )
+    return summary
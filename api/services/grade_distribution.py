@@ -0,0 +1,157 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from ..models import Enrollment, Faculty, Grade, GradeDistribution, Semester
+from .standings import NUMERIC_RATINGS
+
+
+GROUP_BYS = ('semester', 'faculty')
+
+
+def _apply(course_id, semester_id, faculty_id, rating, delta, retry=True):
+    updated = GradeDistribution.objects.filter(
+        course_id=course_id, semester_id=semester_id, faculty_id=faculty_id, final_rating=rating,
+    ).update(count=F('count') + delta)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            GradeDistribution.objects.create(
+                course_id=course_id, semester_id=semester_id, faculty_id=faculty_id, final_rating=rating, count=delta,
+            )
+    except IntegrityError:
+        # Created concurrently; the row exists now, so the UPDATE path applies.
+        if not retry:
+            raise
+        _apply(course_id, semester_id, faculty_id, rating, delta, retry=False)
+
+
+def apply_deltas(changes):
+    """
+    Move rollup counts for ``(course_id, semester_id, faculty_id, old_rating, new_rating)`` changes.
+
+    Deltas are summed per bucket first, so a bulk write costs one UPDATE per
+    bucket it touched. Blank ratings (not yet graded) are not counted.
+    """
+    totals = Counter()
+    for course_id, semester_id, faculty_id, old_rating, new_rating in changes:
+        if old_rating == new_rating:
+            continue
+        if old_rating:
+            totals[(course_id, semester_id, faculty_id, old_rating)] -= 1
+        if new_rating:
+            totals[(course_id, semester_id, faculty_id, new_rating)] += 1
+    with transaction.atomic():
+        for bucket, delta in totals.items():
+            if delta:
+                _apply(*bucket, delta)
+
+
+def apply_rating_change(enrollment_id, old_rating, new_rating):
+    if old_rating == new_rating:
+        return
+    offering = (
+        Enrollment.objects.filter(pk=enrollment_id)
+        .values_list('course_offering__course_id', 'course_offering__semester_id', 'course_offering__faculty_id')
+        .first()
+    )
+    if offering is not None:
+        apply_deltas([(*offering, old_rating, new_rating)])
+
+
+def expected_counts(course_ids=None, semester_ids=None):
+    grades = Grade.objects.exclude(final_rating='')
+    if course_ids is not None:
+        grades = grades.filter(enrollment__course_offering__course_id__in=course_ids)
+    if semester_ids is not None:
+        grades = grades.filter(enrollment__course_offering__semester_id__in=semester_ids)
+    return {
+        (course_id, semester_id, faculty_id, rating): count
+        for course_id, semester_id, faculty_id, rating, count in grades.values_list(
+            'enrollment__course_offering__course_id', 'enrollment__course_offering__semester_id',
+            'enrollment__course_offering__faculty_id', 'final_rating',
+        ).annotate(count=Count('pk')).order_by()
+    }
+
+
+def refresh(course_ids=None, semester_ids=None):
+    """
+    Bring the rollup in line with the Grade rows (optionally for some courses/semesters).
+
+    Only buckets whose count differs are written; returns how many that was.
+    """
+    expected = expected_counts(course_ids, semester_ids)
+    stored = GradeDistribution.objects.all()
+    if course_ids is not None:
+        stored = stored.filter(course_id__in=course_ids)
+    if semester_ids is not None:
+        stored = stored.filter(semester_id__in=semester_ids)
+    stored = {
+        (course_id, semester_id, faculty_id, rating): (pk, count)
+        for pk, course_id, semester_id, faculty_id, rating, count in stored.values_list(
+            'pk', 'course_id', 'semester_id', 'faculty_id', 'final_rating', 'count',
+        )
+    }
+
+    to_update, to_create = [], []
+    for bucket in expected.keys() | stored.keys():
+        count = expected.get(bucket, 0)
+        pk, current = stored.get(bucket, (None, 0))
+        if count == current:
+            continue
+        if pk is None:
+            to_create.append(GradeDistribution(
+                course_id=bucket[0], semester_id=bucket[1], faculty_id=bucket[2], final_rating=bucket[3], count=count,
+            ))
+        else:
+            to_update.append(GradeDistribution(pk=pk, count=count))
+    with transaction.atomic():
+        GradeDistribution.objects.bulk_update(to_update, ['count'], batch_size=1000)
+        GradeDistribution.objects.bulk_create(to_create, batch_size=1000)
+    return len(to_update) + len(to_create)
+
+
+def _summary(counts):
+    total = sum(counts.values())
+    numeric = sum(count for rating, count in counts.items() if rating in NUMERIC_RATINGS)
+    passed = sum(count for rating, count in counts.items() if rating in Grade.PASSING_RATINGS)
+    weighted = sum(Decimal(rating) * count for rating, count in counts.items() if rating in NUMERIC_RATINGS)
+    return {
+        'total': total,
+        'counts': dict(counts),
+        'pass_rate': round(100 * passed / total, 2) if total else None,
+        'mean_rating': (weighted / numeric).quantize(Decimal('0.01')) if numeric else None,
+    }
+
+
+def distribution(course_id, group_by='semester', semester_ids=None, faculty_id=None):
+    """
+    A course's grade distribution per semester or per faculty member, read from the rollup alone.
+    """
+    if group_by not in GROUP_BYS:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BYS)}.")
+    rows = GradeDistribution.objects.filter(course_id=course_id, count__gt=0)
+    if semester_ids:
+        rows = rows.filter(semester_id__in=semester_ids)
+    if faculty_id is not None:
+        rows = rows.filter(faculty_id=faculty_id)
+
+    groups = defaultdict(Counter)
+    for semester_id, faculty, rating, count in rows.values_list('semester_id', 'faculty_id', 'final_rating', 'count'):
+        groups[semester_id if group_by == 'semester' else faculty][rating] += count
+
+    if group_by == 'semester':
+        semesters = Semester.objects.filter(pk__in=groups).select_related('academic_year').order_by('start_date')
+        labelled = [(semester.pk, str(semester)) for semester in semesters]
+    else:
+        names = {
+            pk: f"{first} {last}".strip()
+            for pk, first, last in Faculty.objects.filter(pk__in=[pk for pk in groups if pk]).values_list(
+                'pk', 'user__first_name', 'user__last_name',
+            )
+        }
+        labelled = sorted(((pk, names.get(pk, 'Unassigned')) for pk in groups), key=lambda item: item[1])
+    return [{group_by: pk, 'label': label, **_summary(groups[pk])} for pk, label in labelled]
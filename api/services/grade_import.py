@@ -0,0 +1,193 @@
+import codecs
+import csv
+import zipfile
+from decimal import Decimal, InvalidOperation
+from itertools import batched
+
+from django.db import transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+from ..exceptions import GradeImportError
+from ..models import Enrollment, Grade
+from . import academic_standing, grade_distribution, grade_ledger, standings
+
+
+REQUIRED_COLUMNS = ('student_id', 'course_code', 'section', 'final_rating')
+OPTIONAL_COLUMNS = ('midterm_grade', 'final_grade', 'remarks')
+RATINGS = {value for value, _ in Grade.GRADE_CHOICES}
+
+
+def _normalize_header(header):
+    return [str(cell or '').strip().lower().replace(' ', '_') for cell in header]
+
+
+def _records(header, rows):
+    header = _normalize_header(header)
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise GradeImportError(f"Missing column(s): {', '.join(missing)}.")
+    for number, row in enumerate(rows, start=2):
+        record = {column: ('' if value is None else str(value).strip()) for column, value in zip(header, row)}
+        if any(record.values()):
+            yield number, record
+
+
+def _guarded(rows, errors):
+    # CSV rows are decoded lazily, so a bad byte or quote can surface on any row.
+    try:
+        yield from rows
+    except errors as exc:
+        raise GradeImportError(f"The grade sheet could not be read: {exc}")
+
+
+def read_sheet(file, filename):
+    """Stream ``(row_number, record)`` pairs from an uploaded CSV or XLSX grade sheet."""
+    if filename.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError:
+            raise GradeImportError("Reading .xlsx files requires the openpyxl package; upload a CSV instead.")
+        errors = (zipfile.BadZipFile, InvalidFileException, KeyError, ValueError)
+        try:
+            rows = load_workbook(file, read_only=True, data_only=True).active.iter_rows(values_only=True)
+        except errors as exc:
+            raise GradeImportError(f"The grade sheet could not be read: {exc}")
+    else:
+        errors = (UnicodeDecodeError, csv.Error)
+        rows = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+    rows = _guarded(rows, errors)
+    header = next(rows, None)
+    if header is None:
+        raise GradeImportError("The grade sheet is empty.")
+    return _records(header, rows)
+
+
+def _parse_grade(value):
+    if not value:
+        return None
+    try:
+        grade = Decimal(value)
+    except InvalidOperation:
+        raise ValueError
+    if not grade.is_finite() or not 0 <= grade <= 100:
+        raise ValueError
+    return grade.quantize(Decimal('0.01'))
+
+
+def _validate(record):
+    errors = [f"{column} is required." for column in REQUIRED_COLUMNS if not record.get(column)]
+    rating = record.get('final_rating', '').upper()
+    if rating and rating not in RATINGS:
+        errors.append(f"final_rating {record['final_rating']!r} is not a valid grade.")
+    cleaned = {'final_rating': rating, 'remarks': record.get('remarks', '')[:50]}
+    for column in ('midterm_grade', 'final_grade'):
+        try:
+            cleaned[column] = _parse_grade(record.get(column))
+        except ValueError:
+            errors.append(f"{column} {record[column]!r} must be a percentage from 0 to 100.")
+    return cleaned, errors
+
+
+def import_grades(records, semester, faculty=None, partial=False, chunk_size=1000):
+    """
+    Upsert Grade rows from ``(row_number, record)`` pairs for ``semester``.
+
+    Rows are matched to the enrollment roster by ``student_id``,
+    ``course_code`` and ``section``, one chunk at a time so memory stays
+    bounded by ``chunk_size``. When ``faculty`` is given only their own
+    sections are accepted. Unless ``partial`` is set, any row error rolls back
+    the whole sheet. Returns ``{'created', 'updated', 'errors'}`` where
+    errors are ``{'row', 'errors'}`` dicts.
+    """
+    semester_id = getattr(semester, 'pk', semester)
+    submitted = timezone.now()
+    summary = {'created': 0, 'updated': 0, 'errors': []}
+    seen = set()
+
+    with transaction.atomic():
+        for chunk in batched(records, chunk_size):
+            valid = []
+            for number, record in chunk:
+                cleaned, errors = _validate(record)
+                if errors:
+                    summary['errors'].append({'row': number, 'errors': errors})
+                else:
+                    key = (record['student_id'], record['course_code'].upper(), record['section'].upper())
+                    valid.append((number, key, cleaned))
+            if not valid:
+                continue
+
+            rows = Enrollment.objects.filter(
+                course_offering__semester_id=semester_id,
+                student__student_id__in={key[0] for _, key, _ in valid},
+            ).alias(
+                course_code_key=Upper('course_offering__course__course_code'),
+            ).filter(
+                course_code_key__in={key[1] for _, key, _ in valid},
+            ).exclude(status='DROPPED').values_list(
+                'pk', 'student_id', 'student__student_id', 'course_offering__course__course_code',
+                'course_offering__section', 'course_offering__faculty_id', 'course_offering__course__units',
+                'course_offering__course_id',
+            )
+            roster = {}
+            for enrollment_id, student_pk, student_id, code, section, faculty_id, units, course_id in rows:
+                roster[(student_id, code.upper(), section.upper())] = (
+                    enrollment_id, student_pk, faculty_id, units, course_id,
+                )
+
+            matched = []
+            for number, key, cleaned in valid:
+                entry = roster.get(key)
+                if entry is None:
+                    summary['errors'].append({'row': number, 'errors': [
+                        f"{key[0]} is not enrolled in {key[1]} section {key[2]} this semester.",
+                    ]})
+                elif faculty is not None and entry[2] != faculty.pk:
+                    summary['errors'].append({'row': number, 'errors': [
+                        f"{key[1]} section {key[2]} is not assigned to you.",
+                    ]})
+                elif entry[0] in seen:
+                    summary['errors'].append({'row': number, 'errors': ["Duplicate row for this enrollment."]})
+                else:
+                    seen.add(entry[0])
+                    matched.append((entry, cleaned))
+            if not matched or (summary['errors'] and not partial):
+                continue
+
+            existing = Grade.objects.in_bulk([entry[0] for entry, _ in matched], field_name='enrollment_id')
+            to_update, to_create, changes, buckets = [], [], [], []
+            for (enrollment_id, student_pk, faculty_id, units, course_id), cleaned in matched:
+                grade = existing.get(enrollment_id)
+                old_rating = grade.final_rating if grade else None
+                if grade is None:
+                    grade = Grade(enrollment_id=enrollment_id)
+                    to_create.append(grade)
+                else:
+                    to_update.append(grade)
+                grade.final_rating = cleaned['final_rating']
+                grade.date_submitted = submitted
+                for column in ('midterm_grade', 'final_grade', 'remarks'):
+                    if cleaned[column] not in (None, ''):
+                        setattr(grade, column, cleaned[column])
+                changes.append((student_pk, semester_id, units, old_rating, grade.final_rating))
+                buckets.append((course_id, semester_id, faculty_id, old_rating, grade.final_rating))
+
+            Grade.objects.bulk_update(
+                to_update, ['final_rating', 'midterm_grade', 'final_grade', 'remarks', 'date_submitted'],
+                batch_size=500,
+            )
+            Grade.objects.bulk_create(to_create, batch_size=500)
+            grade_ledger.record_instances(to_update + to_create)
+            standings.apply_rating_changes(changes)
+            grade_distribution.apply_deltas(buckets)
+            academic_standing.mark(student_pk for student_pk, *_ in changes)
+            summary['created'] += len(to_create)
+            summary['updated'] += len(to_update)
+
+        if summary['errors'] and not partial:
+            transaction.set_rollback(True)
+            summary['created'] = summary['updated'] = 0
+    summary['errors'].sort(key=lambda error: error['row'])
+    return summary
@@ -0,0 +1,181 @@
+"""
+Append-only ledger of Grade and AssessmentScore values.
+
+Every change is written as a narrow GradeChange row (old value, new value,
+actor, time) in the transaction that made it. Rows cannot be updated or
+deleted, and deleting a grade, enrollment or assessment leaves them in place. Single saves go through the
+model signals; bulk paths diff their instances and record all of their
+changes with one ``bulk_create``. The acting user comes from the request
+being served (see ``AuditActorMiddleware``) or :func:`acting_as`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+
+from ..models import AssessmentScore, Enrollment, Grade, GradeChange
+
+
+_request = ContextVar('grade_ledger_request', default=None)
+_actor = ContextVar('grade_ledger_actor', default=None)
+
+
+def bind_request(request):
+    """Attribute changes made while serving ``request`` to its (lazily authenticated) user."""
+    return _request.set(request)
+
+
+def unbind_request(token):
+    _request.reset(token)
+
+
+@contextmanager
+def acting_as(user):
+    token = _actor.set(user)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+def current_actor_id():
+    user = _actor.get()
+    if user is None:
+        # DRF authenticates inside the view and sets the user on the wrapped
+        # HttpRequest, so it is read at write time rather than bound up front.
+        user = getattr(_request.get(), 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def _text(value):
+    return None if value in (None, '') else str(value)
+
+
+def _normalized(instance, field, value):
+    # An assigned 40 and a loaded Decimal('40.00') are the same stored score.
+    model_field = instance._meta.get_field(field)
+    if value in (None, '') or not isinstance(model_field, models.DecimalField):
+        return value
+    return model_field.to_python(value).quantize(Decimal(1).scaleb(-model_field.decimal_places))
+
+
+def change(enrollment_id, field, old, new, assessment_id=None, actor_id=None, changed_at=None):
+    """An unsaved GradeChange, or ``None`` when the value did not change."""
+    old, new = _text(old), _text(new)
+    if old == new:
+        return None
+    return GradeChange(
+        enrollment_id=enrollment_id, assessment_id=assessment_id, field=field,
+        old_value=old, new_value=new, actor_id=actor_id, changed_at=changed_at or timezone.now(),
+    )
+
+
+def diff(instance, deleted=False, actor_id=None, changed_at=None):
+    """Changes of a Grade or AssessmentScore instance against the values it was loaded with."""
+    loaded = getattr(instance, '_loaded_values', {})
+    assessment_id = getattr(instance, 'assessment_id', None)
+    changes = []
+    for field in instance.TRACKED_FIELDS:
+        if deleted:
+            old, new = loaded.get(field, getattr(instance, field)), None
+        else:
+            # A field never loaded (new instance or deferred) has no known old value.
+            old, new = loaded.get(field), getattr(instance, field)
+        old, new = _normalized(instance, field, old), _normalized(instance, field, new)
+        entry = change(instance.enrollment_id, field, old, new, assessment_id, actor_id, changed_at)
+        if entry is not None:
+            changes.append(entry)
+    return changes
+
+
+def record(changes, batch_size=1000):
+    """
+    Write a batch of GradeChange rows.
+
+    Stamps the current actor where none was given and copies each
+    enrollment's student and offering onto its rows, so they can still be
+    found once the enrollment is gone.
+    """
+    changes = [entry for entry in changes if entry is not None]
+    if not changes:
+        return []
+    actor_id = current_actor_id()
+    owners = {
+        pk: (student_id, offering_id) for pk, student_id, offering_id in Enrollment.objects.filter(
+            pk__in={entry.enrollment_id for entry in changes},
+        ).values_list('pk', 'student_id', 'course_offering_id')
+    }
+    for entry in changes:
+        if entry.actor_id is None:
+            entry.actor_id = actor_id
+        entry.student_id, entry.course_offering_id = owners.get(entry.enrollment_id, (None, None))
+    return GradeChange.objects.bulk_create(changes, batch_size=batch_size)
+
+
+def record_instances(instances, deleted=False):
+    """Diff and record many Grade/AssessmentScore instances at once (for bulk writes that skip signals)."""
+    now = timezone.now()
+    return record([entry for instance in instances for entry in diff(instance, deleted, changed_at=now)])
+
+
+def _as_of(moment):
+    if isinstance(moment, datetime):
+        return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+    # A date means the end of that day.
+    return timezone.make_aware(datetime.combine(moment, time.max))
+
+
+def grades_as_of(student, moment):
+    """
+    The student's grades and assessment scores as they stood at ``moment``.
+
+    Starts from the current values and undoes every ledger entry made after
+    ``moment``: the oldest such entry per value holds what it was before.
+    This stays correct for values that predate the ledger.
+    """
+    student_id = getattr(student, 'pk', student)
+    moment = _as_of(moment)
+    enrollments = {
+        pk: {
+            'enrollment': pk, 'course_code': code, 'semester': semester_id,
+            'final_rating': None, 'midterm_grade': None, 'final_grade': None, 'scores': {},
+        }
+        for pk, code, semester_id in Enrollment.objects.filter(
+            student_id=student_id, date_enrolled__lte=timezone.localdate(moment),
+        ).values_list(
+            'pk', 'course_offering__course__course_code', 'course_offering__semester_id',
+        )
+    }
+    for enrollment_id, *values in Grade.objects.filter(enrollment__student_id=student_id).values_list(
+        'enrollment_id', *Grade.TRACKED_FIELDS,
+    ):
+        if enrollment_id in enrollments:
+            enrollments[enrollment_id].update(
+                (field, _text(value)) for field, value in zip(Grade.TRACKED_FIELDS, values)
+            )
+    for enrollment_id, assessment_id, score in AssessmentScore.objects.filter(
+        enrollment__student_id=student_id,
+    ).values_list('enrollment_id', 'assessment_id', 'score'):
+        if enrollment_id in enrollments:
+            enrollments[enrollment_id]['scores'][assessment_id] = _text(score)
+
+    undone = set()
+    for enrollment_id, assessment_id, field, old_value in GradeChange.objects.filter(
+        student_id=student_id, changed_at__gt=moment,
+    ).order_by('changed_at', 'id').values_list('enrollment_id', 'assessment_id', 'field', 'old_value'):
+        key = (enrollment_id, assessment_id, field)
+        if key in undone or enrollment_id not in enrollments:
+            continue
+        undone.add(key)
+        if assessment_id is None:
+            enrollments[enrollment_id][field] = old_value
+        elif old_value is None:
+            enrollments[enrollment_id]['scores'].pop(assessment_id, None)
+        else:
+            enrollments[enrollment_id]['scores'][assessment_id] = old_value
+    return list(enrollments.values())
@@ -0,0 +1,206 @@
+from array import array
+from bisect import bisect_right
+from decimal import Decimal
+from itertools import repeat
+from operator import add, mul
+
+from django.db import transaction
+
+from ..models import Assessment, AssessmentScore, CourseOffering, Enrollment, Grade
+from . import grade_ledger
+
+
+# Lowest percentage that earns each rating; anything below 75 is 5.00.
+TRANSMUTATION = [
+    (75, '3.00'), (76, '2.75'), (79, '2.50'), (82, '2.25'), (85, '2.00'),
+    (88, '1.75'), (91, '1.50'), (94, '1.25'), (97, '1.00'),
+]
+_CUTOFFS = [cutoff for cutoff, _ in TRANSMUTATION]
+
+MISSING_POLICIES = ('zero', 'exclude', 'incomplete')
+
+
+def transmute(percentage):
+    """Map a weighted percentage onto Grade.GRADE_CHOICES ('INC' when there is none)."""
+    if percentage is None:
+        return 'INC'
+    i = bisect_right(_CUTOFFS, percentage)
+    return TRANSMUTATION[i - 1][1] if i else '5.00'
+
+
+class ScoreMatrix:
+    """
+    Dense enrollment x assessment score matrix for one course offering.
+
+    Scores are stored row-major in a flat ``array('d')`` with a parallel
+    presence mask. Weighted totals are built a column at a time from strided
+    slices, so the work runs in ``map`` over whole columns rather than in a
+    Python loop per enrollment.
+    """
+
+    def __init__(self, enrollment_ids, assessments):
+        self.enrollment_ids = list(enrollment_ids)
+        self.assessment_ids = [a[0] for a in assessments]
+        self.max_scores = array('d', (float(a[1]) for a in assessments))
+        self.weights = array('d', (float(a[2]) for a in assessments))
+        self.dates = [a[3] for a in assessments]
+        self.rows, self.columns = len(self.enrollment_ids), len(self.assessment_ids)
+        self.scores = array('d', bytes(8 * self.rows * self.columns))
+        self.present = bytearray(self.rows * self.columns)
+        self._row = {pk: i for i, pk in enumerate(self.enrollment_ids)}
+        self._column = {pk: j for j, pk in enumerate(self.assessment_ids)}
+
+    @classmethod
+    def for_offering(cls, offering):
+        offering_id = getattr(offering, 'pk', offering)
+        enrollment_ids = (
+            Enrollment.objects.filter(course_offering_id=offering_id)
+            .exclude(status='DROPPED')
+            .order_by('student__student_id')
+            .values_list('pk', flat=True)
+        )
+        assessments = (
+            Assessment.objects.filter(course_offering_id=offering_id)
+            .order_by('date_given', 'pk')
+            .values_list('pk', 'max_score', 'weight', 'date_given')
+        )
+        matrix = cls(enrollment_ids, list(assessments))
+        for enrollment_id, assessment_id, score in AssessmentScore.objects.filter(
+            assessment__course_offering_id=offering_id,
+        ).values_list('enrollment_id', 'assessment_id', 'score'):
+            matrix.set(enrollment_id, assessment_id, score)
+        return matrix
+
+    def set(self, enrollment_id, assessment_id, score):
+        i, j = self._row.get(enrollment_id), self._column.get(assessment_id)
+        if i is None or j is None:
+            return
+        self.scores[i * self.columns + j] = float(score)
+        self.present[i * self.columns + j] = 1
+
+    def _accumulate(self, columns, earned=None, present=None, total=0.0):
+        """
+        Add ``columns`` into per-row earned points and present weight.
+
+        Each column is a strided slice of the flat arrays, so rows are summed
+        column by column with ``map`` instead of a Python loop per row.
+        """
+        if earned is None:
+            earned = array('d', bytes(8 * self.rows))
+            present = array('d', bytes(8 * self.rows))
+        for j in columns:
+            if self.max_scores[j] <= 0:
+                continue
+            weight = self.weights[j]
+            column = self.scores[j::self.columns]
+            mask = self.present[j::self.columns]
+            earned = array('d', map(add, earned, map(mul, column, repeat(100 * weight / self.max_scores[j]))))
+            present = array('d', map(add, present, map(mul, mask, repeat(weight))))
+            total += weight
+        return earned, present, total
+
+    @staticmethod
+    def _percentages(earned, present, total, policy):
+        if policy == 'zero':
+            return [earned_points / total for earned_points in earned] if total else [None] * len(earned)
+        if policy == 'incomplete':
+            return [
+                earned_points / total if total and weight == total else None
+                for earned_points, weight in zip(earned, present)
+            ]
+        return [earned_points / weight if weight else None for earned_points, weight in zip(earned, present)]
+
+    def weighted_percentages(self, columns=None, policy='zero'):
+        """
+        Weighted percentage per enrollment over ``columns`` (all by default).
+
+        Missing scores count as zero (``zero``), drop out of the weight total
+        (``exclude``), or make the result ``None`` (``incomplete``).
+        """
+        _check_policy(policy)
+        columns = range(self.columns) if columns is None else columns
+        return self._percentages(*self._accumulate(columns), policy)
+
+    def split_percentages(self, columns, policy='zero'):
+        """
+        Weighted percentages over ``columns`` and over every column, in one pass.
+
+        The totals of ``columns`` are carried on into the remaining columns, so
+        each score is read once.
+        """
+        _check_policy(policy)
+        columns = list(columns)
+        part = self._accumulate(columns)
+        chosen = set(columns)
+        whole = self._accumulate((j for j in range(self.columns) if j not in chosen), *part)
+        return self._percentages(*part, policy), self._percentages(*whole, policy)
+
+
+def _check_policy(policy):
+    if policy not in MISSING_POLICIES:
+        raise ValueError(f"Unknown missing-score policy {policy!r}.")
+
+
+def _as_decimal(percentage):
+    return None if percentage is None else Decimal(str(percentage)).quantize(Decimal('0.01'))
+
+
+def compute_offering_grades(offering, policy='zero', save=True):
+    """
+    Compute midterm and final standings for every enrollment in ``offering``.
+
+    Assessments given up to the middle of the semester make up the midterm.
+    Each standing is reported as a weighted percentage and its rating on
+    Grade.GRADE_CHOICES. When ``save`` is set the percentages are written to
+    ``Grade.midterm_grade`` / ``final_grade`` with one ``bulk_update`` plus
+    one ``bulk_create`` for enrollments without a Grade; ``final_rating`` is
+    left for the faculty member to submit.
+    """
+    if not isinstance(offering, CourseOffering):
+        offering = CourseOffering.objects.select_related('semester').get(pk=offering)
+    semester = offering.semester
+    midpoint = semester.start_date + (semester.end_date - semester.start_date) / 2
+
+    matrix = ScoreMatrix.for_offering(offering)
+    midterm_columns = [j for j, given in enumerate(matrix.dates) if given <= midpoint]
+    midterm, final = matrix.split_percentages(midterm_columns, policy)
+
+    results = [
+        {
+            'enrollment': enrollment_id,
+            'midterm_percentage': None if m is None else round(m, 2),
+            'midterm_rating': transmute(m),
+            'final_percentage': None if f is None else round(f, 2),
+            'final_rating': transmute(f),
+        }
+        for enrollment_id, m, f in zip(matrix.enrollment_ids, midterm, final)
+    ]
+    if save:
+        save_computed_grades(results)
+    return results
+
+
+def save_computed_grades(results):
+    by_enrollment = {row['enrollment']: row for row in results}
+    with transaction.atomic():
+        existing = list(Grade.objects.filter(enrollment_id__in=by_enrollment))
+        for grade in existing:
+            row = by_enrollment[grade.enrollment_id]
+            grade.midterm_grade = _as_decimal(row['midterm_percentage'])
+            grade.final_grade = _as_decimal(row['final_percentage'])
+        Grade.objects.bulk_update(existing, ['midterm_grade', 'final_grade'], batch_size=500)
+
+        graded = {grade.enrollment_id for grade in existing}
+        created = Grade.objects.bulk_create(
+            [
+                Grade(
+                    enrollment_id=enrollment_id,
+                    midterm_grade=_as_decimal(row['midterm_percentage']),
+                    final_grade=_as_decimal(row['final_percentage']),
+                )
+                for enrollment_id, row in by_enrollment.items()
+                if enrollment_id not in graded
+            ],
+            batch_size=500,
+        )
+        grade_ledger.record_instances(existing + created)
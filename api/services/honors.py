@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Sum, Window
+from django.db.models.functions import Cast, DenseRank, Rank
+from django.utils import timezone
+
+from ..models import Grade, HonorsRanking, StudentTermStanding
+from .standings import NUMERIC_RATINGS
+
+
+# How students with the same GWA are ordered:
+#   shared - equal GWAs share a rank and the next rank is skipped (1, 1, 3)
+#   dense  - equal GWAs share a rank without gaps (1, 1, 2)
+#   units  - the heavier load ranks higher; students still equal share a rank
+TIE_BREAKS = ('shared', 'dense', 'units')
+
+DEFAULT_POLICY = {
+    'deans_list_max_gwa': '1.75',
+    'deans_list_worst_rating': '2.50',
+    'deans_list_min_units': 15,
+    'latin_honors': [('SUMMA', '1.20'), ('MAGNA', '1.45'), ('CUM', '1.75')],
+}
+
+
+class GroupedWindow(Window):
+    """
+    A window over an aggregated queryset.
+
+    Django adds non-aggregate select expressions to GROUP BY, which for a
+    window ordered by an aggregate is invalid SQL; the window is evaluated
+    after grouping, so it contributes nothing to the grouping itself.
+    """
+
+    def get_group_by_cols(self):
+        return []
+
+
+def policy():
+    return {**DEFAULT_POLICY, **getattr(settings, 'PORTAL_HONORS_POLICY', {})}
+
+
+def ranking_rows(semester, tie_break='shared'):
+    """
+    One aggregated query ranking every graded student of ``semester`` by GWA
+    within their department and year level.
+
+    Rows carry the student's units, weighted GWA, worst rating, number of
+    INC/DRP ratings, cumulative standing and ``rank``.
+    """
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Unknown tie-break policy {tie_break!r}.")
+    semester_id = getattr(semester, 'pk', semester)
+    units = F('enrollment__course_offering__course__units')
+    rating = Cast('final_rating', DecimalField(max_digits=4, decimal_places=2))
+    numeric = Q(final_rating__in=NUMERIC_RATINGS)
+    cumulative = StudentTermStanding.objects.filter(student_id=OuterRef('student_id'), semester__isnull=True)
+
+    gwa_order = [F('gwa').asc()]
+    if tie_break == 'units':
+        gwa_order.append(F('attempted').desc())
+    rank = GroupedWindow(
+        DenseRank() if tie_break == 'dense' else Rank(),
+        partition_by=[F('department_id'), F('year_level')],
+        order_by=gwa_order,
+    )
+    return (
+        Grade.objects.filter(enrollment__course_offering__semester_id=semester_id)
+        .values(
+            student_id=F('enrollment__student_id'),
+            department_id=F('enrollment__student__department_id'),
+            year_level=F('enrollment__student__year_level'),
+        )
+        .annotate(
+            attempted=Sum(units, filter=numeric, output_field=IntegerField()),
+            weighted=Sum(units * rating, filter=numeric, output_field=DecimalField(max_digits=10, decimal_places=2)),
+            worst=Max(rating, filter=numeric),
+            unfinished=Count('pk', filter=Q(final_rating__in=('INC', 'DRP')) | Q(final_rating='')),
+        )
+        .filter(attempted__gt=0)
+        .annotate(
+            # A float division: SQLite stores whole NUMERIC values as integers and would truncate.
+            gwa=Cast('weighted', FloatField()) / F('attempted'),
+            cumulative_gwa=Subquery(cumulative.values('gwa')[:1]),
+            cumulative_failed=Subquery(cumulative.annotate(
+                failed=F('units_attempted') - F('units_earned'),
+            ).values('failed')[:1]),
+            rank=rank,
+        )
+        .order_by('department_id', 'year_level', 'rank', 'student_id')
+    )
+
+
+def latin_honor(cumulative_gwa, failed_units, honors):
+    if cumulative_gwa is None or failed_units:
+        return ''
+    for honor, threshold in honors:
+        if Decimal(cumulative_gwa) <= Decimal(threshold):
+            return honor
+    return ''
+
+
+def compute(semester, tie_break='shared', batch_size=2000):
+    """Replace the semester's HonorsRanking snapshot; returns the number of ranked students."""
+    semester_id = getattr(semester, 'pk', semester)
+    rules = policy()
+    max_gwa = Decimal(rules['deans_list_max_gwa'])
+    worst_allowed = Decimal(rules['deans_list_worst_rating'])
+    honors = rules['latin_honors']
+    computed_at = timezone.now()
+
+    rankings = []
+    for row in ranking_rows(semester_id, tie_break):
+        gwa = Decimal(str(row['gwa'])).quantize(Decimal('0.0001'))
+        rankings.append(HonorsRanking(
+            semester_id=semester_id,
+            student_id=row['student_id'],
+            department_id=row['department_id'],
+            year_level=row['year_level'],
+            units_attempted=row['attempted'],
+            gwa=gwa,
+            rank=row['rank'],
+            tie_break=tie_break,
+            deans_list=(
+                gwa <= max_gwa
+                and Decimal(str(row['worst'])) <= worst_allowed
+                and not row['unfinished']
+                and row['attempted'] >= rules['deans_list_min_units']
+            ),
+            cumulative_gwa=row['cumulative_gwa'],
+            latin_honor=latin_honor(row['cumulative_gwa'], row['cumulative_failed'], honors),
+            computed_at=computed_at,
+        ))
+    with transaction.atomic():
+        HonorsRanking.objects.filter(semester_id=semester_id).delete()
+        HonorsRanking.objects.bulk_create(rankings, batch_size=batch_size)
+    return len(rankings)
@@ -0,0 +1,110 @@
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from ..models import Course, Grade, PrerequisiteClosure
+
+
+PrerequisiteEdge = Course.prerequisites.through
+
+
+def load_graph():
+    """Direct prerequisites of every course, as ``{course_id: {prerequisite_id, ...}}``."""
+    graph = defaultdict(set)
+    for course_id, prerequisite_id in PrerequisiteEdge.objects.values_list('from_course_id', 'to_course_id'):
+        graph[course_id].add(prerequisite_id)
+    return graph
+
+
+def _close(course_id, graph):
+    seen, stack = set(), list(graph.get(course_id, ()))
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(graph.get(current, ()))
+    return seen
+
+
+def dependents(course_ids):
+    return set(
+        PrerequisiteClosure.objects.filter(prerequisite_id__in=course_ids).values_list('course_id', flat=True)
+    )
+
+
+def ancestors(course_ids):
+    return set(
+        PrerequisiteClosure.objects.filter(course_id__in=course_ids).values_list('prerequisite_id', flat=True)
+    )
+
+
+def check_cycle(course_id, prerequisite_ids):
+    """Raise ValidationError if making ``prerequisite_ids`` prerequisites of ``course_id`` closes a loop."""
+    prerequisite_ids = set(prerequisite_ids)
+    cyclic = set()
+    if course_id in prerequisite_ids:
+        cyclic.add(course_id)
+    cyclic.update(
+        PrerequisiteClosure.objects.filter(
+            course_id__in=prerequisite_ids, prerequisite_id=course_id,
+        ).values_list('course_id', flat=True)
+    )
+    if cyclic:
+        codes = ', '.join(Course.objects.filter(pk__in=cyclic).values_list('course_code', flat=True))
+        raise ValidationError(f"Circular prerequisite: {codes} already requires this course.")
+
+
+def add_edges(course_id, prerequisite_ids):
+    """Extend the closure after ``prerequisite_ids`` became prerequisites of ``course_id``."""
+    lower = set(prerequisite_ids) | ancestors(prerequisite_ids)
+    upper = {course_id} | dependents([course_id])
+    PrerequisiteClosure.objects.bulk_create(
+        [PrerequisiteClosure(course_id=c, prerequisite_id=p) for c in upper for p in lower],
+        ignore_conflicts=True,
+    )
+
+
+def refresh(course_ids):
+    """Recompute the closure of ``course_ids`` and everything that depends on them."""
+    affected = set(course_ids) | dependents(course_ids)
+    graph = load_graph()
+    with transaction.atomic():
+        PrerequisiteClosure.objects.filter(course_id__in=affected).delete()
+        PrerequisiteClosure.objects.bulk_create(
+            PrerequisiteClosure(course_id=c, prerequisite_id=p)
+            for c in affected for p in _close(c, graph)
+        )
+
+
+def rebuild():
+    graph = load_graph()
+    with transaction.atomic():
+        PrerequisiteClosure.objects.all().delete()
+        PrerequisiteClosure.objects.bulk_create(
+            (PrerequisiteClosure(course_id=c, prerequisite_id=p) for c in list(graph) for p in _close(c, graph)),
+            batch_size=1000,
+        )
+    return PrerequisiteClosure.objects.count()
+
+
+def prerequisites_of(course_ids):
+    """All transitive prerequisites of each course in one query, as ``{course_id: set}``."""
+    closure = {course_id: set() for course_id in course_ids}
+    for course_id, prerequisite_id in PrerequisiteClosure.objects.filter(
+        course_id__in=course_ids,
+    ).values_list('course_id', 'prerequisite_id'):
+        closure[course_id].add(prerequisite_id)
+    return closure
+
+
+def passed_courses(student):
+    return set(
+        student.enrollments.filter(grade__final_rating__in=Grade.PASSING_RATINGS)
+        .values_list('course_offering__course_id', flat=True)
+    )
+
+
+def missing_prerequisites(student, course):
+    course_id = getattr(course, 'pk', course)
+    return prerequisites_of([course_id])[course_id] - passed_courses(student)
@@ -0,0 +1,149 @@
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+
+from ..models import Schedule
+from .timetable import to_minutes
+
+
+def room_key(building, room):
+    # Room and building are free text; "Rm 101 " and "rm 101" are the same room.
+    return (' '.join((building or '').split()).casefold(), ' '.join((room or '').split()).casefold())
+
+
+def teaching_window():
+    """Minutes per day a room is available, used as the utilization denominator."""
+    start, end = getattr(settings, 'PORTAL_ROOM_DAY_HOURS', (7, 21))
+    return (end - start) * 60
+
+
+def sweep(meetings):
+    """
+    Overlapping pairs among ``meetings`` sharing a room and day.
+
+    ``meetings`` are ``(start_minute, end_minute, payload)`` tuples. They are
+    sorted by start time and swept while the still-running meetings are kept
+    in a heap by end time; every meeting overlaps exactly the ones running
+    when it starts. Finished meetings are popped off the heap rather than
+    rescanned, so the work beyond sorting is one heap operation per meeting
+    plus one per pair found.
+    """
+    pairs = []
+    running = []
+    for seq, (start, end, payload) in enumerate(sorted(meetings, key=lambda m: (m[0], m[1]))):
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        pairs.extend((other[2], payload) for other in running)
+        heapq.heappush(running, (end, seq, payload))
+    return pairs
+
+
+def occupied_minutes(meetings):
+    total, covered_until = 0, None
+    for start, end, _ in sorted(meetings, key=lambda m: m[0]):
+        if covered_until is None or start >= covered_until:
+            total += end - start
+            covered_until = end
+        elif end > covered_until:
+            total += end - covered_until
+            covered_until = end
+    return total
+
+
+def _semester_meetings(semester_id):
+    rows = Schedule.objects.filter(
+        course_offering__semester_id=semester_id, course_offering__is_active=True,
+    ).values_list(
+        'id', 'course_offering_id', 'course_offering__course__course_code', 'course_offering__section',
+        'building', 'room', 'day_of_week', 'start_time', 'end_time',
+    )
+    grouped = defaultdict(list)
+    labels = {}
+    for schedule_id, offering_id, code, section, building, room, day, start, end in rows:
+        key = room_key(building, room)
+        labels.setdefault(key, (building.strip(), room.strip()))
+        grouped[key + (day,)].append((
+            to_minutes(start), to_minutes(end),
+            {'schedule': schedule_id, 'course_offering': offering_id, 'label': f"{code} {section}"},
+        ))
+    return grouped, labels
+
+
+def room_report(semester):
+    """Every double booking and the weekly utilization of every room in ``semester``."""
+    semester_id = getattr(semester, 'pk', semester)
+    grouped, labels = _semester_meetings(semester_id)
+    window = teaching_window() * len(Schedule.DAY_CHOICES)
+
+    conflicts = []
+    occupied = defaultdict(int)
+    for (building, room, day), meetings in grouped.items():
+        occupied[(building, room)] += occupied_minutes(meetings)
+        for first, second in sweep(meetings):
+            if first['course_offering'] == second['course_offering']:
+                continue
+            conflicts.append({
+                'building': labels[(building, room)][0],
+                'room': labels[(building, room)][1],
+                'day': day,
+                'schedules': [first, second],
+            })
+
+    rooms = [
+        {
+            'building': labels[key][0],
+            'room': labels[key][1],
+            'occupied_minutes': minutes,
+            'utilization': round(100 * minutes / window, 1) if window else None,
+        }
+        for key, minutes in sorted(occupied.items())
+    ]
+    return {'conflicts': conflicts, 'rooms': rooms}
+
+
+def find_clashes(semester_id, meetings, exclude_offering_id=None):
+    """
+    Check one offering's meetings against the rest of the semester.
+
+    ``meetings`` are dicts with ``day_of_week``, ``start_time``, ``end_time``,
+    ``room`` and ``building``. Only the semester's schedules on the same
+    days are loaded, and only those in the same rooms (as :func:`room_key`
+    matches them) are compared. Returns human-readable clash descriptions,
+    including clashes among ``meetings`` themselves.
+    """
+    if not meetings:
+        return []
+    grouped = defaultdict(list)
+    for index, meeting in enumerate(meetings):
+        grouped[room_key(meeting['building'], meeting['room']) + (meeting['day_of_week'],)].append(
+            (to_minutes(meeting['start_time']), to_minutes(meeting['end_time']), (True, index))
+        )
+    others = Schedule.objects.filter(
+        day_of_week__in={meeting['day_of_week'] for meeting in meetings},
+        course_offering__semester_id=semester_id, course_offering__is_active=True,
+    )
+    if exclude_offering_id is not None:
+        others = others.exclude(course_offering_id=exclude_offering_id)
+    for day, start, end, room, building, code, section in others.values_list(
+        'day_of_week', 'start_time', 'end_time', 'room', 'building',
+        'course_offering__course__course_code', 'course_offering__section',
+    ):
+        # Free-text rooms cannot be matched in SQL the way room_key normalizes them.
+        key = room_key(building, room) + (day,)
+        if key in grouped:
+            grouped[key].append((to_minutes(start), to_minutes(end), (False, f"{code} {section}")))
+
+    clashes = []
+    for (_, _, day), group in grouped.items():
+        for first, second in sweep(group):
+            if not (first[0] or second[0]):
+                continue
+            own, other = (first, second) if first[0] else (second, first)
+            meeting = meetings[own[1]]
+            against = f"row {other[1] + 1} of this offering" if other[0] else other[1]
+            clashes.append(
+                f"{meeting['room']} on {day} {meeting['start_time']:%H:%M}-{meeting['end_time']:%H:%M} "
+                f"overlaps {against}."
+            )
+    return clashes
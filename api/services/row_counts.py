@@ -0,0 +1,64 @@
+"""
+Cheap row counts for paginating very large tables.
+
+Counts up to ``PORTAL_APPROXIMATE_COUNT_THRESHOLD`` are exact: a ``COUNT``
+over at most threshold + 1 rows is enough to tell whether a queryset is past
+the line. Above it an unfiltered table uses the database's row estimate
+(``pg_class.reltuples`` on PostgreSQL, the largest primary key elsewhere) and
+a filtered queryset reuses its exact count for
+``PORTAL_APPROXIMATE_COUNT_TTL`` seconds, so the expensive ``COUNT(*)`` runs
+at most once per filter combination per TTL.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Max
+
+
+AUTO_FIELDS = ('AutoField', 'BigAutoField', 'SmallAutoField')
+
+
+def threshold():
+    return getattr(settings, 'PORTAL_APPROXIMATE_COUNT_THRESHOLD', 10000)
+
+
+def ttl():
+    return getattr(settings, 'PORTAL_APPROXIMATE_COUNT_TTL', 300)
+
+
+def table_estimate(model, using='default'):
+    """Estimated number of rows in ``model``'s table, or ``None`` when there is no cheap estimate."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0) until the table is first vacuumed or analyzed.
+        if row and row[0] > 0:
+            return row[0]
+    if model._meta.pk.get_internal_type() in AUTO_FIELDS:
+        # An index seek; over-counts by the rows deleted since, which is fine for "about N".
+        return model._default_manager.using(using).aggregate(largest=Max('pk'))['largest'] or 0
+    return None
+
+
+def _cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha256(repr((queryset.db, sql, params)).encode()).hexdigest()
+    return f'row-count:{queryset.model._meta.label_lower}:{digest}'
+
+
+def count(queryset):
+    """Return ``(count, approximate)`` for ``queryset``."""
+    queryset = queryset.order_by()
+    limit = threshold()
+    bounded = queryset[:limit + 1].count()
+    if bounded <= limit:
+        return bounded, False
+    if not queryset.query.where:
+        estimate = table_estimate(queryset.model, queryset.db)
+        if estimate is not None:
+            return max(estimate, bounded), True
+    return cache.get_or_set(_cache_key(queryset), queryset.count, ttl()), True
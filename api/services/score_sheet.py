@@ -0,0 +1,184 @@
+"""
+Spreadsheet-style score entry for a course offering.
+
+The sheet is an enrollment x assessment matrix. Edits are upserted in bulk
+and guarded per cell: an edit is rejected when that cell was written or
+cleared after the editor loaded the sheet, so two people can work on the
+same sheet as long as they do not overwrite each other's cells.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..exceptions import ScoreSheetConflict
+from ..models import Assessment, AssessmentScore, CourseOffering, Enrollment, GradeChange
+from . import assessment_stats, grade_ledger
+
+
+def load(offering_id):
+    """The offering's score matrix; ``version`` is the token to send back with edits."""
+    version = timezone.now()
+    assessments = list(
+        Assessment.objects.filter(course_offering_id=offering_id)
+        .order_by('date_given', 'pk')
+        .values('id', 'title', 'assessment_type', 'max_score', 'weight', 'date_given')
+    )
+    enrollments = list(
+        Enrollment.objects.filter(course_offering_id=offering_id)
+        .exclude(status='DROPPED')
+        .order_by('student__user__last_name', 'student__user__first_name', 'student__student_id')
+        .values_list('pk', 'student__student_id', 'student__user__last_name', 'student__user__first_name')
+    )
+    row = {pk: i for i, (pk, *_) in enumerate(enrollments)}
+    column = {assessment['id']: j for j, assessment in enumerate(assessments)}
+    scores = [[None] * len(assessments) for _ in enrollments]
+    for enrollment_id, assessment_id, score in AssessmentScore.objects.filter(
+        assessment__course_offering_id=offering_id,
+    ).values_list('enrollment_id', 'assessment_id', 'score'):
+        if enrollment_id in row and assessment_id in column:
+            scores[row[enrollment_id]][column[assessment_id]] = score
+    return {
+        'course_offering': offering_id,
+        'version': version.isoformat(),
+        'assessments': assessments,
+        'enrollments': [
+            {'id': pk, 'student_id': student_id, 'name': f"{last}, {first}".strip(', ')}
+            for pk, student_id, last, first in enrollments
+        ],
+        'scores': scores,
+    }
+
+
+def _clean_edits(offering_id, edits):
+    """Validate raw ``{'enrollment', 'assessment', 'score'}`` dicts; returns ``(cells, errors)``."""
+    max_scores = dict(Assessment.objects.filter(course_offering_id=offering_id).values_list('pk', 'max_score'))
+    enrolled = set(
+        Enrollment.objects.filter(course_offering_id=offering_id).exclude(status='DROPPED').values_list('pk', flat=True)
+    )
+    cells, errors = {}, []
+    for index, edit in enumerate(edits):
+        try:
+            key = (int(edit['assessment']), int(edit['enrollment']))
+        except (KeyError, TypeError, ValueError):
+            errors.append({'edit': index, 'error': "assessment and enrollment ids are required."})
+            continue
+        if key[0] not in max_scores or key[1] not in enrolled:
+            errors.append({'edit': index, 'error': "Cell is not part of this offering's sheet."})
+            continue
+        score = edit.get('score')
+        if score is not None:
+            try:
+                score = Decimal(str(score)).quantize(Decimal('0.01'))
+            except InvalidOperation:
+                score = None
+            if score is None or not score.is_finite():
+                errors.append({'edit': index, 'error': "score must be a number or null."})
+                continue
+            if not 0 <= score <= max_scores[key[0]]:
+                errors.append({'edit': index, 'error': f"score must be between 0 and {max_scores[key[0]]}."})
+                continue
+        cells[key] = score
+    return cells, errors
+
+
+def parse_version(version):
+    """A sheet ``version`` as a datetime; raises ``ValueError`` for anything else."""
+    if version is None or hasattr(version, 'tzinfo'):
+        return version
+    try:
+        parsed = parse_datetime(str(version))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError("version must be an ISO 8601 timestamp.")
+    return parsed
+
+
+def _touched_since(offering_id, version):
+    """
+    Cells of the sheet written or cleared after ``version``, with their current values.
+
+    Clearing a cell deletes its row, so the grade ledger is what remembers
+    that it changed.
+    """
+    touched = {}
+    for a, e, changed_at in GradeChange.objects.filter(
+        course_offering_id=offering_id, field='score', changed_at__gt=version,
+    ).values_list('assessment_id', 'enrollment_id', 'changed_at'):
+        touched[(a, e)] = changed_at
+    if not touched:
+        return []
+    current = {
+        (a, e): score for a, e, score in AssessmentScore.objects.filter(
+            assessment_id__in={a for a, _ in touched}, enrollment_id__in={e for _, e in touched},
+        ).values_list('assessment_id', 'enrollment_id', 'score')
+    }
+    return [
+        {'assessment_id': a, 'enrollment_id': e, 'score': current.get((a, e)), 'updated_at': changed_at}
+        for (a, e), changed_at in touched.items()
+    ]
+
+
+def apply_edits(offering_id, edits, version=None):
+    """
+    Upsert sparse cell edits; a ``None`` score clears the cell.
+
+    Edited cells that were written or cleared since ``version`` (from
+    :func:`load` or the previous call) raise :class:`ScoreSheetConflict`
+    carrying their current values and nothing is written; without a
+    ``version`` only empty cells may be filled. Other cells changed since
+    ``version`` are returned as ``changes`` so the caller can merge them and
+    continue from the returned ``version``.
+    """
+    version = parse_version(version)
+    cells, errors = _clean_edits(offering_id, edits)
+    if errors:
+        return {'saved': 0, 'cleared': 0, 'errors': errors, 'changes': [], 'version': None}
+
+    with transaction.atomic():
+        # One writer per sheet at a time, so nothing lands between the check and the writes.
+        CourseOffering.objects.select_for_update().only('pk').get(pk=offering_id)
+        existing = {
+            (cell['assessment_id'], cell['enrollment_id']): cell
+            for cell in AssessmentScore.objects.filter(
+                assessment_id__in={a for a, _ in cells}, enrollment_id__in={e for _, e in cells},
+            ).values('assessment_id', 'enrollment_id', 'score', 'updated_at')
+        }
+        changes = []
+        if version is None:
+            conflicts = [cell for key, cell in existing.items() if key in cells]
+        else:
+            conflicts = []
+            for cell in _touched_since(offering_id, version):
+                (conflicts if (cell['assessment_id'], cell['enrollment_id']) in cells else changes).append(cell)
+        if conflicts:
+            raise ScoreSheetConflict(conflicts)
+
+        upserts = [
+            AssessmentScore(assessment_id=a, enrollment_id=e, score=score)
+            for (a, e), score in cells.items() if score is not None
+        ]
+        AssessmentScore.objects.bulk_create(
+            upserts, batch_size=500,
+            update_conflicts=True, unique_fields=['assessment', 'enrollment'], update_fields=['score', 'updated_at'],
+        )
+        grade_ledger.record(
+            grade_ledger.change(e, 'score', existing.get((a, e), {}).get('score'), score, assessment_id=a)
+            for (a, e), score in cells.items() if score is not None
+        )
+        cleared = [key for key, score in cells.items() if score is None]
+        deleted = 0
+        if cleared:
+            lookup = Q()
+            for a, e in cleared:
+                lookup |= Q(assessment_id=a, enrollment_id=e)
+            # The post_delete signal records each cleared cell in the ledger.
+            deleted, _ = AssessmentScore.objects.filter(lookup).delete()
+        # bulk_create skips signals, so drop cached statistics explicitly.
+        assessment_stats.invalidate({a for a, _ in cells})
+        # Taken after the writes, so the caller's own cells are not newer than the version.
+        now = timezone.now()
+    return {'saved': len(upserts), 'cleared': deleted, 'errors': [], 'changes': changes, 'version': now.isoformat()}
@@ -0,0 +1,218 @@
+"""
+Full-text search over the portal's free-text fields.
+
+Every indexed row has one SearchDocument holding its title and body text,
+refreshed on save (see ``api.signals``) and by ``rebuild_search_index``.
+The backend that matches and ranks documents depends on the database:
+
+* SQLite: the FTS5 table from migration 0015, ranked with ``bm25``.
+* PostgreSQL: a weighted ``tsvector`` backed by a GIN index, ranked with
+  ``ts_rank``.
+* Anything else, or SQLite built without FTS5: ``LIKE`` on the documents.
+
+``PORTAL_SEARCH_BACKEND`` can name another backend class. Each word of a
+query must match, as a prefix, somewhere in the title or body; title hits
+rank higher.
+"""
+import re
+from functools import cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from ..models import Announcement, CourseEvaluation, Event, Feedback, Notification, SearchDocument
+
+
+# Model -> (title path, body paths or expressions...). Related paths are
+# copied when the row itself is saved; rebuild_search_index picks up later
+# changes to them.
+INDEXED = {
+    Announcement: ('title', 'content'),
+    Event: ('title', 'description', 'venue', 'organizer__username'),
+    Notification: ('title', 'message', 'recipient__username'),
+    Feedback: ('subject', 'message', 'response', 'student__student_id'),
+    CourseEvaluation: (
+        'enrollment__course_offering__course__course_code', 'comments',
+        # Anonymous evaluations must not be findable, or shown, by student.
+        Case(When(is_anonymous=False, then=F('enrollment__student__student_id'))),
+    ),
+}
+
+TITLE_LENGTH = SearchDocument._meta.get_field('title').max_length
+
+
+def terms(query):
+    """Lower-cased words of ``query``; everything else, including backend query syntax, is dropped."""
+    return re.findall(r'\w+', query.lower())
+
+
+class SQLiteBackend:
+    table = 'api_searchdocument_fts'
+    # bm25 column weights for (title, body).
+    weights = (5.0, 1.0)
+
+    def _match(self, words):
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def filter(self, documents, words):
+        return documents.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [self._match(words)],
+        ))
+
+    def rank(self, documents, words):
+        # bm25 is lower-is-better; negated so that, as with ts_rank, higher ranks first.
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return documents.annotate(rank=RawSQL(
+            f'SELECT -bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {SearchDocument._meta.db_table}.id',
+            [self._match(words)], output_field=FloatField(),
+        ))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+
+class PostgresBackend:
+    config = 'simple'
+
+    def _vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        # Must stay identical to the GIN index expression in migration 0015.
+        return (
+            SearchVector('title', weight='A', config=self.config)
+            + SearchVector('body', weight='B', config=self.config)
+        )
+
+    def _query(self, words):
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=self.config)
+
+    def filter(self, documents, words):
+        return documents.alias(search_vector=self._vector()).filter(search_vector=self._query(words))
+
+    def rank(self, documents, words):
+        from django.contrib.postgres.search import SearchRank
+
+        return documents.annotate(rank=SearchRank(self._vector(), self._query(words)))
+
+    def rebuild(self):
+        pass
+
+
+class LikeBackend:
+    def filter(self, documents, words):
+        for word in words:
+            documents = documents.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        return documents
+
+    def rank(self, documents, words):
+        return documents.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    def rebuild(self):
+        pass
+
+
+@cache
+def backend():
+    path = getattr(settings, 'PORTAL_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    if connection.vendor == 'sqlite' and SQLiteBackend.table in connection.introspection.table_names():
+        return SQLiteBackend()
+    return LikeBackend()
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def index(model, pks):
+    """Write the search documents of ``model`` rows ``pks``, dropping those whose rows are gone."""
+    pks = list(pks)
+    if not pks:
+        return
+    title_path, *body_paths = INDEXED[model]
+    label = _label(model)
+    documents = []
+    for pk, title, *body in model._default_manager.filter(pk__in=pks).values_list('pk', title_path, *body_paths):
+        documents.append(SearchDocument(
+            model_label=label, object_id=pk, title=str(title or '')[:TITLE_LENGTH],
+            body='\n'.join(str(value) for value in body if value),
+        ))
+    with transaction.atomic():
+        SearchDocument.objects.bulk_create(
+            documents, batch_size=500, update_conflicts=True,
+            unique_fields=['model_label', 'object_id'], update_fields=['title', 'body', 'updated_at'],
+        )
+        missing = set(pks) - {document.object_id for document in documents}
+        if missing:
+            remove(model, missing)
+
+
+def remove(model, pks):
+    SearchDocument.objects.filter(model_label=_label(model), object_id__in=list(pks)).delete()
+
+
+def rebuild(models=None, batch_size=1000):
+    """Reindex every row of ``models`` (default: all indexed models) and drop orphaned documents."""
+    counts = {}
+    for model in models or INDEXED:
+        pks = model._default_manager.order_by('pk').values_list('pk', flat=True)
+        total = 0
+        last = 0
+        while batch := list(pks.filter(pk__gt=last)[:batch_size]):
+            index(model, batch)
+            total += len(batch)
+            last = batch[-1]
+        SearchDocument.objects.filter(model_label=_label(model)).exclude(
+            object_id__in=model._default_manager.values('pk'),
+        ).delete()
+        counts[_label(model)] = total
+    backend().rebuild()
+    return counts
+
+
+def matching_ids(model, query):
+    """Subquery of the pks of ``model`` rows matching ``query``, for ``pk__in`` filters."""
+    words = terms(query)
+    documents = SearchDocument.objects.filter(model_label=_label(model))
+    if not words:
+        return documents.none().values('object_id')
+    return backend().filter(documents, words).values('object_id')
+
+
+def search(query, querysets, limit=20):
+    """
+    Ranked matches for ``query`` among the rows of ``querysets``.
+
+    ``querysets`` maps indexed models to the rows the caller may see. Returns
+    ``{'type', 'id', 'title', 'excerpt', 'rank'}`` dicts, best match first.
+    """
+    words = terms(query)
+    if not words or not querysets:
+        return []
+    visible = Q()
+    for model, queryset in querysets.items():
+        visible |= Q(model_label=_label(model), object_id__in=queryset.values('pk'))
+    documents = backend().filter(SearchDocument.objects.filter(visible), words)
+    documents = backend().rank(documents, words).order_by('-rank', '-updated_at')[:limit]
+    return [
+        {
+            'type': label.partition('.')[2],
+            'id': object_id,
+            'title': title,
+            'excerpt': body[:200],
+            'rank': rank,
+        }
+        for label, object_id, title, body, rank in documents.values_list(
+            'model_label', 'object_id', 'title', 'body', 'rank',
+        )
+    ]
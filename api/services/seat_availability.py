@@ -0,0 +1,109 @@
+"""
+Read model of open seats for a semester's course offerings.
+
+The catalog listing of a semester is cached as one entry and every
+offering's free seats as its own counter, so enrollment writes can adjust a
+counter with ``incr``/``decr`` instead of invalidating the whole listing.
+Both expire after ``PORTAL_SEAT_CACHE_MAX_STALENESS`` seconds, which bounds
+how far a reader can drift from the database if a delta is ever missed.
+Point ``CACHES['default']`` at a shared backend (Redis, Memcached) to share
+the read model between worker processes.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import CourseOffering, Schedule
+
+
+def max_staleness():
+    return getattr(settings, 'PORTAL_SEAT_CACHE_MAX_STALENESS', 60)
+
+
+def _index_key(semester_id):
+    return f'seats:index:{semester_id}'
+
+
+def _seat_key(offering_id):
+    return f'seats:offering:{offering_id}'
+
+
+def rebuild(semester_id):
+    """Load the semester's offerings from the database and replace the cached read model."""
+    rows = list(
+        CourseOffering.objects.filter(semester_id=semester_id, is_active=True)
+        .order_by('course__course_code', 'section')
+        .values(
+            'id', 'section', 'max_slots', 'enrolled_count', 'course__course_code',
+            'course__title', 'course__units', 'faculty__user__first_name', 'faculty__user__last_name',
+        )
+    )
+    schedules = defaultdict(list)
+    for offering_id, day, start, end, room in Schedule.objects.filter(
+        course_offering__semester_id=semester_id, course_offering__is_active=True,
+    ).values_list('course_offering_id', 'day_of_week', 'start_time', 'end_time', 'room'):
+        schedules[offering_id].append({
+            'day': day, 'start': start.strftime('%H:%M'), 'end': end.strftime('%H:%M'), 'room': room,
+        })
+
+    offerings = [
+        {
+            'id': row['id'],
+            'course_code': row['course__course_code'],
+            'title': row['course__title'],
+            'units': row['course__units'],
+            'section': row['section'],
+            'faculty': f"{row['faculty__user__first_name']} {row['faculty__user__last_name']}".strip() or None,
+            'max_slots': row['max_slots'],
+            'schedules': schedules[row['id']],
+        }
+        for row in rows
+    ]
+    timeout = max_staleness()
+    entries = {_seat_key(row['id']): row['max_slots'] - row['enrolled_count'] for row in rows}
+    entries[_index_key(semester_id)] = {'built_at': time.time(), 'offerings': offerings}
+    cache.set_many(entries, timeout)
+    return offerings
+
+
+def catalog(semester_id):
+    """Offerings of a semester with their current ``available_slots``; no queries when warm."""
+    index = cache.get(_index_key(semester_id))
+    offerings = None if index is None else index['offerings']
+    seats = {}
+    if offerings is not None:
+        seats = cache.get_many([_seat_key(offering['id']) for offering in offerings])
+        if len(seats) != len(offerings):
+            offerings = None
+    if offerings is None:
+        offerings = rebuild(semester_id)
+        seats = cache.get_many([_seat_key(offering['id']) for offering in offerings])
+    return [
+        {**offering, 'available_slots': seats.get(_seat_key(offering['id']), 0)}
+        for offering in offerings
+    ]
+
+
+def apply_delta(offering_id, delta):
+    """Adjust an offering's cached seat counter; a missing counter is left to the next rebuild."""
+    try:
+        cache.incr(_seat_key(offering_id), delta)
+    except ValueError:
+        pass
+
+
+def publish_delta(offering_id, delta):
+    """Apply ``delta`` once the surrounding transaction commits."""
+    transaction.on_commit(lambda: apply_delta(offering_id, delta))
+
+
+def invalidate(semester_id=None, offering_id=None):
+    keys = []
+    if semester_id is not None:
+        keys.append(_index_key(semester_id))
+    if offering_id is not None:
+        keys.append(_seat_key(offering_id))
+    cache.delete_many(keys)
@@ -0,0 +1,179 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, DecimalField, F, FloatField, IntegerField, Q, Sum, When
+from django.db.models.functions import Cast
+
+from ..models import Enrollment, Grade, StudentTermStanding
+
+
+# Ratings that count towards the weighted average.
+NUMERIC_RATINGS = Grade.PASSING_RATINGS + ('5.00',)
+
+
+def contribution(rating, units):
+    """``(units_attempted, units_earned, weighted_sum)`` a single rating adds to a standing."""
+    if rating not in NUMERIC_RATINGS:
+        return (0, 0, Decimal(0))
+    earned = units if rating in Grade.PASSING_RATINGS else 0
+    return (units, earned, units * Decimal(rating))
+
+
+def average(weighted, attempted):
+    """Weighted average of a standing, rounded as stored; ``None`` with no units attempted."""
+    return (Decimal(weighted) / attempted).quantize(Decimal('0.0001')) if attempted > 0 else None
+
+
+def _apply(student_id, semester_id, attempted, earned, weighted, retry=True):
+    new_attempted = F('units_attempted') + attempted
+    new_weighted = F('weighted_sum') + weighted
+    updated = StudentTermStanding.objects.filter(student_id=student_id, semester_id=semester_id).update(
+        units_attempted=new_attempted,
+        units_earned=F('units_earned') + earned,
+        weighted_sum=new_weighted,
+        # Cast both sides: SQLite stores whole decimals as integers and would truncate the quotient.
+        gwa=Case(
+            When(
+                Q(units_attempted__gt=-attempted),
+                then=Cast(new_weighted, FloatField()) / Cast(new_attempted, FloatField()),
+            ),
+            default=None,
+        ),
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            StudentTermStanding.objects.create(
+                student_id=student_id, semester_id=semester_id,
+                units_attempted=attempted, units_earned=earned, weighted_sum=weighted,
+                gwa=average(weighted, attempted),
+            )
+    except IntegrityError:
+        # Created concurrently; the row exists now, so the UPDATE path applies.
+        if not retry:
+            raise
+        _apply(student_id, semester_id, attempted, earned, weighted, retry=False)
+
+
+def apply_rating_changes(changes):
+    """
+    Batch form of :func:`apply_rating_change` for bulk grade writes.
+
+    ``changes`` are ``(student_id, semester_id, units, old_rating, new_rating)``
+    tuples; deltas are summed per standing row before being applied.
+    """
+    totals = {}
+    for student_id, semester_id, units, old_rating, new_rating in changes:
+        delta = [n - o for n, o in zip(contribution(new_rating, units), contribution(old_rating, units))]
+        for key in ((student_id, semester_id), (student_id, None)):
+            current = totals.setdefault(key, [0, 0, Decimal(0)])
+            for i, value in enumerate(delta):
+                current[i] += value
+    with transaction.atomic():
+        for (student_id, semester_id), delta in totals.items():
+            if any(delta):
+                _apply(student_id, semester_id, *delta)
+
+
+def apply_rating_change(enrollment_id, old_rating, new_rating):
+    """Move the term and cumulative standings by the difference between two ratings."""
+    if old_rating == new_rating:
+        return
+    row = (
+        Enrollment.objects.filter(pk=enrollment_id)
+        .values('student_id', 'course_offering__semester_id', 'course_offering__course__units')
+        .first()
+    )
+    if row is None:
+        return
+    units = row['course_offering__course__units']
+    old = contribution(old_rating, units)
+    new = contribution(new_rating, units)
+    delta = tuple(n - o for n, o in zip(new, old))
+    if not any(delta):
+        return
+    with transaction.atomic():
+        _apply(row['student_id'], row['course_offering__semester_id'], *delta)
+        _apply(row['student_id'], None, *delta)
+
+
+def expected_standings(student_ids=None):
+    """
+    Standings recomputed from the Grade rows with SQL aggregates.
+
+    Returns ``{(student_id, semester_id or None): (attempted, earned, weighted_sum, gwa)}``.
+    """
+    grades = Grade.objects.filter(final_rating__in=NUMERIC_RATINGS)
+    if student_ids is not None:
+        grades = grades.filter(enrollment__student_id__in=student_ids)
+    units = F('enrollment__course_offering__course__units')
+    aggregates = {
+        'attempted': Sum(units),
+        'earned': Sum(Case(
+            When(final_rating__in=Grade.PASSING_RATINGS, then=units), default=0, output_field=IntegerField(),
+        )),
+        'weighted': Sum(
+            units * Cast('final_rating', DecimalField(max_digits=4, decimal_places=2)),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ),
+    }
+    expected = {}
+    for row in grades.values('enrollment__student_id', 'enrollment__course_offering__semester_id').annotate(**aggregates).order_by():
+        key = (row['enrollment__student_id'], row['enrollment__course_offering__semester_id'])
+        expected[key] = _expected_row(row)
+    for row in grades.values('enrollment__student_id').annotate(**aggregates).order_by():
+        expected[(row['enrollment__student_id'], None)] = _expected_row(row)
+    return expected
+
+
+def _expected_row(row):
+    weighted = Decimal(row['weighted']).quantize(Decimal('0.01'))
+    return (row['attempted'], row['earned'], weighted, average(weighted, row['attempted']))
+
+
+def stored_standings(student_ids=None):
+    standings = StudentTermStanding.objects.all()
+    if student_ids is not None:
+        standings = standings.filter(student_id__in=student_ids)
+    return {
+        (student_id, semester_id): (attempted, earned, weighted, gwa)
+        for student_id, semester_id, attempted, earned, weighted, gwa in standings.values_list(
+            'student_id', 'semester_id', 'units_attempted', 'units_earned', 'weighted_sum', 'gwa',
+        )
+    }
+
+
+def reconcile(student_ids=None, fix=False):
+    """
+    Compare stored standings with a full recompute.
+
+    Returns the keys that differ (missing, stale or orphaned rows). With
+    ``fix`` the differing rows are rewritten from the recomputed values.
+    """
+    expected = expected_standings(student_ids)
+    stored = stored_standings(student_ids)
+    zero = (0, 0, Decimal('0.00'), None)
+    mismatched = sorted(
+        (key for key in expected.keys() | stored.keys() if expected.get(key, zero) != stored.get(key, zero)),
+        key=lambda key: (key[0], key[1] or 0),
+    )
+    if fix and mismatched:
+        with transaction.atomic():
+            for student_id, semester_id in mismatched:
+                attempted, earned, weighted, term_gwa = expected.get((student_id, semester_id), zero)
+                StudentTermStanding.objects.update_or_create(
+                    student_id=student_id, semester_id=semester_id,
+                    defaults={
+                        'units_attempted': attempted,
+                        'units_earned': earned,
+                        'weighted_sum': weighted,
+                        'gwa': term_gwa,
+                    },
+                )
+    return mismatched
+
+
+def recompute(student_ids):
+    """Rebuild the standings of ``student_ids``; used after bulk grade writes that skip signals."""
+    return reconcile(student_ids, fix=True)
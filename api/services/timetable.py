@@ -0,0 +1,98 @@
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+
+from ..models import Enrollment, Schedule
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class TimetableIndex:
+    """
+    Per-day index of meeting intervals.
+
+    Intervals are kept sorted by start time alongside a running maximum of
+    end times, so "does [start, end) overlap anything on this day?" is one
+    bisect. Entries are ``(offering_id, day_of_week, start_time, end_time)``.
+    """
+
+    def __init__(self, entries=()):
+        by_day = defaultdict(list)
+        for offering_id, day, start, end in entries:
+            by_day[day].append((to_minutes(start), to_minutes(end), offering_id))
+        self._days = {}
+        for day, intervals in by_day.items():
+            intervals.sort()
+            starts = [interval[0] for interval in intervals]
+            reach = list(accumulate((interval[1] for interval in intervals), max))
+            self._days[day] = (starts, reach, intervals)
+
+    def has_overlap(self, day, start, end):
+        if day not in self._days:
+            return False
+        starts, reach, _ = self._days[day]
+        i = bisect_left(starts, to_minutes(end))
+        return i > 0 and reach[i - 1] > to_minutes(start)
+
+    def overlapping(self, day, start, end):
+        """Offering ids with a meeting on ``day`` that overlaps [start, end)."""
+        if day not in self._days:
+            return []
+        starts, reach, intervals = self._days[day]
+        start, end = to_minutes(start), to_minutes(end)
+        found = []
+        i = bisect_left(starts, end) - 1
+        # reach is non-decreasing, so once it drops to ``start`` nothing earlier can overlap.
+        while i >= 0 and reach[i] > start:
+            if intervals[i][1] > start:
+                found.append(intervals[i][2])
+            i -= 1
+        return found
+
+
+def enrolled_schedules(student, semester_ids):
+    """Meetings of the sections ``student`` currently holds a seat in, keyed by semester."""
+    rows = Schedule.objects.filter(
+        course_offering__semester__in=semester_ids,
+        course_offering__enrollments__student=student,
+        course_offering__enrollments__status__in=Enrollment.SEAT_HOLDING_STATUSES,
+    ).values_list('course_offering__semester_id', 'course_offering_id', 'day_of_week', 'start_time', 'end_time')
+    by_semester = defaultdict(list)
+    for semester_id, *entry in rows:
+        by_semester[semester_id].append(tuple(entry))
+    return by_semester
+
+
+def build_index(student, semester):
+    semester_id = getattr(semester, 'pk', semester)
+    return TimetableIndex(enrolled_schedules(student, [semester_id])[semester_id])
+
+
+def find_conflicts(student, offering_ids, enrolled=None):
+    """
+    Check a shopping cart of offerings against the student's timetable and each other.
+
+    Returns ``{offering_id: [conflicting offering ids]}`` for every offering in
+    the cart; an empty list means no conflict. ``enrolled`` may pass
+    pre-fetched rows from :func:`enrolled_schedules`; otherwise the whole cart
+    is checked with two queries.
+    """
+    offering_ids = list(dict.fromkeys(offering_ids))
+    cart = defaultdict(list)
+    for semester_id, *entry in Schedule.objects.filter(course_offering_id__in=offering_ids).values_list(
+        'course_offering__semester_id', 'course_offering_id', 'day_of_week', 'start_time', 'end_time',
+    ):
+        cart[semester_id].append(tuple(entry))
+    if enrolled is None:
+        enrolled = enrolled_schedules(student, list(cart))
+
+    conflicts = {offering_id: set() for offering_id in offering_ids}
+    for semester_id, meetings in cart.items():
+        enrolled_index = TimetableIndex(enrolled.get(semester_id, ()))
+        cart_index = TimetableIndex(meetings)
+        for offering_id, day, start, end in meetings:
+            found = enrolled_index.overlapping(day, start, end) + cart_index.overlapping(day, start, end)
+            conflicts[offering_id].update(other for other in found if other != offering_id)
+    return {offering_id: sorted(found) for offering_id, found in conflicts.items()}
@@ -0,0 +1,283 @@
+"""
+Transcript of Records and Certificate of Grades rendering.
+
+A student's record is assembled in two queries and rendered to HTML or PDF.
+Rendered files are kept under ``PORTAL_TRANSCRIPT_DIR`` (``MEDIA_ROOT/
+transcripts`` by default), named after a SHA-256 of the record itself, so a
+document is only rendered again once one of the student's grades, courses or
+enrollments actually changes. Renders are written to a temporary file and
+moved into place, so a reader never sees a partial file; superseded renders
+are left for :func:`prune` to remove once no response can still be serving
+them.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from ..models import Enrollment, Semester, Student
+from .standings import contribution
+
+
+DOCUMENT_TYPES = ('TOR', 'CERT_GRADES')
+SEMESTER_NAMES = dict(Semester.SEMESTER_CHOICES)
+FORMATS = ('pdf', 'html')
+
+# Bump whenever the HTML template or PDF layout changes so cached renders are replaced.
+LAYOUT_VERSION = 1
+
+
+def storage_dir():
+    return Path(getattr(settings, 'PORTAL_TRANSCRIPT_DIR', Path(settings.MEDIA_ROOT) / 'transcripts'))
+
+
+def retention():
+    # How long a superseded render is kept for responses that may still be streaming it.
+    return getattr(settings, 'PORTAL_TRANSCRIPT_RETENTION', 3600)
+
+
+def _summary(courses):
+    attempted = earned = 0
+    weighted = Decimal(0)
+    for course in courses:
+        a, e, w = contribution(course['final_rating'], course['units'])
+        attempted, earned, weighted = attempted + a, earned + e, weighted + w
+    return {
+        'units_attempted': attempted,
+        'units_earned': earned,
+        'gwa': str((weighted / attempted).quantize(Decimal('0.0001'))) if attempted else None,
+    }
+
+
+def build(student, document_type='TOR', semester=None):
+    """
+    The academic record shown on a transcript, as plain JSON-able data.
+
+    ``TOR`` covers every term; ``CERT_GRADES`` covers ``semester`` (the
+    latest term with enrollments when not given).
+    """
+    if document_type not in DOCUMENT_TYPES:
+        raise ValueError(f"Unknown transcript type {document_type!r}.")
+    student_id = getattr(student, 'pk', student)
+    profile = Student.objects.filter(pk=student_id).values(
+        'student_id', 'user__first_name', 'user__last_name', 'department__name', 'year_level',
+    ).get()
+    rows = (
+        Enrollment.objects.filter(student_id=student_id)
+        .exclude(status='DROPPED')
+        .order_by('course_offering__semester__start_date', 'course_offering__course__course_code')
+        .values_list(
+            'course_offering__semester_id', 'course_offering__semester__semester_type',
+            'course_offering__semester__academic_year__name', 'course_offering__course__course_code',
+            'course_offering__course__title', 'course_offering__course__units', 'course_offering__section',
+            'grade__final_rating', 'grade__remarks', 'grade__date_submitted',
+        )
+    )
+
+    terms = {}
+    for semester_id, semester_type, year, code, title, units, section, rating, remarks, submitted in rows:
+        term = terms.setdefault(semester_id, {
+            'semester': semester_id, 'name': SEMESTER_NAMES.get(semester_type, semester_type),
+            'academic_year': year, 'courses': [],
+        })
+        term['courses'].append({
+            'course_code': code,
+            'title': title,
+            'units': units,
+            'section': section,
+            'final_rating': rating or '',
+            'remarks': remarks or '',
+            'submitted': submitted.isoformat() if submitted else None,
+        })
+    terms = list(terms.values())
+    if document_type == 'CERT_GRADES':
+        semester_id = getattr(semester, 'pk', semester)
+        terms = [term for term in terms if term['semester'] == semester_id] if semester_id else terms[-1:]
+    for term in terms:
+        term.update(_summary(term['courses']))
+
+    return {
+        'document_type': document_type,
+        'student_id': profile['student_id'],
+        'name': f"{profile['user__last_name']}, {profile['user__first_name']}".strip(', '),
+        'department': profile['department__name'] or '',
+        'year_level': profile['year_level'],
+        'terms': terms,
+        'cumulative': _summary(course for term in terms for course in term['courses']),
+    }
+
+
+def fingerprint(record):
+    payload = json.dumps([LAYOUT_VERSION, record], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_html(record, generated=None):
+    return render_to_string('api/transcript.html', {
+        'record': record,
+        'title': 'Transcript of Records' if record['document_type'] == 'TOR' else 'Certificate of Grades',
+        'generated': generated or timezone.now(),
+    })
+
+
+# Minimal PDF writer: A4 pages of Helvetica text, no external dependencies.
+
+PAGE_WIDTH, PAGE_HEIGHT, MARGIN, LEADING = 595, 842, 50, 14
+
+
+def _pdf_text(value):
+    text = str(value).encode('cp1252', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _pdf_lines(record, generated):
+    """``(font, size, [(x, text), ...])`` lines of the document, top to bottom."""
+    title = 'TRANSCRIPT OF RECORDS' if record['document_type'] == 'TOR' else 'CERTIFICATE OF GRADES'
+    lines = [
+        ('F2', 14, [(MARGIN, title)]),
+        ('F1', 10, [(MARGIN, f"{record['name']}    {record['student_id']}")]),
+        ('F1', 10, [(MARGIN, f"{record['department']}    Year {record['year_level']}")]),
+        ('F1', 10, []),
+    ]
+    columns = (MARGIN, 120, 400, 440, 490)
+    for term in record['terms']:
+        lines.append(('F2', 10, [(MARGIN, f"{term['name']}, A.Y. {term['academic_year']}")]))
+        lines.append(('F2', 9, list(zip(columns, ('Code', 'Descriptive Title', 'Units', 'Grade', 'Remarks')))))
+        for course in term['courses']:
+            cells = (
+                course['course_code'], course['title'][:52], course['units'],
+                course['final_rating'] or '-', course['remarks'][:14],
+            )
+            lines.append(('F1', 9, list(zip(columns, cells))))
+        lines.append(('F1', 9, [
+            (120, f"Units earned {term['units_earned']} of {term['units_attempted']}"),
+            (400, f"GWA {term['gwa'] or '-'}"),
+        ]))
+        lines.append(('F1', 10, []))
+    cumulative = record['cumulative']
+    lines.append(('F2', 10, [
+        (MARGIN, f"Total units earned {cumulative['units_earned']} of {cumulative['units_attempted']}"),
+        (400, f"GWA {cumulative['gwa'] or '-'}"),
+    ]))
+    lines.append(('F1', 8, [(MARGIN, f"Generated {generated:%Y-%m-%d %H:%M}")]))
+    return lines
+
+
+def render_pdf(record, generated=None):
+    generated = generated or timezone.now()
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+    lines = _pdf_lines(record, generated)
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    streams = []
+    for number, page in enumerate(pages, start=1):
+        commands = ['BT']
+        y = PAGE_HEIGHT - MARGIN
+        for font, size, cells in page:
+            for x, text in cells:
+                commands.append(f"/{font} {size} Tf 1 0 0 1 {x} {y} Tm ({_pdf_text(text)}) Tj")
+            y -= LEADING
+        commands.append(f"/F1 8 Tf 1 0 0 1 {PAGE_WIDTH - MARGIN - 40} {MARGIN / 2} Tm (Page {number}/{len(pages)}) Tj")
+        commands.append('ET')
+        streams.append('\n'.join(commands).encode('latin-1'))
+
+    # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a page and a content stream per page.
+    page_ids = [5 + 2 * i for i in range(len(pages))]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>',
+    ]
+    for page_id, stream in zip(page_ids, streams):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+RENDERERS = {'pdf': render_pdf, 'html': render_html}
+
+
+def render(student, document_type='TOR', semester=None, output='pdf'):
+    """
+    Path of the rendered document and its content hash, rendering only on a cache miss.
+    """
+    if output not in FORMATS:
+        raise ValueError(f"Unknown transcript format {output!r}.")
+    record = build(student, document_type, semester)
+    digest = fingerprint(record)
+    scope = document_type
+    if document_type == 'CERT_GRADES' and record['terms']:
+        scope += f"-{record['terms'][0]['semester']}"
+    directory = storage_dir() / str(getattr(student, 'pk', student))
+    path = directory / f'{scope}-{digest[:32]}.{output}'
+    try:
+        # Touching a hit makes it the newest render of the document, which prune always keeps.
+        os.utime(path)
+        return path, digest
+    except FileNotFoundError:
+        pass
+
+    content = RENDERERS[output](record)
+    if isinstance(content, str):
+        content = content.encode()
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+    return path, digest
+
+
+def prune(max_age=None, now=None):
+    """
+    Delete renders superseded for longer than ``max_age`` seconds, plus abandoned temporary files.
+
+    The newest render of each document is always kept. Returns the number of
+    files removed.
+    """
+    max_age = retention() if max_age is None else max_age
+    cutoff = (now or time.time()) - max_age
+    removed = 0
+    renders = defaultdict(list)
+    for file in storage_dir().glob('*/*'):
+        try:
+            modified = file.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if file.suffix == '.tmp':
+            if modified < cutoff:
+                file.unlink(missing_ok=True)
+                removed += 1
+            continue
+        scope = file.stem.rpartition('-')[0]
+        renders[(file.parent, scope, file.suffix)].append((modified, file))
+    for versions in renders.values():
+        versions.sort()
+        # A render is superseded from the moment its successor was written.
+        for (_, file), (replaced_at, _) in zip(versions, versions[1:]):
+            if replaced_at < cutoff:
+                file.unlink(missing_ok=True)
+                removed += 1
+    return removed
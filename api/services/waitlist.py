@@ -0,0 +1,110 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ..exceptions import EnrollmentError, OfferingFull
+from ..models import CourseOffering, Enrollment, Notification, WaitlistEntry
+from . import enrollment as enrollment_service
+from . import search
+
+
+def join(student, offering_id):
+    """Append ``student`` to the offering's waitlist. Only full offerings take a waitlist."""
+    with transaction.atomic():
+        offering = (
+            CourseOffering.objects.select_for_update()
+            .filter(pk=offering_id, is_active=True)
+            .values('max_slots', 'enrolled_count')
+            .first()
+        )
+        if offering is None:
+            raise EnrollmentError("This course offering is not open for enrollment.")
+        if offering['enrolled_count'] < offering['max_slots']:
+            raise EnrollmentError("This course offering still has available slots.")
+        if Enrollment.objects.filter(
+            student=student, course_offering_id=offering_id,
+            status__in=Enrollment.SEAT_HOLDING_STATUSES,
+        ).exists():
+            raise EnrollmentError("The student is already enrolled in this course offering.")
+
+        existing = WaitlistEntry.objects.filter(
+            student=student, course_offering_id=offering_id, status='WAITING',
+        ).first()
+        if existing is not None:
+            return existing
+        last = WaitlistEntry.objects.filter(course_offering_id=offering_id).aggregate(last=Max('position'))['last']
+        try:
+            with transaction.atomic():
+                return WaitlistEntry.objects.create(
+                    student=student, course_offering_id=offering_id, position=(last or 0) + 1,
+                )
+        except IntegrityError:
+            raise EnrollmentError("The waitlist changed while joining; please try again.")
+
+
+def position_of(entry):
+    """1-based rank among the students still waiting; one indexed COUNT."""
+    if entry.status != 'WAITING':
+        return None
+    ahead = WaitlistEntry.objects.filter(
+        course_offering_id=entry.course_offering_id, status='WAITING', position__lt=entry.position,
+    ).count()
+    return ahead + 1
+
+
+def cancel(entry):
+    WaitlistEntry.objects.filter(pk=entry.pk, status='WAITING').update(
+        status='CANCELLED', resolved_at=timezone.now(),
+    )
+
+
+def promote(offering_id, seats=1):
+    """
+    Give up to ``seats`` freed seats to the head of the waitlist.
+
+    Meant to run inside the transaction that freed the seats. Entries that
+    can no longer be enrolled (e.g. a schedule conflict picked up since
+    joining) are cancelled with the reason and the next student is tried.
+    Nobody is promoted, or cancelled, while the offering is inactive.
+    Returns the promoted entries.
+    """
+    promoted = []
+    if not CourseOffering.objects.filter(pk=offering_id, is_active=True).exists():
+        return promoted
+    waiting = (
+        WaitlistEntry.objects.filter(course_offering_id=offering_id, status='WAITING')
+        .select_related('student__user', 'course_offering__course')
+        .order_by('position')
+    )
+    for entry in waiting:
+        if len(promoted) >= seats:
+            break
+        try:
+            with transaction.atomic():
+                enrollment_service.reserve_seat(entry.student, offering_id)
+        except OfferingFull:
+            break
+        except EnrollmentError as exc:
+            entry.status = 'CANCELLED'
+            entry.remarks = str(exc)[:200]
+        else:
+            entry.status = 'PROMOTED'
+            promoted.append(entry)
+        entry.resolved_at = timezone.now()
+        entry.save(update_fields=['status', 'remarks', 'resolved_at'])
+
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient=entry.student.user,
+            notification_type='GENERAL',
+            title="Enrolled from waitlist",
+            message=(
+                f"A slot opened in {entry.course_offering.course.course_code} section "
+                f"{entry.course_offering.section} and you have been enrolled."
+            ),
+        )
+        for entry in promoted
+    ])
+    # bulk_create skips the signal that indexes notifications for search.
+    search.index(Notification, [notification.pk for notification in notifications])
+    return promoted
@@ -0,0 +1,198 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import (
+    AcademicYear, Announcement, Assessment, AssessmentScore, Course, CourseEvaluation, CourseOffering, Enrollment, Event,
+    Feedback, Grade, Notification, Schedule, Semester, Student,
+)
+from .services import (
+    academic_standing, assessment_stats, current_term, grade_distribution, grade_ledger, prerequisites, search,
+    seat_availability, standings,
+)
+from .services.prerequisites import PrerequisiteEdge
+
+
+@receiver(m2m_changed, sender=PrerequisiteEdge)
+def maintain_prerequisite_closure(sender, instance, action, reverse, pk_set, **kwargs):
+    # With reverse=False ``instance`` is the course gaining or losing
+    # prerequisites; with reverse=True it is the prerequisite itself.
+    if action == 'pre_add':
+        if reverse:
+            for course_id in pk_set:
+                prerequisites.check_cycle(course_id, [instance.pk])
+        else:
+            prerequisites.check_cycle(instance.pk, pk_set)
+    elif action == 'post_add':
+        if reverse:
+            for course_id in pk_set:
+                prerequisites.add_edges(course_id, [instance.pk])
+        else:
+            prerequisites.add_edges(instance.pk, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        if not reverse:
+            prerequisites.refresh([instance.pk])
+        elif pk_set:
+            prerequisites.refresh(pk_set)
+        else:
+            prerequisites.refresh(prerequisites.dependents([instance.pk]))
+
+
+# Deleting a course cascades its prerequisite edges without m2m_changed, so
+# courses that required it through others would keep stale closure rows.
+@receiver(pre_delete, sender=Course)
+def remember_prerequisite_dependents(sender, instance, **kwargs):
+    instance._prerequisite_dependents = prerequisites.dependents([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def refresh_prerequisite_closure_on_delete(sender, instance, **kwargs):
+    dependents = getattr(instance, '_prerequisite_dependents', None)
+    if dependents:
+        prerequisites.refresh(dependents)
+
+
+@receiver(post_save, sender=CourseOffering)
+@receiver(post_delete, sender=CourseOffering)
+def invalidate_seat_availability(sender, instance, **kwargs):
+    seat_availability.invalidate(semester_id=instance.semester_id, offering_id=instance.pk)
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def invalidate_catalog_schedules(sender, instance, **kwargs):
+    semester_id = CourseOffering.objects.filter(pk=instance.course_offering_id).values_list('semester_id', flat=True).first()
+    seat_availability.invalidate(semester_id=semester_id)
+
+
+@receiver(post_save, sender=AcademicYear)
+@receiver(post_delete, sender=AcademicYear)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_current_term(sender, **kwargs):
+    current_term.invalidate()
+
+
+_UNKNOWN = object()
+
+
+@receiver(post_save, sender=Grade)
+def update_standing_on_grade_save(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_loaded_values', {}).get('final_rating', _UNKNOWN)
+    if previous is _UNKNOWN:
+        # Saved from an instance that never loaded final_rating; fall back to a recompute.
+        student_id = instance.enrollment.student_id
+        standings.recompute([student_id])
+    else:
+        standings.apply_rating_change(instance.enrollment_id, previous, instance.final_rating)
+
+
+def _origin_model(origin):
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+# Deletions that leave the student's standing rows in place; deleting a
+# student, semester or anything above cascades into the standings instead,
+# so those are left to reconcile_standings.
+_STANDING_SAFE_ORIGINS = (Grade, Enrollment, CourseOffering, Course)
+
+
+@receiver(post_delete, sender=Grade)
+def update_standing_on_grade_delete(sender, instance, origin=None, **kwargs):
+    if _origin_model(origin) in _STANDING_SAFE_ORIGINS:
+        previous = getattr(instance, '_loaded_values', {}).get('final_rating', instance.final_rating)
+        standings.apply_rating_change(instance.enrollment_id, previous, None)
+
+
+@receiver(post_save, sender=AssessmentScore)
+@receiver(post_delete, sender=AssessmentScore)
+def invalidate_assessment_stats_on_score(sender, instance, **kwargs):
+    assessment_stats.invalidate([instance.assessment_id])
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def invalidate_assessment_stats(sender, instance, **kwargs):
+    assessment_stats.invalidate([instance.pk])
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_save, sender=AssessmentScore)
+def record_grade_change(sender, instance, **kwargs):
+    grade_ledger.record(grade_ledger.diff(instance))
+
+
+@receiver(post_delete, sender=Grade)
+@receiver(post_delete, sender=AssessmentScore)
+def record_grade_deletion(sender, instance, **kwargs):
+    # Also for cascades from deleting the enrollment or assessment: the ledger
+    # outlives them.
+    grade_ledger.record(grade_ledger.diff(instance, deleted=True))
+
+
+@receiver(post_save, sender=Grade)
+def update_grade_distribution_on_save(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_loaded_values', {}).get('final_rating', _UNKNOWN)
+    if previous is _UNKNOWN:
+        offering = instance.enrollment.course_offering
+        grade_distribution.refresh([offering.course_id], [offering.semester_id])
+    else:
+        grade_distribution.apply_rating_change(instance.enrollment_id, previous, instance.final_rating)
+
+
+# Deletions that leave the rollup's course, semester and faculty rows in place.
+# Anything above them (a course, semester, faculty member or user) cascades
+# into the rollup itself, so those are left to refresh_grade_distribution.
+_DISTRIBUTION_SAFE_ORIGINS = (Grade, Enrollment, CourseOffering, Student)
+
+
+@receiver(post_delete, sender=Grade)
+def update_grade_distribution_on_delete(sender, instance, origin=None, **kwargs):
+    if _origin_model(origin) in _DISTRIBUTION_SAFE_ORIGINS:
+        previous = getattr(instance, '_loaded_values', {}).get('final_rating', instance.final_rating)
+        grade_distribution.apply_rating_change(instance.enrollment_id, previous, None)
+
+
+@receiver(post_save, sender=CourseOffering)
+def refresh_grade_distribution_for_offering(sender, instance, created, **kwargs):
+    # A new faculty member, course or semester moves the offering's grades between buckets.
+    if created:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    previous = {field: loaded.get(field, _UNKNOWN) for field in instance.TRACKED_FIELDS}
+    if all(previous[field] == getattr(instance, field) for field in instance.TRACKED_FIELDS):
+        return
+    course_ids = {instance.course_id, previous['course_id']} - {_UNKNOWN}
+    semester_ids = {instance.semester_id, previous['semester_id']} - {_UNKNOWN}
+    grade_distribution.refresh(list(course_ids), list(semester_ids))
+
+
+@receiver(post_save, sender=Grade)
+def mark_standing_recheck(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_loaded_values', {}).get('final_rating', _UNKNOWN)
+    if previous != instance.final_rating:
+        academic_standing.mark_enrollment(instance.enrollment_id)
+
+
+@receiver(post_delete, sender=Grade)
+def mark_standing_recheck_on_delete(sender, instance, origin=None, **kwargs):
+    if _origin_model(origin) in _STANDING_SAFE_ORIGINS:
+        academic_standing.mark_enrollment(instance.enrollment_id)
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Notification)
+@receiver(post_save, sender=Feedback)
+@receiver(post_save, sender=CourseEvaluation)
+def index_search_document(sender, instance, **kwargs):
+    search.index(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Announcement)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Notification)
+@receiver(post_delete, sender=Feedback)
+@receiver(post_delete, sender=CourseEvaluation)
+def remove_search_document(sender, instance, **kwargs):
+    search.remove(sender, [instance.pk])
@@ -1,3 +1,1401 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import re
+import tempfile
+import time
+import unittest
+from array import array
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .admin import ApproximateCountPaginator
+from .exceptions import EnrollmentError, GradeImportError, OfferingFull
+from .models import (
+    AcademicYear, Semester, Department, Faculty, Student, Program, Course, CourseOffering,
+    Schedule, Enrollment, Grade, Announcement, Assessment, AssessmentScore, DocumentRequest,
+    Event, EventRegistration, Notification, Feedback, CourseEvaluation, AdmissionTicket,
+    WaitlistEntry, HonorsRanking, GradeChange, GradeDistribution, PrerequisiteClosure, StandingRecheck,
+    StudentTermStanding,
+)
+from .services import (
+    academic_standing, admission, assessment_stats, current_term, eligibility, grade_distribution, grade_import,
+    grade_ledger, grading, honors, rooms, row_counts, score_sheet, seat_availability, standings, timetable,
+    transcripts, waitlist,
+)
+from .services import enrollment as enrollment_service
+
+
+class TermTestCase(TestCase):
+    """Creates an academic year starting today and a first semester open for enrollment."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.year = AcademicYear.objects.create(
+            name='2026-2027', start_date=cls.today, end_date=cls.today + datetime.timedelta(days=365),
+        )
+        cls.semester = Semester.objects.create(
+            academic_year=cls.year, semester_type='1ST', start_date=cls.today,
+            end_date=cls.today + datetime.timedelta(days=120),
+            enrollment_start=cls.today - datetime.timedelta(days=1),
+            enrollment_end=cls.today + datetime.timedelta(days=6),
+        )
+
+
+class EligibilityEvaluatorTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = cls.today
+        cls.past = Semester.objects.create(
+            academic_year=cls.year, semester_type='SUMMER', start_date=today - datetime.timedelta(days=200),
+            end_date=today - datetime.timedelta(days=100), enrollment_start=today - datetime.timedelta(days=210),
+            enrollment_end=today - datetime.timedelta(days=200),
+        )
+        department = Department.objects.create(name='Computer Science', code='CS')
+        user = User.objects.create(username='student')
+        cls.student = Student.objects.create(user=user, student_id='2026-0001', department=department)
+
+        cls.basic = Course.objects.create(course_code='CS100', title='Basics', department=department)
+        passed = Enrollment.objects.create(
+            student=cls.student, status='COMPLETED',
+            course_offering=CourseOffering.objects.create(course=cls.basic, semester=cls.past, section='A'),
+        )
+        Grade.objects.create(enrollment=passed, final_rating='2.00')
+        cls.advanced = Course.objects.create(course_code='CS300', title='Advanced', department=department)
+
+        cls.offerings = []
+        for i in range(50):
+            course = Course.objects.create(course_code=f'CS{i + 101}', title=f'Course {i}', units=1)
+            course.prerequisites.add(cls.basic if i % 2 else cls.advanced)
+            offering = CourseOffering.objects.create(course=course, semester=cls.semester, section='A')
+            Schedule.objects.create(
+                course_offering=offering, day_of_week='MON', room='R1',
+                start_time=datetime.time(7 + i % 12), end_time=datetime.time(8 + i % 12),
+            )
+            cls.offerings.append(offering)
+
+    def test_verdicts_explain_each_rule(self):
+        verdicts = eligibility.evaluate(self.student, [o.pk for o in self.offerings[:2]])
+        self.assertEqual(verdicts[0]['eligible'], False)
+        self.assertEqual(verdicts[0]['reasons'], ["Missing prerequisites: CS300."])
+        self.assertEqual(verdicts[1], {'course_offering': self.offerings[1].pk, 'eligible': True, 'reasons': []})
+
+    def test_query_count_is_independent_of_cart_size(self):
+        with CaptureQueriesContext(connection) as single:
+            eligibility.evaluate(self.student, [self.offerings[0].pk])
+        with self.assertNumQueries(len(single.captured_queries)):
+            verdicts = eligibility.evaluate(self.student, [o.pk for o in self.offerings])
+        self.assertEqual(len(verdicts), 50)
+        # Offerings 13 onwards repeat earlier time slots and clash with them.
+        self.assertIn("Schedule conflicts", verdicts[13]['reasons'][-1])
+
+    def test_students_on_probation_may_enroll(self):
+        Student.objects.filter(pk=self.student.pk).update(status='PROBATION')
+        self.student.refresh_from_db()
+        self.assertEqual(eligibility.evaluate(self.student, [self.offerings[1].pk])[0]['reasons'], [])
+        Student.objects.filter(pk=self.student.pk).update(status='SUSPENDED')
+        self.student.refresh_from_db()
+        self.assertEqual(
+            eligibility.evaluate(self.student, [self.offerings[1].pk])[0]['reasons'], ["Student status is Suspended."],
+        )
+
+
+class SeatReservationTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            max_slots=2,
+        )
+        cls.students = [
+            Student.objects.create(user=User.objects.create(username=f'student{i}'), student_id=f'2026-000{i}')
+            for i in range(3)
+        ]
+
+    def assertSeatsMatchEnrollments(self, expected):
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, expected)
+        seated = self.offering.enrollments.filter(status__in=Enrollment.SEAT_HOLDING_STATUSES)
+        self.assertEqual(seated.count(), expected)
+        self.assertEqual(enrollment_service.recount_enrolled(), 0)
+
+    def test_full_offering_rejects_reservations(self):
+        for student in self.students[:2]:
+            enrollment_service.reserve_seat(student, self.offering.pk)
+        with self.assertRaises(OfferingFull):
+            enrollment_service.reserve_seat(self.students[2], self.offering.pk)
+        self.assertSeatsMatchEnrollments(2)
+        self.assertFalse(Enrollment.objects.filter(student=self.students[2]).exists())
+
+    def test_inactive_offering_is_not_reported_as_full(self):
+        CourseOffering.objects.filter(pk=self.offering.pk).update(is_active=False)
+        with self.assertRaises(EnrollmentError) as raised:
+            enrollment_service.reserve_seat(self.students[0], self.offering.pk)
+        self.assertNotIsInstance(raised.exception, OfferingFull)
+
+    def test_drop_readmit_and_delete_keep_the_count(self):
+        enrollments = [enrollment_service.reserve_seat(student, self.offering.pk) for student in self.students[:2]]
+        enrollment_service.drop_enrollment(enrollments[0])
+        self.assertSeatsMatchEnrollments(1)
+        readmitted = enrollment_service.reserve_seat(self.students[0], self.offering.pk)
+        self.assertEqual(readmitted.pk, enrollments[0].pk)
+        self.assertSeatsMatchEnrollments(2)
+        enrollment_service.delete_enrollments(Enrollment.objects.filter(pk=enrollments[1].pk))
+        self.assertSeatsMatchEnrollments(1)
+
+
+class SeatAvailabilityTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            max_slots=5,
+        )
+        cls.student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+
+    def setUp(self):
+        cache.clear()
+        seat_availability.rebuild(self.semester.pk)
+
+    def available(self):
+        with self.assertNumQueries(0):
+            return seat_availability.catalog(self.semester.pk)[0]['available_slots']
+
+    def test_delta_is_applied_once_the_reservation_commits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment_service.reserve_seat(self.student, self.offering.pk)
+            self.assertEqual(self.available(), 5)
+        self.assertEqual(self.available(), 4)
+
+    def test_rolled_back_reservation_leaves_the_counter(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                enrollment_service.reserve_seat(self.student, self.offering.pk)
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.available(), 5)
+
+
+class CurrentTermTests(TermTestCase):
+    def setUp(self):
+        current_term.invalidate()
+        self.addCleanup(current_term.invalidate)
+        self.semester.is_active = True
+        self.semester.save()
+
+    def test_term_is_cached_for_the_ttl(self):
+        self.assertEqual(current_term.get().semester, self.semester)
+        # update() skips the signals, so only the TTL bounds how long the old term is served.
+        Semester.objects.update(is_active=False)
+        with self.assertNumQueries(0):
+            self.assertEqual(current_term.get().semester, self.semester)
+        expired = current_term.time.monotonic() + current_term.ttl()
+        with mock.patch.object(current_term.time, 'monotonic', return_value=expired):
+            self.assertIsNone(current_term.get().semester)
+
+    def test_activating_another_semester_invalidates_the_cache(self):
+        self.assertEqual(current_term.get().semester, self.semester)
+        second = Semester.objects.create(
+            academic_year=self.year, semester_type='2ND', start_date=self.today + datetime.timedelta(days=150),
+            end_date=self.today + datetime.timedelta(days=270), enrollment_start=self.today,
+            enrollment_end=self.today + datetime.timedelta(days=7), is_active=True,
+        )
+        self.semester.is_active = False
+        self.semester.save()
+        self.assertEqual(current_term.get().semester, second)
+
+
+class CohortEnrollmentTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.department = Department.objects.create(name='Computer Science', code='CS')
+        cls.freshmen = [
+            Student.objects.create(
+                user=User.objects.create(username=f'student{i}'), student_id=f'2026-000{i}',
+                department=cls.department, year_level=1,
+            )
+            for i in range(3)
+        ]
+        Student.objects.create(
+            user=User.objects.create(username='senior'), student_id='2023-0001', department=cls.department, year_level=4,
+        )
+        cls.offerings = [
+            CourseOffering.objects.create(
+                course=Course.objects.create(course_code=f'CS10{i}', title='Course'), semester=cls.semester, section='A',
+                max_slots=3,
+            )
+            for i in range(2)
+        ]
+
+    def test_cohort_fills_block_sections(self):
+        enrollment_service.reserve_seat(self.freshmen[0], self.offerings[0].pk)
+        dropped = enrollment_service.reserve_seat(self.freshmen[1], self.offerings[1].pk)
+        enrollment_service.drop_enrollment(dropped)
+
+        summary = enrollment_service.enroll_cohort(
+            [o.pk for o in self.offerings], department=self.department, year_level=1,
+        )
+        self.assertEqual(summary, {
+            self.offerings[0].pk: {'enrolled': 2, 'skipped': 1},
+            self.offerings[1].pk: {'enrolled': 3, 'skipped': 0},
+        })
+        for offering in self.offerings:
+            offering.refresh_from_db()
+            self.assertEqual(offering.enrolled_count, 3)
+            self.assertEqual(offering.enrollments.filter(status='ENROLLED').count(), 3)
+
+    def test_capacity_is_checked_for_the_whole_cohort(self):
+        CourseOffering.objects.filter(pk=self.offerings[1].pk).update(max_slots=2)
+        with self.assertRaises(OfferingFull):
+            enrollment_service.enroll_cohort([o.pk for o in self.offerings], department=self.department)
+        self.assertFalse(Enrollment.objects.exists())
+
+
+class TimetableIndexTests(SimpleTestCase):
+    def setUp(self):
+        t = datetime.time
+        self.index = timetable.TimetableIndex([
+            (1, 'MON', t(8), t(12)),
+            (2, 'MON', t(9), t(10)),
+            (3, 'MON', t(13), t(14, 30)),
+            (4, 'TUE', t(8), t(9)),
+        ])
+
+    def test_overlapping_meetings(self):
+        t = datetime.time
+        self.assertEqual(sorted(self.index.overlapping('MON', t(9, 30), t(11))), [1, 2])
+        # Meeting 1 ends last but starts first, so only the running maximum of end times finds it.
+        self.assertEqual(self.index.overlapping('MON', t(11), t(13)), [1])
+        self.assertTrue(self.index.has_overlap('MON', t(14), t(15)))
+
+    def test_adjacent_meetings_do_not_overlap(self):
+        t = datetime.time
+        self.assertEqual(self.index.overlapping('MON', t(12), t(13)), [])
+        self.assertFalse(self.index.has_overlap('MON', t(14, 30), t(16)))
+        self.assertFalse(self.index.has_overlap('TUE', t(9), t(10)))
+
+    def test_other_days_do_not_overlap(self):
+        t = datetime.time
+        self.assertEqual(self.index.overlapping('WED', t(8), t(12)), [])
+        self.assertEqual(self.index.overlapping('TUE', t(8), t(12)), [4])
+
+
+class TimetableConflictTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+        cls.offerings = []
+        for i, (day, hour) in enumerate([('MON', 8), ('MON', 9), ('TUE', 8), ('MON', 8), ('TUE', 8)]):
+            offering = CourseOffering.objects.create(
+                course=Course.objects.create(course_code=f'CS10{i}', title='Course'), semester=cls.semester, section='A',
+            )
+            Schedule.objects.create(
+                course_offering=offering, day_of_week=day, room='R1',
+                start_time=datetime.time(hour), end_time=datetime.time(hour + 1),
+            )
+            cls.offerings.append(offering)
+        enrollment_service.reserve_seat(cls.student, cls.offerings[0].pk)
+
+    def test_cart_is_checked_against_enrolled_sections_and_itself(self):
+        first, adjacent, tuesday, clashing, double_booked = (o.pk for o in self.offerings)
+        self.assertEqual(timetable.find_conflicts(self.student, [adjacent, tuesday, clashing, double_booked]), {
+            adjacent: [],
+            tuesday: [double_booked],
+            clashing: [first],
+            double_booked: [tuesday],
+        })
+
+
+class PrerequisiteClosureTests(TestCase):
+    def setUp(self):
+        self.a, self.b, self.c = (
+            Course.objects.create(course_code=code, title=code) for code in ('CS300', 'CS200', 'CS100')
+        )
+        self.a.prerequisites.add(self.b)
+        self.b.prerequisites.add(self.c)
+
+    def closure(self):
+        return set(PrerequisiteClosure.objects.values_list('course__course_code', 'prerequisite__course_code'))
+
+    def test_closure_follows_edges(self):
+        self.assertEqual(self.closure(), {('CS300', 'CS200'), ('CS300', 'CS100'), ('CS200', 'CS100')})
+        self.b.prerequisites.remove(self.c)
+        self.assertEqual(self.closure(), {('CS300', 'CS200')})
+
+    def test_deleting_a_course_drops_paths_through_it(self):
+        self.b.delete()
+        self.assertEqual(self.closure(), set())
+
+
+class StandingsTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        department = Department.objects.create(name='Computer Science', code='CS')
+        cls.student = Student.objects.create(
+            user=User.objects.create(username='student'), student_id='2026-0001', department=department,
+        )
+        cls.enrollments = [
+            Enrollment.objects.create(
+                student=cls.student,
+                course_offering=CourseOffering.objects.create(
+                    course=Course.objects.create(course_code=f'CS10{units}', title='Course', units=units),
+                    semester=cls.semester, section='A',
+                ),
+            )
+            for units in (3, 1)
+        ]
+
+    def test_gwa_is_weighted_by_units(self):
+        Grade.objects.create(enrollment=self.enrollments[0], final_rating='1.00')
+        Grade.objects.create(enrollment=self.enrollments[1], final_rating='2.00')
+        for semester in (self.semester, None):
+            standing = StudentTermStanding.objects.get(student=self.student, semester=semester)
+            self.assertEqual(standing.units_attempted, 4)
+            self.assertEqual(standing.gwa, Decimal('1.2500'))
+        self.assertEqual(standings.reconcile([self.student.pk]), [])
+
+    def test_reconcile_catches_a_stale_gwa(self):
+        Grade.objects.create(enrollment=self.enrollments[0], final_rating='1.00')
+        StudentTermStanding.objects.filter(semester=None).update(gwa=Decimal('3.0000'))
+        self.assertEqual(standings.reconcile([self.student.pk], fix=True), [(self.student.pk, None)])
+        self.assertEqual(StudentTermStanding.objects.get(semester=None).gwa, Decimal('1.0000'))
+
+
+class HonorsTests(TermTestCase):
+    # Three-unit courses per student: a and b tie on GWA with different loads,
+    # d has a rating below the dean's list floor, e an INC and f a failure.
+    RATINGS = {
+        'a': ['1.00'] * 5,
+        'b': ['1.00'] * 4,
+        'c': ['1.25'] * 5,
+        'd': ['1.00'] * 4 + ['2.75'],
+        'e': ['1.50'] * 5 + ['INC'],
+        'f': ['1.00'] * 5 + ['5.00'],
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        department = Department.objects.create(name='Computer Science', code='CS')
+        offerings = [
+            CourseOffering.objects.create(
+                course=Course.objects.create(course_code=f'CS10{i}', title='Course', units=3),
+                semester=cls.semester, section='A',
+            )
+            for i in range(6)
+        ]
+        cls.students = {}
+        for name, ratings in cls.RATINGS.items():
+            student = Student.objects.create(
+                user=User.objects.create(username=name), student_id=f'2026-000{name}', department=department,
+            )
+            for offering, rating in zip(offerings, ratings):
+                enrollment = Enrollment.objects.create(student=student, course_offering=offering)
+                Grade.objects.create(enrollment=enrollment, final_rating=rating)
+            cls.students[student.pk] = name
+
+    def rankings(self, tie_break='shared', field='rank'):
+        honors.compute(self.semester, tie_break)
+        return {
+            self.students[student_id]: value
+            for student_id, value in HonorsRanking.objects.values_list('student_id', field)
+        }
+
+    def test_shared_ties_skip_the_next_rank(self):
+        self.assertEqual(self.rankings(), {'a': 1, 'b': 1, 'c': 3, 'd': 4, 'e': 5, 'f': 6})
+        self.assertEqual(self.rankings(field='gwa')['d'], Decimal('1.3500'))
+
+    def test_dense_ties_leave_no_gap(self):
+        self.assertEqual(self.rankings('dense'), {'a': 1, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5})
+
+    def test_units_break_ties_in_favour_of_the_heavier_load(self):
+        self.assertEqual(self.rankings('units'), {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6})
+
+    def test_deans_list_cutoffs(self):
+        # b is under the unit load, d has a 2.75, e an INC and f a 5.00.
+        self.assertEqual(
+            self.rankings(field='deans_list'),
+            {'a': True, 'b': False, 'c': True, 'd': False, 'e': False, 'f': False},
+        )
+        with self.settings(PORTAL_HONORS_POLICY={'deans_list_min_units': 12, 'deans_list_worst_rating': '2.75'}):
+            listed = self.rankings(field='deans_list')
+        self.assertEqual({name for name, on_list in listed.items() if on_list}, {'a', 'b', 'c', 'd'})
+
+    def test_latin_honors_need_a_clean_record(self):
+        self.assertEqual(
+            self.rankings(field='latin_honor'),
+            {'a': 'SUMMA', 'b': 'SUMMA', 'c': 'MAGNA', 'd': 'MAGNA', 'e': 'CUM', 'f': ''},
+        )
+        thresholds = honors.DEFAULT_POLICY['latin_honors']
+        self.assertEqual(honors.latin_honor(Decimal('1.20'), 0, thresholds), 'SUMMA')
+        self.assertEqual(honors.latin_honor(Decimal('1.2001'), 0, thresholds), 'MAGNA')
+        self.assertEqual(honors.latin_honor(Decimal('1.7501'), 0, thresholds), '')
+        self.assertEqual(honors.latin_honor(None, 0, thresholds), '')
+
+
+class GradeDistributionTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        department = Department.objects.create(name='Computer Science', code='CS')
+        cls.faculty, cls.other = [
+            Faculty.objects.create(
+                user=User.objects.create(username=name, first_name=name.title()), department=department,
+                employee_id=name,
+            )
+            for name in ('ana', 'ben')
+        ]
+        cls.course = Course.objects.create(course_code='CS101', title='Course')
+        cls.offering = CourseOffering.objects.create(
+            course=cls.course, semester=cls.semester, section='A', faculty=cls.faculty,
+        )
+        cls.enrollments = [
+            Enrollment.objects.create(
+                student=Student.objects.create(user=User.objects.create(username=f'student{i}'), student_id=f'2026-{i}'),
+                course_offering=cls.offering,
+            )
+            for i in range(3)
+        ]
+
+    def counts(self):
+        return {
+            (faculty_id, rating): count for faculty_id, rating, count in GradeDistribution.objects.filter(
+                course=self.course, count__gt=0,
+            ).values_list('faculty_id', 'final_rating', 'count')
+        }
+
+    def test_counts_follow_grade_changes(self):
+        grades = [
+            Grade.objects.create(enrollment=enrollment, final_rating=rating)
+            for enrollment, rating in zip(self.enrollments, ('1.50', '1.50', '5.00'))
+        ]
+        self.assertEqual(self.counts(), {(self.faculty.pk, '1.50'): 2, (self.faculty.pk, '5.00'): 1})
+        grades[2].final_rating = '3.00'
+        grades[2].save()
+        self.assertEqual(self.counts(), {(self.faculty.pk, '1.50'): 2, (self.faculty.pk, '3.00'): 1})
+        grades[0].delete()
+        self.assertEqual(self.counts(), {(self.faculty.pk, '1.50'): 1, (self.faculty.pk, '3.00'): 1})
+        self.assertEqual(grade_distribution.refresh(), 0)
+
+    def test_counts_move_with_the_faculty_member(self):
+        for enrollment in self.enrollments:
+            Grade.objects.create(enrollment=enrollment, final_rating='2.00')
+        offering = CourseOffering.objects.get(pk=self.offering.pk)
+        offering.faculty = self.other
+        offering.save()
+        self.assertEqual(self.counts(), {(self.other.pk, '2.00'): 3})
+        [group] = grade_distribution.distribution(self.course.pk, 'faculty')
+        self.assertEqual(
+            (group['faculty'], group['label'], group['total'], group['pass_rate'], group['mean_rating']),
+            (self.other.pk, 'Ben', 3, 100.0, Decimal('2.00')),
+        )
+
+    def test_bulk_deltas_are_netted_per_bucket(self):
+        bucket = (self.course.pk, self.semester.pk, self.faculty.pk)
+        grade_distribution.apply_deltas([
+            (*bucket, '', '1.00'), (*bucket, '', '1.00'), (*bucket, '1.00', '2.00'), (*bucket, '2.00', '2.00'),
+        ])
+        self.assertEqual(self.counts(), {(self.faculty.pk, '1.00'): 1, (self.faculty.pk, '2.00'): 1})
+
+
+class AcademicStandingTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.earlier = Semester.objects.create(
+            academic_year=cls.year, semester_type='SUMMER', start_date=cls.today - datetime.timedelta(days=200),
+            end_date=cls.today - datetime.timedelta(days=100), enrollment_start=cls.today - datetime.timedelta(days=210),
+            enrollment_end=cls.today - datetime.timedelta(days=200),
+        )
+        cls.student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+        cls.enrollments = {
+            (semester.pk, i): Enrollment.objects.create(
+                student=cls.student,
+                course_offering=CourseOffering.objects.create(
+                    course=Course.objects.create(course_code=f'CS{semester.pk}{i}', title='Course', units=3),
+                    semester=semester, section='A',
+                ),
+            )
+            for semester in (cls.earlier, cls.semester) for i in range(2)
+        }
+
+    def grade(self, semester, *ratings):
+        for i, rating in enumerate(ratings):
+            Grade.objects.create(enrollment=self.enrollments[semester.pk, i], final_rating=rating)
+
+    def term(self, gwa, failed_units=0, failures=0):
+        gwa = Decimal(gwa)
+        return {'name': 'Term', 'gwa': gwa, 'cumulative_gwa': gwa, 'failed_units': failed_units, 'failures': failures}
+
+    def test_term_history_is_chronological_with_a_running_gwa(self):
+        self.grade(self.semester, '2.00', 'INC')
+        self.grade(self.earlier, '1.00', '5.00')
+        history = academic_standing.term_history([self.student.pk])[self.student.pk]
+        self.assertEqual([term['semester'] for term in history], [self.earlier.pk, self.semester.pk])
+        self.assertEqual(
+            [(term['attempted'], term['failed_units'], term['failures'], term['gwa']) for term in history],
+            [(6, 3, 1, Decimal('3.00')), (3, 0, 0, Decimal('2.00'))],
+        )
+        self.assertEqual(history[1]['cumulative_gwa'], Decimal(24) / 9)
+
+    def test_suspension_needs_consecutive_bad_terms(self):
+        good, bad = self.term('1.50'), self.term('3.50')
+        self.assertEqual(academic_standing.evaluate([good, bad])[0], 'PROBATION')
+        self.assertEqual(academic_standing.evaluate([bad, bad])[0], 'SUSPENDED')
+        self.assertEqual(academic_standing.evaluate([bad, good]), ('ACTIVE', []))
+        self.assertEqual(academic_standing.evaluate([]), ('ACTIVE', []))
+
+    def test_probation_reasons_name_every_threshold_crossed(self):
+        status, reasons = academic_standing.evaluate([self.term('2.50', failed_units=6, failures=2)])
+        self.assertEqual(status, 'PROBATION')
+        self.assertEqual(reasons, ["Term: 6 units failed; 2 failing grades"])
+
+    def test_run_places_a_failing_student_on_probation(self):
+        self.grade(self.semester, '5.00', '5.00')
+        self.assertEqual(academic_standing.run(), {'evaluated': 1, 'changes': {('ACTIVE', 'PROBATION'): 1}})
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.status, 'PROBATION')
+        notification = Notification.objects.get(recipient=self.student.user)
+        self.assertEqual(notification.title, "Placed on academic probation")
+        self.assertIn("6 units failed", notification.message)
+        self.assertFalse(StandingRecheck.objects.exists())
+
+    def test_run_lifts_probation(self):
+        Student.objects.filter(pk=self.student.pk).update(status='PROBATION')
+        self.grade(self.semester, '1.00')
+        self.assertEqual(academic_standing.run()['changes'], {('PROBATION', 'ACTIVE'): 1})
+        self.assertEqual(Student.objects.get(pk=self.student.pk).status, 'ACTIVE')
+        self.assertEqual(Notification.objects.get().title, "Academic probation lifted")
+
+    def test_run_keeps_a_status_changed_during_evaluation(self):
+        self.grade(self.semester, '5.00', '5.00')
+        history = academic_standing.term_history
+
+        def registrar_steps_in(student_ids):
+            Student.objects.filter(pk=self.student.pk).update(status='LOA')
+            return history(student_ids)
+
+        with mock.patch.object(academic_standing, 'term_history', registrar_steps_in):
+            self.assertEqual(academic_standing.run(), {'evaluated': 1, 'changes': {}})
+        self.assertEqual(Student.objects.get(pk=self.student.pk).status, 'LOA')
+        self.assertFalse(Notification.objects.exists())
+
+
+class AdmissionQueueTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            max_slots=1,
+        )
+        cls.students = [
+            Student.objects.create(user=User.objects.create(username=f'student{i}'), student_id=f'2026-000{i}')
+            for i in range(2)
+        ]
+
+    def test_tickets_are_admitted_in_arrival_order(self):
+        tickets = [admission.submit_ticket(student, self.offering.pk) for student in self.students]
+        self.assertEqual(admission.drain(), 2)
+        statuses = list(AdmissionTicket.objects.order_by('id').values_list('status', flat=True))
+        self.assertEqual(statuses, ['ADMITTED', 'REJECTED'])
+        # A worker holding a stale copy of a processed ticket leaves it alone.
+        self.assertIsNone(admission.process_ticket(tickets[0]))
+        tickets[0].refresh_from_db()
+        self.assertEqual(tickets[0].status, 'ADMITTED')
+        self.assertEqual(Enrollment.objects.get().student, self.students[0])
+
+    def test_ineligible_students_cannot_queue(self):
+        Student.objects.filter(pk=self.students[0].pk).update(status='SUSPENDED')
+        self.students[0].refresh_from_db()
+        with self.assertRaisesMessage(EnrollmentError, "Student status is Suspended."):
+            admission.submit_ticket(self.students[0], self.offering.pk)
+        self.assertFalse(AdmissionTicket.objects.exists())
+
+    def test_eligibility_is_checked_again_when_the_ticket_is_processed(self):
+        self.offering.course.prerequisites.add(Course.objects.create(course_code='CS100', title='Basics'))
+        ticket = AdmissionTicket.objects.create(student=self.students[0], course_offering=self.offering)
+        self.assertEqual(admission.drain(), 1)
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.status, ticket.reason), ('REJECTED', "Missing prerequisites: CS100."))
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 0)
+
+
+class WaitlistPromotionTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            max_slots=1,
+        )
+        cls.seated, cls.waiting = [
+            Student.objects.create(user=User.objects.create(username=f'student{i}'), student_id=f'2026-000{i}')
+            for i in range(2)
+        ]
+        cls.enrollment = enrollment_service.reserve_seat(cls.seated, cls.offering.pk)
+        cls.entry = waitlist.join(cls.waiting, cls.offering.pk)
+
+    def test_dropping_promotes_the_head_of_the_waitlist(self):
+        enrollment_service.drop_enrollment(self.enrollment)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.status, 'PROMOTED')
+        self.assertTrue(Enrollment.objects.filter(student=self.waiting, status='ENROLLED').exists())
+        self.assertTrue(Notification.objects.filter(recipient=self.waiting.user).exists())
+
+    def test_inactive_offering_keeps_its_waitlist(self):
+        CourseOffering.objects.filter(pk=self.offering.pk).update(is_active=False)
+        enrollment_service.drop_enrollment(self.enrollment)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.status, 'WAITING')
+
+
+class ScoreSheetTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = cls.today
+        department = Department.objects.create(name='Computer Science', code='CS')
+        faculty = Faculty.objects.create(
+            user=User.objects.create(username='faculty'), department=department, employee_id='F001',
+        )
+        offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            faculty=faculty,
+        )
+        student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+        cls.enrollment = Enrollment.objects.create(student=student, course_offering=offering)
+        cls.assessment = Assessment.objects.create(
+            course_offering=offering, title='Quiz', assessment_type='QUIZ', max_score=50, weight=10, date_given=today,
+        )
+        cls.url = reverse('score_sheet', args=[offering.pk])
+        cls.faculty_user = faculty.user
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty_user)
+
+    def edit(self, score, **data):
+        edits = [{'assessment': self.assessment.pk, 'enrollment': self.enrollment.pk, 'score': score}]
+        return self.client.patch(self.url, {'edits': edits, **data}, format='json')
+
+    def test_scores_are_saved(self):
+        response = self.edit('42.5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AssessmentScore.objects.get().score, Decimal('42.50'))
+
+    def test_non_finite_scores_are_cell_errors(self):
+        for score in ('NaN', 'Infinity', '60'):
+            with self.subTest(score=score):
+                response = self.edit(score)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['errors'][0]['edit'], 0)
+        self.assertFalse(AssessmentScore.objects.exists())
+
+    def test_malformed_version_is_rejected(self):
+        response = self.edit('10', version='yesterday')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('version', response.data)
+
+    def test_filled_cells_need_a_version(self):
+        self.assertEqual(self.edit('10').status_code, 200)
+        response = self.edit('20')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['conflicts'][0]['score'], Decimal('10.00'))
+        version = self.client.get(self.url).data['version']
+        self.assertEqual(self.edit('20', version=version).status_code, 200)
+        self.assertEqual(AssessmentScore.objects.get().score, Decimal('20.00'))
+
+    def test_stale_edit_of_a_cleared_cell_conflicts(self):
+        version = self.edit('10').data['version']
+        self.assertEqual(self.edit(None, version=version).data['cleared'], 1)
+        response = self.edit('30', version=version)
+        self.assertEqual(response.status_code, 409)
+        self.assertIsNone(response.data['conflicts'][0]['score'])
+        self.assertFalse(AssessmentScore.objects.exists())
+
+    def test_cleared_cells_are_reported_as_changes(self):
+        other = Assessment.objects.create(
+            course_offering=self.assessment.course_offering, title='Quiz 2', assessment_type='QUIZ', max_score=50,
+            weight=10, date_given=self.today,
+        )
+        version = self.edit('10').data['version']
+        self.edit(None, version=version)
+        edits = [{'assessment': other.pk, 'enrollment': self.enrollment.pk, 'score': '5'}]
+        response = self.client.patch(self.url, {'edits': edits, 'version': version}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(cell['assessment_id'], cell['score']) for cell in response.data['changes']], [(self.assessment.pk, None)],
+        )
+
+
+class AssessmentStatsTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+        )
+        cls.assessment = Assessment.objects.create(
+            course_offering=offering, title='Quiz', assessment_type='QUIZ', max_score=50, weight=10,
+            date_given=cls.today,
+        )
+        cls.enrollments = [
+            Enrollment.objects.create(
+                student=Student.objects.create(user=User.objects.create(username=f'student{i}'), student_id=f'2026-{i}'),
+                course_offering=offering,
+            )
+            for i in range(6)
+        ]
+        # The last student has no score yet.
+        for enrollment, score in zip(cls.enrollments, (10, 20, 30, 40, 50)):
+            AssessmentScore.objects.create(assessment=cls.assessment, enrollment=enrollment, score=score)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_statistics_of_the_scores(self):
+        stats = assessment_stats.for_assessment(self.assessment)
+        self.assertEqual(
+            {key: stats[key] for key in ('count', 'missing', 'mean', 'mean_percentage', 'median', 'stdev')},
+            {'count': 5, 'missing': 1, 'mean': 30.0, 'mean_percentage': 60.0, 'median': 30.0, 'stdev': 14.1421},
+        )
+        self.assertEqual((stats['min'], stats['max']), (10.0, 50.0))
+        self.assertEqual(stats['percentiles'], {'p10': 14.0, 'p25': 20.0, 'p50': 30.0, 'p75': 40.0, 'p90': 46.0})
+        # Scores land in the bin of their percentage; a perfect score stays in the last one.
+        self.assertEqual([bin['count'] for bin in stats['histogram']], [0, 0, 1, 0, 1, 0, 1, 0, 1, 1])
+        self.assertEqual(sorted(score['z_score'] for score in stats['scores']), [-1.4142, -0.7071, 0.0, 0.7071, 1.4142])
+
+    def test_identical_scores_have_no_z_score(self):
+        stats = assessment_stats.describe((1, 'Quiz', 10.0), 2, array('q', [1, 2]), array('d', [7, 7]))
+        self.assertEqual((stats['stdev'], [s['z_score'] for s in stats['scores']]), (0.0, [None, None]))
+        empty = assessment_stats.describe((1, 'Quiz', 10.0), 2, array('q'), array('d'))
+        self.assertEqual((empty['mean'], empty['median'], empty['missing']), (None, None, 2))
+
+    def test_cached_until_a_score_changes(self):
+        assessment_stats.for_assessment(self.assessment)
+        with self.assertNumQueries(0):
+            assessment_stats.for_assessment(self.assessment)
+        with self.captureOnCommitCallbacks(execute=True):
+            AssessmentScore.objects.create(assessment=self.assessment, enrollment=self.enrollments[5], score=30)
+        self.assertEqual(assessment_stats.for_assessment(self.assessment)['missing'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            score_sheet.apply_edits(
+                self.assessment.course_offering_id,
+                [{'assessment': self.assessment.pk, 'enrollment': self.enrollments[0].pk, 'score': None}],
+                version=timezone.now(),
+            )
+        self.assertEqual(assessment_stats.for_assessment(self.assessment)['count'], 5)
+
+
+class GradeLedgerTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+        )
+        cls.student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+        cls.enrollment = Enrollment.objects.create(student=cls.student, course_offering=cls.offering)
+        Enrollment.objects.filter(pk=cls.enrollment.pk).update(date_enrolled=cls.today - datetime.timedelta(days=10))
+        cls.assessment = Assessment.objects.create(
+            course_offering=cls.offering, title='Quiz', assessment_type='QUIZ', max_score=50, weight=10,
+            date_given=cls.today,
+        )
+        cls.registrar = User.objects.create(username='registrar', is_staff=True)
+
+    def at(self, days_ago):
+        return mock.patch('django.utils.timezone.now', return_value=self.now - datetime.timedelta(days=days_ago))
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def test_writes_are_recorded_with_actor_and_owner(self):
+        with grade_ledger.acting_as(self.registrar):
+            grade = Grade.objects.create(enrollment=self.enrollment, final_rating='2.00')
+            grade.final_rating = '1.75'
+            grade.save()
+        self.assertEqual(
+            list(GradeChange.objects.values_list(
+                'field', 'old_value', 'new_value', 'actor_id', 'student_id', 'course_offering_id',
+            )),
+            [
+                ('final_rating', None, '2.00', self.registrar.pk, self.student.pk, self.offering.pk),
+                ('final_rating', '2.00', '1.75', self.registrar.pk, self.student.pk, self.offering.pk),
+            ],
+        )
+
+    def test_ledger_rows_cannot_be_changed_or_deleted(self):
+        Grade.objects.create(enrollment=self.enrollment, final_rating='2.00')
+        entry = GradeChange.objects.get()
+        for attempt in (
+            entry.save, entry.delete, GradeChange.objects.all().delete,
+            lambda: GradeChange.objects.update(new_value='1.00'),
+            lambda: GradeChange.objects.bulk_update([entry], ['new_value']),
+        ):
+            with self.assertRaises(ValidationError), transaction.atomic():
+                attempt()
+        self.assertEqual(GradeChange.objects.get().new_value, '2.00')
+
+    def test_history_outlives_the_enrollment(self):
+        Grade.objects.create(enrollment=self.enrollment, final_rating='2.00')
+        AssessmentScore.objects.create(assessment=self.assessment, enrollment=self.enrollment, score=40)
+        self.enrollment.delete()
+        self.assertEqual(
+            sorted(GradeChange.objects.filter(student=self.student).values_list('field', 'old_value', 'new_value'),
+                   key=str),
+            [('final_rating', '2.00', None), ('final_rating', None, '2.00'), ('score', '40.00', None),
+             ('score', None, '40.00')],
+        )
+
+    def test_grades_as_of_undoes_later_changes(self):
+        with self.at(3):
+            grade = Grade.objects.create(enrollment=self.enrollment, final_rating='2.00')
+            score = AssessmentScore.objects.create(assessment=self.assessment, enrollment=self.enrollment, score=40)
+        with self.at(2):
+            grade.final_rating = '1.50'
+            grade.save()
+            score.delete()
+        with self.at(1):
+            AssessmentScore.objects.create(assessment=self.assessment, enrollment=self.enrollment, score=30)
+
+        def as_of(days_ago):
+            [row] = grade_ledger.grades_as_of(self.student, self.now - datetime.timedelta(days=days_ago, hours=12))
+            return row['final_rating'], row['scores']
+
+        self.assertEqual(as_of(3), (None, {}))
+        self.assertEqual(as_of(2), ('2.00', {self.assessment.pk: '40.00'}))
+        self.assertEqual(as_of(1), ('1.50', {}))
+        self.assertEqual(as_of(0), ('1.50', {self.assessment.pk: '30.00'}))
+
+
+class TranscriptTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.student = Student.objects.create(
+            user=User.objects.create(username='student', first_name='Ana', last_name='Cruz'), student_id='2026-0001',
+        )
+        cls.enrollment = Enrollment.objects.create(
+            student=cls.student, status='COMPLETED',
+            course_offering=CourseOffering.objects.create(
+                course=Course.objects.create(course_code='CS101', title='Programming (Part 1)', units=3),
+                semester=cls.semester, section='A',
+            ),
+        )
+        cls.grade = Grade.objects.create(enrollment=cls.enrollment, final_rating='1.50')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = self.settings(PORTAL_TRANSCRIPT_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_pdf_cross_references_point_at_their_objects(self):
+        pdf = transcripts.render_pdf(transcripts.build(self.student), generated=timezone.now())
+        self.assertTrue(pdf.startswith(b'%PDF-1.4\n') and pdf.endswith(b'%%EOF\n'))
+        xref = int(pdf.rsplit(b'startxref\n', 1)[1].split()[0])
+        table = pdf[xref:].split(b'trailer')[0].splitlines()
+        self.assertEqual(table[0], b'xref')
+        for number, entry in enumerate(table[3:], start=1):
+            offset = int(entry.split()[0])
+            self.assertTrue(pdf[offset:].startswith(b'%d 0 obj' % number))
+        self.assertIn(b'(Programming \\(Part 1\\)) Tj', pdf)
+
+    def test_long_records_span_pages(self):
+        record = transcripts.build(self.student)
+        record['terms'][0]['courses'] *= 100
+        pdf = transcripts.render_pdf(record, generated=timezone.now())
+        self.assertIn(b'/Count 3 ', pdf)
+        self.assertIn(b'(Page 3/3) Tj', pdf)
+
+    def test_renders_are_reused_until_the_record_changes(self):
+        path, digest = transcripts.render(self.student)
+        with mock.patch.dict(transcripts.RENDERERS, pdf=mock.Mock(side_effect=AssertionError("rendered again"))):
+            self.assertEqual(transcripts.render(self.student), (path, digest))
+        self.grade.final_rating = '1.25'
+        self.grade.save()
+        changed, _ = transcripts.render(self.student)
+        self.assertNotEqual(changed, path)
+        # The superseded render stays until the sweep, for responses still reading it.
+        self.assertTrue(path.exists() and changed.exists())
+
+    def test_prune_removes_only_renders_superseded_long_ago(self):
+        old, _ = transcripts.render(self.student)
+        self.grade.final_rating = '1.25'
+        self.grade.save()
+        new, _ = transcripts.render(self.student)
+        abandoned = old.parent / 'abandoned.tmp'
+        abandoned.write_bytes(b'')
+        now = time.time()
+        os.utime(old, (now - 7200, now - 7200))
+        os.utime(abandoned, (now - 7200, now - 7200))
+        self.assertEqual(transcripts.prune(max_age=3600, now=now), 1)
+        # The old render was only superseded just now, so only the temporary file goes.
+        self.assertEqual((old.exists(), new.exists(), abandoned.exists()), (True, True, False))
+        os.utime(new, (now - 5000, now - 5000))
+        self.assertEqual(transcripts.prune(max_age=3600, now=now), 1)
+        self.assertEqual((old.exists(), new.exists()), (False, True))
+
+
+class GradeImportTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        student = Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001')
+        cls.enrollment = Enrollment.objects.create(
+            student=student,
+            course_offering=CourseOffering.objects.create(
+                course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+            ),
+        )
+
+    def record(self, **values):
+        return {'student_id': '2026-0001', 'course_code': 'cs101', 'section': 'a', 'final_rating': '1.50', **values}
+
+    def test_rows_are_matched_to_the_roster(self):
+        summary = grade_import.import_grades([(2, self.record(midterm_grade='1.75'))], self.semester)
+        self.assertEqual(summary, {'created': 1, 'updated': 0, 'errors': []})
+        grade = Grade.objects.get(enrollment=self.enrollment)
+        self.assertEqual((grade.final_rating, grade.midterm_grade), ('1.50', Decimal('1.75')))
+
+    def test_non_finite_grades_are_row_errors(self):
+        records = [(2, self.record(midterm_grade='NaN')), (3, self.record(final_grade='-Infinity'))]
+        summary = grade_import.import_grades(records, self.semester)
+        self.assertEqual([error['row'] for error in summary['errors']], [2, 3])
+        self.assertFalse(Grade.objects.exists())
+
+    def test_course_codes_match_whatever_their_case(self):
+        Course.objects.filter(course_code='CS101').update(course_code='cs101')
+        summary = grade_import.import_grades([(2, self.record(course_code='CS101'))], self.semester)
+        self.assertEqual(summary, {'created': 1, 'updated': 0, 'errors': []})
+
+    def test_unreadable_rows_are_import_errors(self):
+        sheet = b'student_id,course_code,section,final_rating\n2026-0001,CS101,A,1.50\n2026-0002,CS\xff101,A,1.50\n'
+        records = grade_import.read_sheet(io.BytesIO(sheet), 'grades.csv')
+        with self.assertRaises(GradeImportError):
+            grade_import.import_grades(records, self.semester)
+        self.assertFalse(Grade.objects.exists())
+
+    def test_upload_that_cannot_be_decoded_is_a_bad_request(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='registrar', is_staff=True))
+        for content in [
+            b'student_id,course_code,section,final_rating\n\xff\xfe,CS101,A,1.50\n',
+            # Longer than csv.field_size_limit().
+            b'student_id,course_code,section,final_rating\n' + b'x' * 200_000 + b',CS101,A,1.50\n',
+        ]:
+            with self.subTest(content=content[:60]):
+                response = client.post(
+                    reverse('grade_import'),
+                    {'file': SimpleUploadedFile('grades.csv', content), 'semester': self.semester.pk},
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('could not be read', str(response.data['file']))
+
+
+class SearchTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+        cls.staff = User.objects.create(username='registrar', is_staff=True)
+        cls.event = Event.objects.create(
+            title='Orientation', description='Welcome week', event_type='ACADEMIC', start_datetime=now,
+            end_datetime=now, venue='Hall', organizer=cls.staff, is_published=True,
+        )
+        offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+        )
+        cls.evaluations = []
+        for i, anonymous in enumerate((True, False)):
+            student = Student.objects.create(
+                user=User.objects.create(username=f'student{i}'), student_id=f'2026-000{i}',
+            )
+            cls.evaluations.append(CourseEvaluation.objects.create(
+                enrollment=Enrollment.objects.create(student=student, course_offering=offering),
+                teaching_effectiveness=5, course_content=5, learning_resources=5, assessment_fairness=5,
+                overall_satisfaction=5, comments='Clear lectures', is_anonymous=anonymous,
+            ))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def found(self, query, **params):
+        response = self.client.get(reverse('search'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['id']) for result in response.data['results']]
+
+    def test_events_are_found_by_organizer(self):
+        self.assertEqual(self.found('registrar', type='event'), [('event', self.event.pk)])
+
+    def test_anonymous_evaluations_hide_the_student(self):
+        self.assertEqual(len(self.found('clear lectures')), 2)
+        for evaluation in self.evaluations:
+            self.assertEqual(
+                self.found(evaluation.enrollment.student.student_id, type='courseevaluation'),
+                [] if evaluation.is_anonymous else [('courseevaluation', evaluation.pk)],
+            )
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.found('clear', limit=-1)), 1)
+
+
+class RoomSweepTests(SimpleTestCase):
+    def test_pairs_are_the_meetings_running_at_each_start(self):
+        meetings = [(60, 120, 'b'), (0, 180, 'a'), (120, 150, 'c'), (150, 160, 'd'), (200, 210, 'e')]
+        pairs = {frozenset(pair) for pair in rooms.sweep(meetings)}
+        # b-c and c-d only touch; e overlaps nothing.
+        self.assertEqual(pairs, {frozenset('ab'), frozenset('ac'), frozenset('ad')})
+
+    def test_every_pair_of_a_full_overlap_is_reported_once(self):
+        meetings = [(i, 600 - i, i) for i in range(50)]
+        pairs = rooms.sweep(meetings)
+        self.assertEqual(len(pairs), 50 * 49 // 2)
+        self.assertEqual(len({frozenset(pair) for pair in pairs}), len(pairs))
+
+    def test_occupied_minutes_merge_overlaps(self):
+        self.assertEqual(rooms.occupied_minutes([(0, 60, 'a'), (30, 90, 'b'), (120, 150, 'c')]), 120)
+
+
+class RoomClashTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+        )
+        Schedule.objects.create(
+            course_offering=offering, day_of_week='MON', room=' Rm  101', building='Main ',
+            start_time=datetime.time(8), end_time=datetime.time(10),
+        )
+
+    def meeting(self, room, day='MON'):
+        return {
+            'day_of_week': day, 'room': room, 'building': 'main',
+            'start_time': datetime.time(9), 'end_time': datetime.time(11),
+        }
+
+    def test_rooms_match_as_room_key_normalizes_them(self):
+        clashes = rooms.find_clashes(self.semester.pk, [self.meeting('rm 101')])
+        self.assertEqual(clashes, ["rm 101 on MON 09:00-11:00 overlaps CS101 A."])
+
+    def test_room_report_finds_double_bookings_across_spellings(self):
+        offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS102', title='Course'), semester=self.semester, section='A',
+        )
+        Schedule.objects.create(
+            course_offering=offering, day_of_week='MON', room='RM 101', building='main',
+            start_time=datetime.time(9), end_time=datetime.time(11),
+        )
+        report = rooms.room_report(self.semester)
+        self.assertEqual(len(report['conflicts']), 1)
+        self.assertEqual(
+            sorted(schedule['label'] for schedule in report['conflicts'][0]['schedules']), ['CS101 A', 'CS102 A'],
+        )
+        self.assertEqual([room['occupied_minutes'] for room in report['rooms']], [180])
+
+    def test_other_rooms_and_days_do_not_clash(self):
+        self.assertEqual(rooms.find_clashes(self.semester.pk, [self.meeting('Rm 102')]), [])
+        self.assertEqual(rooms.find_clashes(self.semester.pk, [self.meeting('Rm 101', day='TUE')]), [])
+
+
+class TransmutationTests(SimpleTestCase):
+    def test_each_cutoff_starts_its_rating(self):
+        for percentage, rating in [
+            (None, 'INC'), (0, '5.00'), (74.99, '5.00'), (75, '3.00'), (78.99, '2.75'), (79, '2.50'),
+            (93.5, '1.50'), (96.99, '1.25'), (97, '1.00'), (100, '1.00'),
+        ]:
+            with self.subTest(percentage=percentage):
+                self.assertEqual(grading.transmute(percentage), rating)
+
+
+class ScoreMatrixTests(SimpleTestCase):
+    def setUp(self):
+        # Quiz: 20 points worth 25%, exam: 50 points worth 75%; the second student missed the exam.
+        self.matrix = grading.ScoreMatrix(
+            [1, 2, 3], [(10, '20', '25', None), (11, '50', '75', None)],
+        )
+        self.matrix.set(1, 10, '20')
+        self.matrix.set(1, 11, '40')
+        self.matrix.set(2, 10, '10')
+
+    def test_missing_scores_follow_the_policy(self):
+        expected = {
+            'zero': [85.0, 12.5, 0.0],
+            'exclude': [85.0, 50.0, None],
+            'incomplete': [85.0, None, None],
+        }
+        for policy, percentages in expected.items():
+            with self.subTest(policy=policy):
+                self.assertEqual(self.matrix.weighted_percentages(policy=policy), percentages)
+
+    def test_split_matches_separate_passes(self):
+        for policy in grading.MISSING_POLICIES:
+            with self.subTest(policy=policy):
+                self.assertEqual(
+                    self.matrix.split_percentages([0], policy),
+                    (self.matrix.weighted_percentages([0], policy), self.matrix.weighted_percentages(policy=policy)),
+                )
+
+    def test_unknown_policy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.matrix.weighted_percentages(policy='curve')
+
+
+class ComputeGradesTests(TermTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.offering = CourseOffering.objects.create(
+            course=Course.objects.create(course_code='CS101', title='Course'), semester=cls.semester, section='A',
+        )
+        cls.enrollment = Enrollment.objects.create(
+            student=Student.objects.create(user=User.objects.create(username='student'), student_id='2026-0001'),
+            course_offering=cls.offering,
+        )
+        midterm = Assessment.objects.create(
+            course_offering=cls.offering, title='Midterm', assessment_type='EXAM', max_score=100, weight=40,
+            date_given=cls.today + datetime.timedelta(days=30),
+        )
+        final = Assessment.objects.create(
+            course_offering=cls.offering, title='Final', assessment_type='EXAM', max_score=100, weight=60,
+            date_given=cls.today + datetime.timedelta(days=110),
+        )
+        AssessmentScore.objects.create(assessment=midterm, enrollment=cls.enrollment, score=90)
+        AssessmentScore.objects.create(assessment=final, enrollment=cls.enrollment, score=70)
+
+    def test_midterm_covers_the_first_half_of_the_semester(self):
+        [row] = grading.compute_offering_grades(self.offering)
+        self.assertEqual(row, {
+            'enrollment': self.enrollment.pk,
+            'midterm_percentage': 90.0, 'midterm_rating': '1.75',
+            'final_percentage': 78.0, 'final_rating': '2.75',
+        })
+
+    def test_percentages_are_saved_and_the_rating_is_left_alone(self):
+        Grade.objects.create(enrollment=self.enrollment, final_rating='2.00')
+        grading.compute_offering_grades(self.offering)
+        grade = Grade.objects.get()
+        self.assertEqual(
+            (grade.midterm_grade, grade.final_grade, grade.final_rating), (Decimal('90.00'), Decimal('78.00'), '2.00'),
+        )
+
+    def test_dry_run_writes_nothing(self):
+        grading.compute_offering_grades(self.offering, save=False)
+        self.assertFalse(Grade.objects.exists())
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        now = timezone.now()
+        # Ties on created_at must be broken by pk, or rows would be skipped or repeated across pages.
+        for i in range(8):
+            notification = Notification.objects.create(
+                recipient=cls.superuser, notification_type='GENERAL', title=f'Note {i}', message='-',
+            )
+            Notification.objects.filter(pk=notification.pk).update(
+                created_at=now - datetime.timedelta(minutes=i // 3),
+            )
+        cls.expected = list(Notification.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:api_notification_changelist')
+        patcher = mock.patch.object(admin.site._registry[Notification], 'list_per_page', 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def page(self, query=''):
+        cl = self.client.get(self.url + query).context['cl']
+        return [row.pk for row in cl.result_list], cl
+
+    def test_pages_follow_the_default_ordering(self):
+        seen, pages = [], []
+        query = ''
+        while query is not None:
+            rows, cl = self.page(query)
+            self.assertIsNotNone(cl.keyset)
+            seen += rows
+            pages.append((query, rows))
+            query = cl.next_url
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        _, last = self.page(pages[2][0])
+        self.assertEqual(self.page(last.previous_url)[0], pages[1][1])
+
+    def test_sorting_by_a_column_falls_back_to_numbered_pages(self):
+        _, cl = self.page('?o=3')
+        self.assertIsNone(cl.keyset)
+
+
+@override_settings(PORTAL_APPROXIMATE_COUNT_THRESHOLD=5)
+class RowCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='student')
+        Notification.objects.bulk_create([
+            Notification(recipient=cls.user, notification_type='GENERAL', title=f'Note {i}', message='-', is_read=i < 3)
+            for i in range(9)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_up_to_the_threshold_are_exact(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(row_counts.count(Notification.objects.filter(is_read=True)), (3, False))
+
+    def test_unfiltered_tables_use_the_estimate(self):
+        Notification.objects.order_by('pk').first().delete()
+        largest = Notification.objects.aggregate(largest=Max('pk'))['largest']
+        with self.assertNumQueries(2):
+            self.assertEqual(row_counts.count(Notification.objects.all()), (largest, True))
+
+    def test_filtered_counts_above_the_threshold_are_cached(self):
+        unread = Notification.objects.filter(is_read=False)
+        self.assertEqual(row_counts.count(unread), (6, True))
+        Notification.objects.create(recipient=self.user, notification_type='GENERAL', title='New', message='-')
+        with self.assertNumQueries(1):
+            self.assertEqual(row_counts.count(unread), (6, True))
+        cache.clear()
+        self.assertEqual(row_counts.count(unread), (7, True))
+
+    def test_paginator_marks_estimates(self):
+        paginator = ApproximateCountPaginator(Notification.objects.filter(is_read=False).order_by('pk'), 4)
+        self.assertEqual((paginator.count, paginator.approximate, paginator.num_pages), (6, True, 2))
+        self.assertEqual(len(paginator.page(2).object_list), 2)
+        small = ApproximateCountPaginator(Notification.objects.filter(is_read=True).order_by('pk'), 4)
+        self.assertEqual((small.count, small.approximate), (3, False))
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "Reads SQLite query plans.")
+class AdminPrefixSearchTests(TestCase):
+    # The NOCASE indexes each model's '^' search fields should be read through.
+    EXPECTED_INDEXES = {
+        User: {
+            'auth_user_username_prefix', 'auth_user_first_name_prefix', 'auth_user_last_name_prefix',
+            'auth_user_email_prefix',
+        },
+        Faculty: {'api_faculty_employee_id_prefix', 'auth_user_first_name_prefix', 'auth_user_last_name_prefix'},
+        Student: {'api_student_student_id_prefix', 'auth_user_first_name_prefix', 'auth_user_last_name_prefix'},
+        CourseOffering: {'api_courseoffering_section_prefix', 'auth_user_last_name_prefix'},
+    }
+
+    def test_prefix_searches_use_the_nocase_indexes(self):
+        request = RequestFactory().get('/')
+        request.user = User(is_staff=True, is_superuser=True)
+        for model, expected in self.EXPECTED_INDEXES.items():
+            with self.subTest(model=model.__name__):
+                queryset, _ = admin.site._registry[model].get_search_results(request, model.objects.all(), 'ab')
+                sql, params = queryset.query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                    used = {
+                        name for row in cursor.fetchall()
+                        for name in re.findall(r'USING (?:COVERING )?INDEX (\w+)', row[-1])
+                    }
+                self.assertLessEqual(expected, used)
+
+
+class AdminChangelistQueryBudgetTests(TestCase):
+    # Every changelist must render in at most this many queries. ROWS is
+    # larger than the budget, so a single per-row lookup blows it.
+    QUERY_BUDGET = 15
+    ROWS = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        today = timezone.localdate()
+        now = timezone.now()
+        for i in range(cls.ROWS):
+            start = today - datetime.timedelta(days=365 * i)
+            year = AcademicYear.objects.create(
+                name=f'{start.year}-{i}', start_date=start, end_date=start + datetime.timedelta(days=364),
+            )
+            semester = Semester.objects.create(
+                academic_year=year, semester_type='1ST', start_date=start, end_date=start + datetime.timedelta(days=120),
+                enrollment_start=start - datetime.timedelta(days=7), enrollment_end=start,
+            )
+            department = Department.objects.create(name=f'Department {i}', code=f'D{i}')
+            faculty = Faculty.objects.create(
+                user=User.objects.create(username=f'faculty{i}', first_name='Fac', last_name=f'{i}'),
+                department=department, employee_id=f'F{i:03}',
+            )
+            department.head = faculty
+            department.save()
+            user = User.objects.create(username=f'student{i}', first_name='Stu', last_name=f'{i}')
+            student = Student.objects.create(user=user, student_id=f'2026-{i:04}', department=department)
+            Program.objects.create(name=f'Program {i}', code=f'P{i}', degree_type='BS', department=department)
+            course = Course.objects.create(course_code=f'C{i:03}', title=f'Course {i}', department=department)
+            offering = CourseOffering.objects.create(course=course, semester=semester, section='A', faculty=faculty)
+            Schedule.objects.create(
+                course_offering=offering, day_of_week='MON', room='R1',
+                start_time=datetime.time(8), end_time=datetime.time(9),
+            )
+            enrollment = Enrollment.objects.create(student=student, course_offering=offering)
+            Grade.objects.create(enrollment=enrollment, final_rating='2.00', date_submitted=now)
+            assessment = Assessment.objects.create(
+                course_offering=offering, title=f'Quiz {i}', assessment_type='QUIZ',
+                max_score=50, weight=10, date_given=today,
+            )
+            AssessmentScore.objects.create(assessment=assessment, enrollment=enrollment, score=40)
+            Announcement.objects.create(department=department, title=f'News {i}', content='-', posted_by=cls.superuser)
+            event = Event.objects.create(
+                title=f'Event {i}', description='-', event_type='ACADEMIC', start_datetime=now,
+                end_datetime=now, venue='Hall', organizer=cls.superuser, department=department,
+            )
+            EventRegistration.objects.create(event=event, student=student)
+            DocumentRequest.objects.create(student=student, document_type='TOR', purpose='-')
+            Notification.objects.create(recipient=user, notification_type='GENERAL', title=f'Note {i}', message='-')
+            Feedback.objects.create(student=student, feedback_type='SUGGESTION', subject=f'Subject {i}', message='-')
+            CourseEvaluation.objects.create(
+                enrollment=enrollment, teaching_effectiveness=5, course_content=5,
+                learning_resources=5, assessment_fairness=5, overall_satisfaction=5,
+            )
+            AdmissionTicket.objects.create(student=student, course_offering=offering, enrollment=enrollment)
+            WaitlistEntry.objects.create(course_offering=offering, student=student, position=1)
+            HonorsRanking.objects.create(
+                semester=semester, student=student, department=department, year_level=1, units_attempted=3,
+                gwa='2.0000', rank=1, tie_break='shared', computed_at=now,
+            )
+
+    def test_changelists_stay_within_query_budget(self):
+        self.client.force_login(self.superuser)
+        models = [model for model in admin.site._registry if model._meta.app_label == 'api']
+        self.assertEqual(len(models), 24)
+        for model in models:
+            url = reverse(f'admin:api_{model._meta.model_name}_changelist')
+            with self.subTest(model=model.__name__):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(response.context['cl'].result_count, 0)
+                self.assertLessEqual(len(queries.captured_queries), self.QUERY_BUDGET)
@@ -5,9 +5,47 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView
 )
 
+from . import views
+
 urlpatterns = [
     #login
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token_verify'),
-]
\ No newline at end of file
+
+    path('current-term/', views.CurrentTermView.as_view(), name='current_term'),
+
+    #enrollment
+    path('enrollment/tickets/', views.AdmissionTicketListView.as_view(), name='admission_ticket_list'),
+    path('enrollment/tickets/<int:pk>/', views.AdmissionTicketDetailView.as_view(), name='admission_ticket_detail'),
+    path('enrollment/waitlist/', views.WaitlistListView.as_view(), name='waitlist_list'),
+    path('enrollment/waitlist/<int:pk>/', views.WaitlistDetailView.as_view(), name='waitlist_detail'),
+    path('enrollment/conflicts/', views.ScheduleConflictView.as_view(), name='schedule_conflicts'),
+    path('enrollment/eligibility/', views.EligibilityView.as_view(), name='enrollment_eligibility'),
+    path('enrollment/cohorts/', views.CohortEnrollmentView.as_view(), name='cohort_enrollment'),
+
+    #catalog
+    path('catalog/offerings/', views.CatalogOfferingListView.as_view(), name='catalog_offerings'),
+
+    #grades
+    path('offerings/<int:pk>/grades/compute/', views.ComputeGradesView.as_view(), name='compute_grades'),
+    path('offerings/<int:pk>/scores/', views.ScoreSheetView.as_view(), name='score_sheet'),
+    path('offerings/<int:pk>/assessments/stats/', views.OfferingAssessmentStatsView.as_view(), name='offering_assessment_stats'),
+    path('assessments/<int:pk>/stats/', views.AssessmentStatsView.as_view(), name='assessment_stats'),
+    path('grades/import/', views.GradeImportView.as_view(), name='grade_import'),
+    path('courses/<int:pk>/grade-distribution/', views.GradeDistributionView.as_view(), name='grade_distribution'),
+    path('grades/ledger/', views.GradeLedgerView.as_view(), name='grade_ledger'),
+    path('students/<int:pk>/grades/as-of/', views.GradesAsOfView.as_view(), name='grades_as_of'),
+    path('students/me/standing/', views.StandingView.as_view(), name='student_standing'),
+    path('honors/', views.HonorsListView.as_view(), name='honors_list'),
+
+    #documents
+    path('students/me/transcript/', views.TranscriptView.as_view(), name='student_transcript'),
+    path('documents/<int:pk>/transcript/', views.DocumentRequestTranscriptView.as_view(), name='document_transcript'),
+
+    #rooms
+    path('rooms/report/', views.RoomReportView.as_view(), name='room_report'),
+
+    #search
+    path('search/', views.SearchView.as_view(), name='search'),
+]
@@ -1,3 +1,557 @@
-from django.shortcuts import render
+from django.db.models import Q
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .exceptions import EnrollmentError, GradeImportError, ScoreSheetConflict
+from .models import (
+    AdmissionTicket, Announcement, Assessment, CourseEvaluation, CourseOffering, Department, DocumentRequest, Event,
+    Faculty, Feedback, GradeChange, HonorsRanking, Notification, Student, StudentTermStanding, WaitlistEntry,
+)
+from .services import admission, assessment_stats
+from .services import eligibility, grade_distribution, grade_import, grade_ledger, grading
+from .services import enrollment as enrollment_service
+from .services import rooms, score_sheet, search, seat_availability
+from .services import timetable, transcripts, waitlist
+
+
+def get_student(request):
+    try:
+        return request.user.student_profile
+    except Student.DoesNotExist:
+        raise PermissionDenied("Only students can perform this action.")
+
+
+def parse_id(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({field: "A valid integer is required."})
+
+
+def get_managed_offering(request, pk):
+    """The offering ``pk`` if the user is staff or the faculty member teaching it."""
+    offering = CourseOffering.objects.select_related('course', 'semester', 'faculty').filter(pk=pk).first()
+    if offering is None:
+        raise NotFound()
+    if not request.user.is_staff and (offering.faculty is None or offering.faculty.user_id != request.user.pk):
+        raise PermissionDenied("Only the assigned faculty member can manage this course offering.")
+    return offering
+
+
+class CurrentTermView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        term = request.current_term
+        semester = term.semester
+        return Response({
+            'academic_year': term.academic_year and {'id': term.academic_year.pk, 'name': term.academic_year.name},
+            'semester': semester and {
+                'id': semester.pk,
+                'name': str(semester),
+                'semester_type': semester.semester_type,
+                'start_date': semester.start_date,
+                'end_date': semester.end_date,
+            },
+            'enrollment_start': term.enrollment_start,
+            'enrollment_end': term.enrollment_end,
+            'enrollment_open': term.is_enrollment_open(),
+        })
+
+
+# Enrollment admission queue
+class AdmissionTicketListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        student = get_student(request)
+        offering_id = parse_id(request.data.get('course_offering'), 'course_offering')
+        try:
+            ticket = admission.submit_ticket(student, offering_id)
+        except EnrollmentError as exc:
+            raise ValidationError({'course_offering': str(exc)})
+        return Response(
+            {
+                'id': ticket.pk,
+                'status': ticket.status,
+                'course_offering': ticket.course_offering_id,
+                'position': admission.queue_position(ticket.pk, offering_id) if ticket.status == 'QUEUED' else None,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class AdmissionTicketDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        ticket = (
+            AdmissionTicket.objects.filter(pk=pk, student__user=request.user)
+            .values('id', 'status', 'reason', 'course_offering', 'enrollment', 'created_at', 'processed_at')
+            .first()
+        )
+        if ticket is None:
+            raise NotFound()
+        ticket['position'] = None
+        if ticket['status'] == 'QUEUED':
+            ticket['position'] = admission.queue_position(ticket['id'], ticket['course_offering'])
+        return Response(ticket)
+
+
+# Waitlist
+def waitlist_payload(entry):
+    return {
+        'id': entry.pk,
+        'course_offering': entry.course_offering_id,
+        'status': entry.status,
+        'position': waitlist.position_of(entry),
+        'remarks': entry.remarks,
+    }
+
+
+class WaitlistListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        student = get_student(request)
+        offering_id = parse_id(request.data.get('course_offering'), 'course_offering')
+        try:
+            entry = waitlist.join(student, offering_id)
+        except EnrollmentError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(waitlist_payload(entry), status=status.HTTP_201_CREATED)
+
+
+class WaitlistDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_entry(self, request, pk):
+        entry = WaitlistEntry.objects.filter(pk=pk, student__user=request.user).first()
+        if entry is None:
+            raise NotFound()
+        return entry
+
+    def get(self, request, pk):
+        return Response(waitlist_payload(self.get_entry(request, pk)))
+
+    def delete(self, request, pk):
+        waitlist.cancel(self.get_entry(request, pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def parse_id_list(value, field):
+    if not isinstance(value, list) or not value:
+        raise ValidationError({field: "A non-empty list of ids is required."})
+    return [parse_id(item, field) for item in value]
+
+
+class ScheduleConflictView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        student = get_student(request)
+        offering_ids = parse_id_list(request.data.get('offerings'), 'offerings')
+        conflicts = timetable.find_conflicts(student, offering_ids)
+        return Response({
+            'offerings': [
+                {'course_offering': pk, 'conflicts_with': found}
+                for pk, found in conflicts.items()
+            ],
+        })
+
+
+class EligibilityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        student = get_student(request)
+        offering_ids = parse_id_list(request.data.get('offerings'), 'offerings')
+        return Response({'offerings': eligibility.evaluate(student, offering_ids)})
+
+
+class CohortEnrollmentView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        offering_ids = parse_id_list(request.data.get('offerings'), 'offerings')
+
+        department = None
+        if request.data.get('department'):
+            department = Department.objects.filter(code=request.data['department']).first()
+            if department is None:
+                raise ValidationError({'department': "Unknown department code."})
+        year_level = request.data.get('year_level')
+        if year_level is not None:
+            year_level = parse_id(year_level, 'year_level')
+        if department is None and year_level is None:
+            raise ValidationError("Give at least one of department or year_level.")
+
+        try:
+            summary = enrollment_service.enroll_cohort(offering_ids, department=department, year_level=year_level)
+        except EnrollmentError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(
+            {
+                'offerings': [{'course_offering': pk, **row} for pk, row in summary.items()],
+                'enrolled': sum(row['enrolled'] for row in summary.values()),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+# Catalog
+class CatalogOfferingListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        semester_id = request.query_params.get('semester')
+        if semester_id is not None:
+            semester_id = parse_id(semester_id, 'semester')
+        elif request.current_term.semester is not None:
+            semester_id = request.current_term.semester.pk
+        else:
+            return Response({'semester': None, 'offerings': []})
+
+        offerings = seat_availability.catalog(semester_id)
+        query = request.query_params.get('q', '').strip().upper()
+        if query:
+            offerings = [
+                o for o in offerings
+                if o['course_code'].upper().startswith(query) or query in o['title'].upper()
+            ]
+        if request.query_params.get('available') in ('1', 'true'):
+            offerings = [o for o in offerings if o['available_slots'] > 0]
+        return Response({'semester': semester_id, 'offerings': offerings})
+
+
+# Rooms
+class RoomReportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        semester_id = request.query_params.get('semester')
+        if semester_id is not None:
+            semester_id = parse_id(semester_id, 'semester')
+        elif request.current_term.semester is not None:
+            semester_id = request.current_term.semester.pk
+        else:
+            raise ValidationError({'semester': "No active semester; pass ?semester=<id>."})
+        return Response({'semester': semester_id, **rooms.room_report(semester_id)})
+
+
+# Grades
+class ComputeGradesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        offering = get_managed_offering(request, pk)
+        policy = request.data.get('policy', 'zero')
+        if policy not in grading.MISSING_POLICIES:
+            raise ValidationError({'policy': f"Must be one of {', '.join(grading.MISSING_POLICIES)}."})
+        save = request.data.get('save', True) not in (False, 'false', '0')
+        results = grading.compute_offering_grades(offering, policy, save=save)
+        return Response({'course_offering': offering.pk, 'saved': save, 'grades': results})
+
+
+class ScoreSheetView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        offering = get_managed_offering(request, pk)
+        return Response(score_sheet.load(offering.pk))
+
+    def patch(self, request, pk):
+        offering = get_managed_offering(request, pk)
+        edits = request.data.get('edits')
+        if not isinstance(edits, list) or not edits:
+            raise ValidationError({'edits': "A non-empty list of cell edits is required."})
+        try:
+            version = score_sheet.parse_version(request.data.get('version'))
+        except ValueError as exc:
+            raise ValidationError({'version': str(exc)})
+        try:
+            result = score_sheet.apply_edits(offering.pk, edits, version)
+        except ScoreSheetConflict as exc:
+            return Response({'detail': str(exc), 'conflicts': exc.conflicts}, status=status.HTTP_409_CONFLICT)
+        if result['errors']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
+
+class OfferingAssessmentStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        offering = get_managed_offering(request, pk)
+        return Response({'course_offering': offering.pk, 'assessments': assessment_stats.for_offering(offering.pk)})
+
+
+class AssessmentStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        assessment = Assessment.objects.filter(pk=pk).only('course_offering_id').first()
+        if assessment is None:
+            raise NotFound()
+        get_managed_offering(request, assessment.course_offering_id)
+        return Response(assessment_stats.for_assessment(assessment))
+
+
+class GradeImportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        faculty = None
+        if not request.user.is_staff:
+            faculty = Faculty.objects.filter(user=request.user).first()
+            if faculty is None:
+                raise PermissionDenied("Only faculty members can submit grades.")
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': "Upload a CSV or XLSX grade sheet."})
+        semester_id = request.data.get('semester')
+        if semester_id:
+            semester_id = parse_id(semester_id, 'semester')
+        elif request.current_term.semester is not None:
+            semester_id = request.current_term.semester.pk
+        else:
+            raise ValidationError({'semester': "No active semester; pass a semester id."})
+        partial = request.data.get('partial') in ('1', 'true', True)
+
+        try:
+            records = grade_import.read_sheet(upload, upload.name)
+            summary = grade_import.import_grades(records, semester_id, faculty=faculty, partial=partial)
+        except GradeImportError as exc:
+            raise ValidationError({'file': str(exc)})
+        code = status.HTTP_400_BAD_REQUEST if summary['errors'] and not partial else status.HTTP_200_OK
+        return Response(summary, status=code)
+
+
+class GradeLedgerView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        changes = GradeChange.objects.all()
+        if params.get('enrollment'):
+            changes = changes.filter(enrollment_id=parse_id(params['enrollment'], 'enrollment'))
+        elif params.get('student'):
+            changes = changes.filter(student_id=parse_id(params['student'], 'student'))
+        else:
+            raise ValidationError({'student': "Filter by student or enrollment."})
+        rows = changes.order_by('-changed_at', '-id').values(
+            'id', 'enrollment_id', 'assessment_id', 'field', 'old_value', 'new_value',
+            'actor_id', 'actor__username', 'changed_at',
+        )[:max(1, min(parse_id(params.get('limit', 200), 'limit'), 1000))]
+        return Response([
+            {
+                'id': row['id'],
+                'enrollment': row['enrollment_id'],
+                'assessment': row['assessment_id'],
+                'field': row['field'],
+                'old_value': row['old_value'],
+                'new_value': row['new_value'],
+                'actor': row['actor_id'] and {'id': row['actor_id'], 'username': row['actor__username']},
+                'changed_at': row['changed_at'],
+            }
+            for row in rows
+        ])
+
+
+class GradesAsOfView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        if not Student.objects.filter(pk=pk).exists():
+            raise NotFound()
+        value = request.query_params.get('at', '')
+        try:
+            moment = parse_datetime(value) or parse_date(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ValidationError({'at': "An ISO 8601 date or datetime is required."})
+        return Response({'student': pk, 'at': value, 'enrollments': grade_ledger.grades_as_of(pk, moment)})
+
+
+class GradeDistributionView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        if not request.user.is_staff and not Faculty.objects.filter(user=request.user).exists():
+            raise PermissionDenied("Only staff and faculty can view grade distributions.")
+        params = request.query_params
+        group_by = params.get('group_by', 'semester')
+        if group_by not in grade_distribution.GROUP_BYS:
+            raise ValidationError({'group_by': f"Must be one of {', '.join(grade_distribution.GROUP_BYS)}."})
+        semester_ids = [parse_id(value, 'semester') for value in params.getlist('semester')] or None
+        faculty_id = parse_id(params['faculty'], 'faculty') if params.get('faculty') else None
+        return Response({
+            'course': pk,
+            'group_by': group_by,
+            'groups': grade_distribution.distribution(pk, group_by, semester_ids, faculty_id),
+        })
+
+
+class StandingView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        student = get_student(request)
+        rows = (
+            StudentTermStanding.objects.filter(student=student)
+            .select_related('semester__academic_year')
+            .order_by('semester__start_date')
+        )
+        terms, cumulative = [], None
+        for row in rows:
+            data = {
+                'units_attempted': row.units_attempted,
+                'units_earned': row.units_earned,
+                'gwa': row.gwa,
+            }
+            if row.semester is None:
+                cumulative = data
+            else:
+                terms.append({'semester': row.semester_id, 'name': str(row.semester), **data})
+        return Response({'terms': terms, 'cumulative': cumulative})
+
+
+class HonorsListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        if params.get('semester'):
+            semester_id = parse_id(params['semester'], 'semester')
+        elif request.current_term.semester is not None:
+            semester_id = request.current_term.semester.pk
+        else:
+            raise ValidationError({'semester': "No active semester; pass a semester id."})
+        rankings = HonorsRanking.objects.filter(semester_id=semester_id)
+        if params.get('department'):
+            rankings = rankings.filter(department_id=parse_id(params['department'], 'department'))
+        if params.get('year_level'):
+            rankings = rankings.filter(year_level=parse_id(params['year_level'], 'year_level'))
+        if params.get('deans_list') in ('1', 'true'):
+            rankings = rankings.filter(deans_list=True)
+        if params.get('latin_honors') in ('1', 'true'):
+            rankings = rankings.exclude(latin_honor='')
+        limit = max(1, min(parse_id(params.get('limit', 100), 'limit'), 1000))
+        rows = rankings.order_by('department_id', 'year_level', 'rank', 'student__student_id').values(
+            'department_id', 'year_level', 'rank', 'student_id', 'student__student_id',
+            'student__user__first_name', 'student__user__last_name', 'units_attempted', 'gwa',
+            'deans_list', 'cumulative_gwa', 'latin_honor', 'computed_at',
+        )[:limit]
+        return Response({
+            'semester': semester_id,
+            'results': [
+                {
+                    'department': row['department_id'],
+                    'year_level': row['year_level'],
+                    'rank': row['rank'],
+                    'student': row['student_id'],
+                    'student_id': row['student__student_id'],
+                    'name': f"{row['student__user__first_name']} {row['student__user__last_name']}".strip(),
+                    'units_attempted': row['units_attempted'],
+                    'gwa': row['gwa'],
+                    'deans_list': row['deans_list'],
+                    'cumulative_gwa': row['cumulative_gwa'],
+                    'latin_honor': row['latin_honor'],
+                    'computed_at': row['computed_at'],
+                }
+                for row in rows
+            ],
+        })
+
+
+# Transcripts
+def transcript_response(request, student, document_type):
+    output = request.query_params.get('output', 'pdf')
+    if output not in transcripts.FORMATS:
+        raise ValidationError({'output': f"Must be one of {', '.join(transcripts.FORMATS)}."})
+    semester = request.query_params.get('semester')
+    semester = parse_id(semester, 'semester') if semester else None
+    path, digest = transcripts.render(student, document_type, semester, output)
+    etag = f'"{digest}"'
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    response = FileResponse(
+        open(path, 'rb'),
+        content_type='application/pdf' if output == 'pdf' else 'text/html; charset=utf-8',
+        filename=f'{document_type.lower()}-{student.student_id}.{output}',
+        as_attachment=output == 'pdf',
+    )
+    response['ETag'] = etag
+    return response
+
+
+class TranscriptView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        document_type = request.query_params.get('type', 'TOR')
+        if document_type not in transcripts.DOCUMENT_TYPES:
+            raise ValidationError({'type': f"Must be one of {', '.join(transcripts.DOCUMENT_TYPES)}."})
+        return transcript_response(request, get_student(request), document_type)
+
+
+class DocumentRequestTranscriptView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        document = DocumentRequest.objects.select_related('student').filter(pk=pk).first()
+        if document is None:
+            raise NotFound()
+        if not request.user.is_staff and document.student.user_id != request.user.pk:
+            raise PermissionDenied("You can only view your own document requests.")
+        if document.document_type not in transcripts.DOCUMENT_TYPES:
+            raise ValidationError({'document_type': f"{document.get_document_type_display()} is not a transcript."})
+        return transcript_response(request, document.student, document.document_type)
+
+
+# Search
+def searchable_querysets(user):
+    """The rows of each searchable model that ``user`` may find."""
+    if user.is_staff:
+        return {
+            Announcement: Announcement.objects.all(),
+            Event: Event.objects.all(),
+            Notification: Notification.objects.filter(recipient=user),
+            Feedback: Feedback.objects.all(),
+            CourseEvaluation: CourseEvaluation.objects.all(),
+        }
+    return {
+        Announcement: Announcement.objects.filter(is_active=True).filter(
+            Q(expiry_date__isnull=True) | Q(expiry_date__gt=timezone.now()),
+        ),
+        Event: Event.objects.filter(is_published=True),
+        Notification: Notification.objects.filter(recipient=user),
+        Feedback: Feedback.objects.filter(student__user=user),
+    }
+
+
+class SearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        query = params.get('q', '').strip()
+        if not search.terms(query):
+            raise ValidationError({'q': "Enter at least one word to search for."})
+        querysets = searchable_querysets(request.user)
+        if params.get('type'):
+            by_name = {model._meta.model_name: model for model in querysets}
+            types = [name.strip().lower() for name in params['type'].split(',') if name.strip()]
+            unknown = [name for name in types if name not in by_name]
+            if unknown:
+                raise ValidationError({'type': f"Must be among {', '.join(sorted(by_name))}."})
+            querysets = {by_name[name]: querysets[by_name[name]] for name in types}
+        limit = max(1, min(parse_id(params.get('limit', 20), 'limit'), 100))
+        return Response({'query': query, 'results': search.search(query, querysets, limit)})